@@ -0,0 +1,195 @@
+"""
+Anomaly detection module for educational process mining.
+Scores every case by the log-likelihood of its trace under a first-order
+Markov model of the log, evaluated once per trace prefix on the variant trie.
+"""
+
+import heapq
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from variant_index import VariantIndex
+
+# Add-one smoothing: transitions never seen in the log still get a finite probability
+DEFAULT_SMOOTHING = 1.0
+
+
+class MarkovTraceModel:
+    """First-order Markov model of traces with artificial start and end states."""
+
+    def __init__(self, transition_counts: np.ndarray, smoothing: float = DEFAULT_SMOOTHING):
+        """
+        Initialize the model from transition counts.
+
+        Args:
+            transition_counts: (n + 1) x (n + 1) counts; row n is the start state, column n the end state
+            smoothing: Pseudo-count added to every transition
+        """
+        self.transition_counts = transition_counts
+        self.smoothing = smoothing
+        smoothed = transition_counts + smoothing
+        self.log_probabilities = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+
+    @classmethod
+    def fit(cls, variant_index: VariantIndex, smoothing: float = DEFAULT_SMOOTHING) -> 'MarkovTraceModel':
+        """
+        Count the transitions of the encoded log in one pass.
+
+        Args:
+            variant_index: Variant index of the log
+            smoothing: Pseudo-count added to every transition
+
+        Returns:
+            MarkovTraceModel
+        """
+        encoded = variant_index.encoded
+        n = encoded.n_activities
+        codes = encoded.codes.astype(np.int64)
+        same_case = encoded.case_index[1:] == encoded.case_index[:-1]
+        non_empty = encoded.case_lengths > 0
+        first = codes[encoded.offsets[:-1][non_empty]]
+        last = codes[encoded.offsets[1:][non_empty] - 1]
+
+        keys = np.concatenate([
+            codes[:-1][same_case] * (n + 1) + codes[1:][same_case],
+            n * (n + 1) + first,
+            last * (n + 1) + n
+        ])
+        counts = np.bincount(keys, minlength=(n + 1) * (n + 1)).reshape(n + 1, n + 1)
+        return cls(counts, smoothing)
+
+    def node_log_likelihoods(self, variant_index: VariantIndex) -> np.ndarray:
+        """
+        Log-likelihood of every trie prefix, from its parent's plus one transition, level by level.
+
+        Args:
+            variant_index: Variant index the model is evaluated on
+
+        Returns:
+            Array with one log-likelihood per trie node (0 for the empty prefix)
+        """
+        start_state = variant_index.encoded.n_activities
+        parent, code = variant_index.parent, variant_index.code
+        log_likelihood = np.zeros(len(parent))
+        level_starts = variant_index.level_starts
+        for level in range(1, len(level_starts) - 1):
+            nodes = np.arange(level_starts[level], level_starts[level + 1])
+            previous = code[parent[nodes]] if level > 1 else np.full(len(nodes), start_state)
+            log_likelihood[nodes] = log_likelihood[parent[nodes]] + self.log_probabilities[previous, code[nodes]]
+        return log_likelihood
+
+
+class AnomalyDetector:
+    """Ranks cases by how unlikely their trace is under a Markov model of the whole log."""
+
+    def __init__(self, variant_index: VariantIndex, smoothing: float = DEFAULT_SMOOTHING):
+        """
+        Fit the model and score every case.
+
+        Args:
+            variant_index: Variant index of the log
+            smoothing: Pseudo-count added to every transition
+        """
+        self.variant_index = variant_index
+        self.model = MarkovTraceModel.fit(variant_index, smoothing)
+
+        node_log_likelihood = self.model.node_log_likelihoods(variant_index)
+        variants = variant_index.variant_ids
+        end_state = variant_index.encoded.n_activities
+        # Variants are scored once; cases share the score of their variant
+        variant_log_likelihood = np.zeros(len(variant_index.parent))
+        variant_log_likelihood[variants] = (node_log_likelihood[variants]
+                                            + self.model.log_probabilities[variant_index.code[variants], end_state])
+        case_node = variant_index.case_node
+        self.log_likelihood = variant_log_likelihood[case_node]
+        # Per transition (including start and end), so long traces are not anomalous for their length alone
+        self.mean_log_likelihood = self.log_likelihood / (variant_index.depth[case_node] + 1)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, smoothing: float = DEFAULT_SMOOTHING) -> 'AnomalyDetector':
+        """
+        Index an event log DataFrame and score its cases.
+
+        Args:
+            df: Event log DataFrame
+            smoothing: Pseudo-count added to every transition
+
+        Returns:
+            AnomalyDetector
+        """
+        return cls(VariantIndex.from_dataframe(df), smoothing)
+
+    def case_scores(self) -> pd.DataFrame:
+        """
+        Scores of every case.
+
+        Returns:
+            DataFrame with case_id, variant_id, variant_cases, length, log_likelihood and
+            mean_log_likelihood (per transition; lower is more anomalous)
+        """
+        index = self.variant_index
+        case_node = index.case_node
+        return pd.DataFrame({
+            'case_id': index.encoded.case_ids,
+            'variant_id': case_node,
+            'variant_cases': index.end_count[case_node],
+            'length': index.depth[case_node],
+            'log_likelihood': self.log_likelihood,
+            'mean_log_likelihood': self.mean_log_likelihood
+        })
+
+    def _rarest_transition(self, case: int) -> str:
+        """Least likely transition of a case's trace, as a readable reason."""
+        encoded = self.variant_index.encoded
+        n = encoded.n_activities
+        codes = encoded.trace(case)
+        states_from = np.r_[n, codes]
+        states_to = np.r_[codes, n]
+        log_probabilities = self.model.log_probabilities[states_from, states_to]
+        position = int(np.argmin(log_probabilities))
+        source = "start" if states_from[position] == n else str(encoded.activities[states_from[position]])
+        target = "end" if states_to[position] == n else str(encoded.activities[states_to[position]])
+        return f"Unlikely transition {source} → {target} (p={np.exp(log_probabilities[position]):.3g})"
+
+    def top_anomalies(self, k: int = 10, min_length: int = 1) -> pd.DataFrame:
+        """
+        The k cases with the lowest per-transition log-likelihood.
+
+        Args:
+            k: Number of cases
+            min_length: Minimum trace length of a reported case
+
+        Returns:
+            DataFrame with case_id, variant, length, score (mean log-likelihood) and reason, most anomalous first
+        """
+        index = self.variant_index
+        lengths = index.depth[index.case_node]
+        candidates = np.flatnonzero(lengths >= min_length)
+        # Heap-based selection: O(n log k) over the cases, without sorting all scores
+        worst = heapq.nsmallest(k, candidates, key=self.mean_log_likelihood.__getitem__)
+
+        return pd.DataFrame({
+            'case_id': index.encoded.case_ids[worst],
+            'variant': [",".join(map(str, index.encoded.decode(index.encoded.trace(case)))) for case in worst],
+            'length': lengths[worst],
+            'score': self.mean_log_likelihood[worst],
+            'reason': [self._rarest_transition(case) for case in worst]
+        }, columns=['case_id', 'variant', 'length', 'score', 'reason'])
+
+
+def detect_anomalies(event_log: pd.DataFrame, k: int = 10, variant_index: Optional[VariantIndex] = None) -> pd.DataFrame:
+    """
+    Most anomalous cases of an event log DataFrame.
+
+    Args:
+        event_log: Event log DataFrame
+        k: Number of cases
+        variant_index: Variant index of the log, if one was already built
+
+    Returns:
+        DataFrame in the layout of AnomalyDetector.top_anomalies
+    """
+    if variant_index is None:
+        variant_index = VariantIndex.from_dataframe(event_log)
+    return AnomalyDetector(variant_index).top_anomalies(k)
@@ -0,0 +1,243 @@
+"""
+Analysis artifact bundle for educational process mining.
+main.py can write the results the dashboards display (event log, case metrics,
+DFG, variants, patterns, conformance scores, bottlenecks) as Parquet tables
+plus a versioned manifest, so the dashboards load them instead of recomputing.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from variant_index import VariantIndex
+
+# Bump when tables are added, removed or change layout; dashboards refuse other versions
+ARTIFACT_FORMAT_VERSION = 3
+MANIFEST_FILE = "manifest.json"
+BUNDLE_PREFIX = "bundle_"
+
+
+def _dfg_tables(discovery_results: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Directly-follows edges and start/end activity counts as tables."""
+    dfg = discovery_results.get('dfg') or {}
+    edges = pd.DataFrame(
+        [(source, target, frequency) for (source, target), frequency in dfg.items()],
+        columns=['source', 'target', 'frequency']
+    )
+    endpoints = pd.DataFrame(
+        [(activity, kind, count)
+         for kind in ('start', 'end')
+         for activity, count in (discovery_results.get(f'{kind}_activities') or {}).items()],
+        columns=['activity', 'kind', 'count']
+    )
+    return edges, endpoints
+
+
+def _variant_table(event_log: pd.DataFrame) -> pd.DataFrame:
+    """Every trace variant with its number of cases, most frequent first."""
+    variants = VariantIndex.from_dataframe(event_log).top_variants(k=None)
+    variants['variant'] = variants['variant'].map(lambda activities: ",".join(map(str, activities)))
+    return variants[['variant', 'count', 'percentage']]
+
+
+def _conformance_table(conformance_results: Dict) -> pd.DataFrame:
+    """Per-case sequence and behavioral conformance scores."""
+    sequence = conformance_results.get('sequence_conformance', {})
+    behavioral = conformance_results.get('behavioral_conformance', {})
+    rows = []
+    for case_id, result in sequence.items():
+        rows.append({
+            'case_id': case_id,
+            'total_transitions': result['total_transitions'],
+            'expected_transitions': result['expected_transitions'],
+            'conformance_ratio': result['conformance_ratio'],
+            'exercise_order_correct': result['exercise_order_correct'],
+            'sequence_conformance_score': result['conformance_score'],
+            'behavioral_conformance_score': behavioral.get(case_id, {}).get('behavioral_conformance_score')
+        })
+    return pd.DataFrame(rows)
+
+
+def _pattern_tables(patterns: Dict) -> Dict[str, pd.DataFrame]:
+    """The DataFrames of a dashboard pattern analysis, n-grams stacked into one table."""
+    tables = {
+        f'patterns_{key}': value
+        for key, value in patterns.items() if isinstance(value, pd.DataFrame)
+    }
+    ngram_tables = [table.assign(n=n) for n, table in patterns.get('sequence_patterns', {}).items()]
+    if ngram_tables:
+        ngrams = pd.concat(ngram_tables, ignore_index=True)
+        ngrams['pattern'] = ngrams['pattern'].map(list)
+        tables['patterns_sequence_patterns'] = ngrams
+    return tables
+
+
+def write_artifact_bundle(results: Dict, output_dir: str, run_id: str, dataset: str,
+                          parameters: Dict = None) -> str:
+    """
+    Write the analysis results the dashboards display as a versioned bundle.
+
+    Args:
+        results: Results of EducationalProcessMiningAnalysis.run_complete_analysis
+        output_dir: Output directory; the bundle goes to <output_dir>/artifacts/bundle_<run_id>
+        run_id: Identifier of the run (e.g. a timestamp)
+        dataset: Dataset path the results were computed from
+        parameters: Filter parameters of the run
+
+    Returns:
+        Path of the bundle directory
+    """
+    # Dashboard-side analyses; imported here so main.py does not pay for them unless asked
+    from dashboard.interpreters.bottleneck_detector import detect_bottlenecks
+    from dashboard.interpreters.pattern_analyzer import analyze_patterns
+
+    quality_log = results['preprocessing']['quality_log']
+    performance = results['performance_analysis']
+    dfg_edges, dfg_endpoints = _dfg_tables(results['process_discovery'])
+
+    tables = {
+        'event_log': quality_log,
+        'case_metrics': performance.get('graded_metrics', performance['metrics']),
+        'dfg': dfg_edges,
+        'dfg_endpoints': dfg_endpoints,
+        'variants': _variant_table(quality_log),
+        'conformance': _conformance_table(results['conformance_checking']),
+        'bottlenecks': detect_bottlenecks(quality_log),
+    }
+    tables.update(_pattern_tables(analyze_patterns(quality_log)))
+
+    bundle_dir = os.path.join(output_dir, "artifacts", f"{BUNDLE_PREFIX}{run_id}")
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    table_entries = {}
+    for name, table in tables.items():
+        file_name = f"{name}.parquet"
+        table.to_parquet(os.path.join(bundle_dir, file_name), index=False)
+        table_entries[name] = {'file': file_name, 'rows': len(table), 'columns': list(map(str, table.columns))}
+
+    stats = results['preprocessing']['quality_stats']
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'run_id': run_id,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'dataset': dataset,
+        'parameters': parameters or {},
+        'stats': {key: value for key, value in stats.items() if isinstance(value, (int, float, str))},
+        'tables': table_entries
+    }
+    # The manifest is written last, so a bundle without one is incomplete
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+    return bundle_dir
+
+
+def find_latest_bundle(output_dir: str = "output") -> Optional[str]:
+    """
+    Most recent complete bundle with the current format version.
+
+    Args:
+        output_dir: Output directory of main.py
+
+    Returns:
+        Bundle directory, or None if there is none
+    """
+    artifacts_dir = os.path.join(output_dir, "artifacts")
+    if not os.path.isdir(artifacts_dir):
+        return None
+
+    candidates = []
+    for entry in os.scandir(artifacts_dir):
+        manifest_path = os.path.join(entry.path, MANIFEST_FILE)
+        if not (entry.is_dir() and entry.name.startswith(BUNDLE_PREFIX) and os.path.exists(manifest_path)):
+            continue
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get('format_version') == ARTIFACT_FORMAT_VERSION:
+            candidates.append((manifest.get('created', ''), entry.path))
+
+    return max(candidates)[1] if candidates else None
+
+
+class ArtifactBundle:
+    """Read access to a bundle written by write_artifact_bundle; tables are loaded on first use."""
+
+    def __init__(self, bundle_dir: str):
+        """
+        Open a bundle.
+
+        Args:
+            bundle_dir: Bundle directory
+
+        Raises:
+            ValueError: If the bundle was written in another format version
+        """
+        self.bundle_dir = bundle_dir
+        with open(os.path.join(bundle_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        version = self.manifest.get('format_version')
+        if version != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Artifact bundle {bundle_dir} has format version {version}, expected "
+                             f"{ARTIFACT_FORMAT_VERSION}; re-run main.py with --emit-artifacts")
+        self._tables: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def stats(self) -> Dict:
+        return self.manifest.get('stats', {})
+
+    @property
+    def table_names(self) -> List[str]:
+        return list(self.manifest['tables'])
+
+    def table(self, name: str) -> pd.DataFrame:
+        """
+        Load a table of the bundle.
+
+        Args:
+            name: Table name (see table_names)
+
+        Returns:
+            DataFrame
+        """
+        if name not in self._tables:
+            entry = self.manifest['tables'].get(name)
+            if entry is None:
+                raise KeyError(f"Artifact bundle has no table '{name}'")
+            self._tables[name] = pd.read_parquet(os.path.join(self.bundle_dir, entry['file']))
+        return self._tables[name]
+
+    def dfg(self) -> Tuple[Dict, Dict, Dict]:
+        """Directly-follows graph as (edges, start activities, end activities) dictionaries, like PM4Py."""
+        edges = self.table('dfg')
+        endpoints = self.table('dfg_endpoints')
+        dfg = {(source, target): int(frequency)
+               for source, target, frequency in edges[['source', 'target', 'frequency']].itertuples(index=False)}
+        start, end = ({activity: int(count) for activity, count in
+                       endpoints.loc[endpoints['kind'] == kind, ['activity', 'count']].itertuples(index=False)}
+                      for kind in ('start', 'end'))
+        return dfg, start, end
+
+    def patterns(self) -> Dict:
+        """Pattern analysis in the layout returned by the dashboard's analyze_patterns."""
+        patterns = {
+            'analysis_metadata': {'timestamp': self.manifest.get('created', ''), 'analyst': 'main.py'}
+        }
+        for name in self.table_names:
+            if not name.startswith('patterns_'):
+                continue
+            key = name[len('patterns_'):]
+            table = self.table(name)
+            if key == 'sequence_patterns':
+                patterns[key] = {
+                    int(n): group.drop(columns='n').assign(pattern=group['pattern'].map(tuple)).reset_index(drop=True)
+                    for n, group in table.groupby('n', sort=True)
+                }
+            else:
+                patterns[key] = table
+        return patterns
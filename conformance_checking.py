@@ -5,14 +5,13 @@ Analyzes how well actual student behavior conforms to expected educational proce
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import Dict, List, Tuple, Optional
-import pm4py
 import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from instrumentation import instrumented
+
 
 class ConformanceChecker:
     """Class for checking conformance between actual and expected educational processes."""
@@ -76,6 +75,7 @@ class ConformanceChecker:
         
         return reference_patterns
     
+    @instrumented()
     def calculate_sequence_conformance(self, df: pd.DataFrame, reference_patterns: Dict) -> Dict:
         """
         Calculate conformance based on activity sequences.
@@ -139,6 +139,7 @@ class ConformanceChecker:
         
         return conformance_results
     
+    @instrumented()
     def calculate_behavioral_conformance(self, df: pd.DataFrame, reference_patterns: Dict) -> Dict:
         """
         Calculate conformance based on behavioral patterns and time allocation.
@@ -183,6 +184,7 @@ class ConformanceChecker:
         
         return behavioral_results
     
+    @instrumented()
     def identify_deviations(self, sequence_conformance: Dict, behavioral_conformance: Dict) -> Dict:
         """
         Identify and categorize process deviations.
@@ -254,6 +256,7 @@ class ConformanceChecker:
         
         return deviations
     
+    @instrumented()
     def create_conformance_visualizations(self, sequence_conformance: Dict, 
                                         behavioral_conformance: Dict, deviations: Dict) -> None:
         """
@@ -264,6 +267,9 @@ class ConformanceChecker:
             behavioral_conformance: Behavioral conformance results
             deviations: Deviation analysis results
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         # 1. Conformance score distribution
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         
@@ -12,4 +12,50 @@ def show_basic_charts(df: pd.DataFrame):
     num_cols = df.select_dtypes(include="number").columns
     if len(num_cols) > 0:
         st.write("Histogram of first numeric column")
-        st.plotly_chart(px.histogram(df, x=num_cols[0]), use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(px.histogram(df, x=num_cols[0]), use_container_width=True)
+
+def display_analysis_panel(patterns):
+    """
+    Display the results of the pattern analysis.
+    
+    Args:
+        patterns: Dictionary returned by analyze_patterns (or ArtifactBundle.patterns)
+    """
+    metadata = patterns.get("analysis_metadata") or {}
+    if metadata:
+        st.caption(f"Analysis performed: {metadata.get('timestamp', '')} by {metadata.get('analyst', '')}")
+    
+    # Variant distribution (top variants plus "Other")
+    variants = patterns.get("variant_distribution")
+    if variants is not None and not variants.empty:
+        st.subheader("Process Variants")
+        fig = px.bar(
+            variants,
+            x="variant",
+            y="count",
+            hover_data=["activities"],
+            labels={"variant": "Variant", "count": "Number of Cases"},
+            title="Most Frequent Process Variants"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Most frequent transitions
+    sequences = patterns.get("common_sequences")
+    if sequences is not None and not sequences.empty:
+        st.subheader("Common Sequences")
+        st.dataframe(sequences, use_container_width=True)
+    
+    # Longer n-grams, one length at a time
+    sequence_patterns = patterns.get("sequence_patterns") or {}
+    longer = {int(n): table for n, table in sequence_patterns.items() if int(n) > 2 and not table.empty}
+    if longer:
+        st.subheader("Longer Activity Sequences")
+        n = st.selectbox("Sequence length", sorted(longer), key="pattern_ngram_length")
+        table = longer[n].assign(pattern=longer[n]["pattern"].map(lambda pattern: " → ".join(map(str, pattern))))
+        st.dataframe(table, use_container_width=True)
+    
+    # Least likely cases under the Markov model of the log
+    anomalies = patterns.get("anomalies")
+    if anomalies is not None and not anomalies.empty:
+        st.subheader("Potential Anomalies")
+        st.dataframe(anomalies, use_container_width=True)
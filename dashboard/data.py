@@ -10,6 +10,8 @@ try:
 except Exception:
     EPMDataProcessor = None  # type: ignore
 
+from artifacts import ArtifactBundle, find_latest_bundle
+
 
 def load_epm_dataset(repo_root: Path) -> Tuple[pd.DataFrame, pd.DataFrame, dict]:
     """Load the bundled EPM dataset from the repo.
@@ -46,5 +48,48 @@ def load_epm_dataset(repo_root: Path) -> Tuple[pd.DataFrame, pd.DataFrame, dict]
     return raw, event_log, stats
 
 
+def load_shared_epm_dataset(repo_root: Path) -> Tuple[str, pd.DataFrame, dict]:
+    """Load the bundled EPM dataset through the process-wide shared store.
+
+    Every session gets the same memory-mapped event log, built once per
+    dataset version. Returns a tuple of (dataset_version, event_log_df, stats_dict).
+    """
+    dataset_dir = repo_root / "EPM Dataset 2"
+    if not dataset_dir.exists():
+        raise FileNotFoundError(f"Dataset folder not found: {dataset_dir}")
+
+    # Imported here: the shared store needs data_preprocessing, which the CSV-only path may lack
+    from .shared_store import get_shared_store
+
+    store = get_shared_store()
+    version, event_log = store.event_log(str(dataset_dir))
+    if event_log.empty:
+        raise ValueError(f"No data loaded from {dataset_dir}")
+    stats = store.get_or_compute(
+        ("basic_stats", version),
+        lambda: EPMDataProcessor(str(dataset_dir)).get_basic_statistics(event_log),  # type: ignore
+    )
+    return version, event_log, stats
+
+
+def find_artifact_bundle(repo_root: Path) -> str:
+    """Directory of the latest artifact bundle written by `main.py --emit-artifacts`."""
+    bundle_dir = find_latest_bundle(str(repo_root / "output"))
+    if bundle_dir is None:
+        raise FileNotFoundError(
+            f"No artifact bundle in {repo_root / 'output'}; run `python main.py --emit-artifacts` first"
+        )
+    return bundle_dir
+
+
+def load_artifact_bundle(bundle_dir: str) -> Tuple[ArtifactBundle, pd.DataFrame, dict]:
+    """Load an artifact bundle directory (see find_artifact_bundle).
+
+    Returns a tuple of (bundle, event_log_df, stats_dict).
+    """
+    bundle = ArtifactBundle(bundle_dir)
+    return bundle, bundle.table("event_log"), bundle.stats
+
+
 def load_csv(path: str) -> pd.DataFrame:
     return pd.read_csv(path)
@@ -1,28 +1,34 @@
 import streamlit as st
 import pandas as pd
-import pm4py
 import plotly.graph_objects as go
-import networkx as nx
 from pathlib import Path
 import sys
 import os
+import uuid
 from datetime import datetime
 
 # Add the parent directory to the path to import from the main module
 sys.path.append(str(Path(__file__).parent.parent))
 
 # Import data preprocessing
-from data_preprocessing import EPMDataProcessor
+from data_preprocessing import EventLogIndex
+from instrumentation import RunProfiler
+from artifacts import ArtifactBundle, find_latest_bundle
+from pattern_mining import format_pattern
+from variant_index import VariantIndex
+from incremental_dfg import IncrementalDFG
+from time_index import TimeIndex
 
-# Import dashboard components (use fixed versions, relative imports)
-from components.process_map_fixed import generate_process_map
-from components.metrics_panel_fixed import display_metrics_panel
+# Import dashboard components (relative imports)
+from components.process_map import generate_process_map
+from components.metrics_panel import display_metrics_panel
 from components.analysis_panel import display_analysis_panel
 
 # Import interpreters (relative imports)
-from interpreters.pattern_analyzer_fixed import analyze_patterns
-from interpreters.bottleneck_detector_fixed import detect_bottlenecks
 from interpreters.conformance_analyzer import analyze_conformance
+from interpreters.progressive import progressive_dfg, progressive_bottlenecks, progressive_patterns
+from jobs import get_job_executor, display_job
+from shared_store import get_shared_store, freeze
 
 # Dashboard metadata
 LAST_UPDATED = "2025-08-22 16:30:00"
@@ -59,6 +65,92 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def load_indexed_dataset(dataset_path):
+    """
+    Event log of the dataset, indexed for in-memory filtering.
+    
+    The log and its index live in the shared store, so all sessions use one
+    copy per dataset version; a changed session file yields a new version.
+    
+    Returns:
+        Tuple of (dataset version, EventLogIndex or None if the dataset is empty)
+    """
+    store = get_shared_store()
+    version, event_log = store.event_log(dataset_path)
+    if event_log.empty:
+        return version, None
+    
+    def build_index():
+        indexed_log = event_log.assign(session_info="Session " + event_log['session'].astype(str))
+        return EventLogIndex(indexed_log)
+    
+    return version, store.get_or_compute(("event_log_index", version), build_index)
+
+def load_session_window_dfg(dataset_version, log_index, sessions, min_events_per_case, exclude_activities):
+    """
+    Directly-follows graph of a window of sessions, summed from per-session graphs.
+    
+    Cases never span sessions and the quality filters act per case, so each
+    session's graph is counted once per filter setting and kept in the shared
+    store; any window of sessions (e.g. 3-5) is then a sum of stored count
+    matrices instead of a scan of its events.
+    
+    Returns:
+        IncrementalDFG of the filtered events of the sessions
+    """
+    store = get_shared_store()
+    
+    def session_dfg(session):
+        return store.get_or_compute(
+            ("session_dfg", dataset_version, session, min_events_per_case, freeze(exclude_activities)),
+            lambda: IncrementalDFG.from_dataframe(log_index.filter(
+                sessions=[session],
+                min_events_per_case=min_events_per_case,
+                exclude_activities=exclude_activities
+            ))
+        )
+    
+    return IncrementalDFG.combine(session_dfg(session) for session in sessions)
+
+@st.cache_resource(show_spinner=False)
+def load_artifact_bundle(bundle_dir):
+    """Open an artifact bundle written by main.py --emit-artifacts; tables load on first use."""
+    return ArtifactBundle(bundle_dir)
+
+def render_dashboard(event_log, raw_data=None, profile=False, artifacts=None, result_key=None, window_dfg=None):
+    """
+    Display the dashboard, optionally under a run profiler writing to output/.
+    
+    The run profiler covers the script thread; the background analysis jobs
+    started by this run are profiled on their worker threads, one file each.
+    """
+    if not profile:
+        display_dashboard(event_log, raw_data, artifacts, result_key, window_dfg)
+        return
+    
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    with RunProfiler("output", run_id) as profiler:
+        display_dashboard(event_log, raw_data, artifacts, result_key, window_dfg, profile_id=run_id)
+    st.caption("Profile of the page run (script thread) saved: " + ", ".join(profiler.outputs.values()))
+
+def submit_analysis_job(view_token, name, fn, event_log, profile_id=None):
+    """
+    Start (or join) the background job computing an analysis of the rendered dataset.
+    
+    With a profile_id the job runs in its own RunProfiler on the worker thread,
+    writing output/run_profile_<profile_id>_<name>.*; it gets its own key, so
+    the profiled run computes the analysis instead of reusing a finished job.
+    """
+    if profile_id is None:
+        return get_job_executor().submit((view_token, name), fn, event_log)
+    profiler = RunProfiler("output", f"{profile_id}_{name}")
+    return get_job_executor().submit_profiled((view_token, name, profile_id), profiler, fn, event_log)
+
+def show_job_profile(job, title):
+    """Caption with the profile files of a finished profiled job."""
+    if job.profiler is not None and job.profiler.outputs:
+        st.caption(f"Profile of the {title} job (worker thread) saved: " + ", ".join(job.profiler.outputs.values()))
+
 def main():
     st.markdown("<h1 class='enhanced-header'>Process Mining Educational Dashboard - Enhanced Version</h1>", unsafe_allow_html=True)
     st.caption(f"Last updated: {LAST_UPDATED} | Author: {AUTHOR}")
@@ -67,6 +159,10 @@ def main():
     # Create a 2-column layout: sidebar for config, main area for content
     with st.sidebar:
         st.header("Configuration")
+        profile_run = st.checkbox("Profile this run", value=False,
+                                  help="Write cProfile stats and a flamegraph stack file to output/: one for the "
+                                       "page run and one for each background analysis (process map, bottlenecks, "
+                                       "patterns), profiled on its worker thread")
         
         # Dataset selection tabs
         dataset_tab1, dataset_tab2 = st.tabs(["EPM Dataset", "Custom Upload"])
@@ -75,6 +171,18 @@ def main():
             # Option to load built-in EPM dataset
             use_builtin_dataset = st.checkbox("Use built-in EPM Dataset", value=True)
             
+            # Results precomputed by `python main.py --emit-artifacts` are shown without recomputing
+            bundle_dir = find_latest_bundle("output")
+            if use_builtin_dataset and bundle_dir:
+                st.caption(f"Artifact bundle available: {bundle_dir}")
+                if st.button("Load Precomputed Results", key="load_bundle"):
+                    try:
+                        bundle = load_artifact_bundle(bundle_dir)
+                        bundle_log = bundle.table('event_log')
+                        render_dashboard(bundle_log, bundle_log, profile_run, bundle, ("bundle", bundle_dir))
+                    except Exception as e:
+                        st.error(f"Error loading artifact bundle: {str(e)}")
+            
             if use_builtin_dataset:
                 # Dataset path configuration
                 dataset_path = "EPM Dataset 2"
@@ -110,65 +218,26 @@ def main():
                     # Process the dataset when button is clicked
                     if st.button("Process EPM Dataset", key="process_epm"):
                         with st.spinner("Loading and processing EPM dataset..."):
-                            # Create data processor
-                            processor = EPMDataProcessor(dataset_path)
+                            # The full dataset is loaded once; session and quality filters are masks over it
+                            dataset_version, log_index = load_indexed_dataset(dataset_path)
                             
-                            # Load only the selected sessions
-                            processor.sessions = selected_sessions
-                            
-                            # Load raw data
-                            raw_data = processor.load_all_data()
-                            
-                            if raw_data.empty:
+                            if log_index is None:
                                 st.error("Failed to load dataset. Please check the dataset path.")
                             else:
-                                # Create event log
-                                event_log = processor.create_event_log(raw_data)
-                                
-                                # Extract session information
-                                session_info_dict = {}
-                                
-                                # Create mapping of case_id to session
-                                for _, row in raw_data.iterrows():
-                                    if 'case_id' in row and 'session' in row:
-                                        case_id = row['case_id']
-                                        session = row['session']
-                                        session_info_dict[case_id] = f"Session {session}"
-                                
-                                # PM4Py might handle event logs differently depending on version
-                                # We'll adapt to multiple formats
-                                
-                                # Check if event_log is a DataFrame
-                                if isinstance(event_log, pd.DataFrame):
-                                    if 'case:concept:name' in event_log.columns:
-                                        # Add session info as a column
-                                        event_log['session_info'] = event_log['case:concept:name'].map(
-                                            lambda x: session_info_dict.get(x, "Unknown"))
-                                else:
-                                    # Try to handle as PM4Py EventLog object 
-                                    try:
-                                        # Add session info to trace attributes if possible
-                                        for trace in event_log:
-                                            try:
-                                                if hasattr(trace, 'attributes'):
-                                                    case_id = trace.attributes["concept:name"]
-                                                    if case_id in session_info_dict:
-                                                        trace.attributes["session_info"] = session_info_dict[case_id]
-                                                        
-                                                        # Add to events as well
-                                                        for event in trace:
-                                                            event["session_info"] = session_info_dict[case_id]
-                                            except Exception as e:
-                                                st.warning(f"Could not process trace: {e}")
-                                                continue
-                                    except Exception as e:
-                                        st.warning(f"Event log format is not as expected: {e}")
+                                session_numbers = [int(s.split()[-1]) for s in selected_sessions]
+                                event_log = log_index.event_log
+                                raw_data = event_log[event_log['session'].isin(session_numbers)]
                                 
-                                # Apply quality filters
-                                quality_log = processor.filter_by_criteria(
-                                    event_log, 
-                                    min_events_per_case=min_events_per_case,
-                                    exclude_activities=exclude_activities
+                                # Sessions with the same filters share the filtered log and every analysis of it
+                                result_key = ("epm", dataset_version, freeze(selected_sessions),
+                                              min_events_per_case, freeze(exclude_activities))
+                                quality_log = get_shared_store().get_or_compute(
+                                    ("filter",) + result_key,
+                                    lambda: log_index.filter(
+                                        sessions=selected_sessions,
+                                        min_events_per_case=min_events_per_case,
+                                        exclude_activities=exclude_activities
+                                    )
                                 )
                                 
                                 # Verify sessions are preserved (adapt to different event log formats)
@@ -197,7 +266,12 @@ def main():
                                     st.warning(f"Some sessions were lost during filtering. Keeping {len(preserved_sessions)} out of {len(selected_sessions)} sessions.")
                                 
                                 # Process the log for dashboard display
-                                display_dashboard(quality_log, raw_data)
+                                window_dfg = lambda: load_session_window_dfg(
+                                    dataset_version, log_index, session_numbers,
+                                    min_events_per_case, exclude_activities
+                                )
+                                render_dashboard(quality_log, raw_data, profile_run, result_key=result_key,
+                                                 window_dfg=window_dfg)
                 else:
                     st.error(f"EPM Dataset not found at {dataset_path}. Please check the path.")
         
@@ -216,19 +290,21 @@ def main():
                     
                     if st.button("Process Event Log", key="process_csv"):
                         # Convert to event log
+                        import pm4py
                         event_log = pm4py.format_dataframe(
                             df, 
                             case_id=case_id_col, 
                             activity_key=activity_col, 
                             timestamp_key=timestamp_col
                         )
-                        display_dashboard(event_log, df)
+                        render_dashboard(event_log, df, profile_run)
                 else:
                     # XES file
                     if st.button("Process Event Log", key="process_xes"):
                         try:
+                            import pm4py
                             event_log = pm4py.read_xes(uploaded_file)
-                            display_dashboard(event_log, None)
+                            render_dashboard(event_log, None, profile_run)
                         except Exception as e:
                             st.error(f"Error reading XES file: {str(e)}")
         
@@ -245,79 +321,176 @@ def main():
         st.divider()
         st.info(f"Current session: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-def display_dashboard(event_log, raw_data=None):
-    # Display dataset summary first
-    st.header("Dataset Summary")
-    
-    # Basic statistics - handle different event log formats
-    try:
-        if isinstance(event_log, pd.DataFrame):
-            num_cases = event_log['case:concept:name'].nunique() if 'case:concept:name' in event_log.columns else 0
-            num_events = len(event_log)
-            num_activities = event_log['concept:name'].nunique() if 'concept:name' in event_log.columns else 0
-        else:
-            # Try to handle as PM4Py EventLog object
-            num_cases = len(event_log)
-            num_events = sum(len(trace) for trace in event_log)
-            
-            # Extract activities from events
-            activities = set()
-            for trace in event_log:
-                for event in trace:
+# Views below the dataset summary; only the selected one is computed on each run
+DASHBOARD_VIEWS = ["Process Map", "Performance Metrics", "Patterns & Insights", "Variant Explorer",
+                   "Conformance", "Activity Frequency", "Hourly Activity"]
+
+TIMELINE_GRANULARITIES = ["day", "hour", "minute"]
+
+def cached_view_result(view_token, name, compute):
+    """Compute a view's analysis on first display and reuse it when the user switches back."""
+    cache = st.session_state.setdefault("view_results", {})
+    if cache.get("token") != view_token:
+        # A new dataset was rendered: drop the results of the previous one
+        cache.clear()
+        cache["token"] = view_token
+    if name not in cache:
+        cache[name] = compute()
+    return cache[name]
+
+def count_activities(event_log):
+    """Number of events per activity, for DataFrames and PM4Py EventLog objects."""
+    activity_counts = {}
+    if isinstance(event_log, pd.DataFrame):
+        if 'concept:name' in event_log.columns:
+            activity_counts = event_log['concept:name'].value_counts().to_dict()
+    else:
+        # Try to handle as PM4Py EventLog object
+        for trace in event_log:
+            for event in trace:
+                try:
                     if 'concept:name' in event:
-                        activities.add(event['concept:name'])
-            num_activities = len(activities)
-    except Exception as e:
-        st.error(f"Error calculating statistics: {str(e)}")
-        num_cases = 0
-        num_events = 0
-        num_activities = 0
-    
-    # Display metrics in columns
+                        activity = event["concept:name"]
+                        activity_counts[activity] = activity_counts.get(activity, 0) + 1
+                except (TypeError, KeyError):
+                    continue
+    return activity_counts
+
+def count_event_hours(event_log):
+    """Number of events per hour of the day, for DataFrames and PM4Py EventLog objects."""
+    hour_counts = {}
+    if isinstance(event_log, pd.DataFrame):
+        if 'time:timestamp' in event_log.columns:
+            # Ensure timestamp is datetime
+            if pd.api.types.is_datetime64_any_dtype(event_log['time:timestamp']):
+                hour_counts.update(event_log['time:timestamp'].dt.hour.value_counts().to_dict())
+    else:
+        # Try to handle as PM4Py EventLog object
+        for trace in event_log:
+            for event in trace:
+                try:
+                    if "time:timestamp" in event:
+                        timestamp = event["time:timestamp"]
+                        if hasattr(timestamp, 'hour'):  # Check if it's a datetime object
+                            hour = timestamp.hour
+                            hour_counts[hour] = hour_counts.get(hour, 0) + 1
+                except (TypeError, KeyError):
+                    continue
+    return hour_counts
+
+def display_event_timeline(time_index, start, end):
+    """Events over time in [start, end), read from the time index's buckets."""
+    granularity = st.radio("Timeline granularity", TIMELINE_GRANULARITIES, horizontal=True,
+                           key="timeline_granularity")
+    timeline = time_index.timeline(granularity, start, end)
+    fig = go.Figure(data=[go.Bar(x=timeline.index, y=timeline.to_numpy(), marker_color='darkblue')])
+    fig.update_layout(
+        title=f"Events per {granularity}",
+        xaxis_title="Time",
+        yaxis_title="Number of Events",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_variant_explorer(event_log, variant_index, view_token):
+    """
+    Explore the variants of a log: coverage curve, drill-down by trace prefix,
+    most frequent variants below the prefix and the events of selected variants.
+    """
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Cases", f"{num_cases:,}")
-    col2.metric("Total Events", f"{num_events:,}")
-    col3.metric("Unique Activities", num_activities)
+    col1.metric("Cases", f"{variant_index.n_cases:,}")
+    col2.metric("Variants", f"{variant_index.n_variants:,}")
+    col3.metric("Variants covering 80% of cases", f"{variant_index.variants_for_coverage(0.8):,}")
     
-    # If we have raw data, display session information
-    if raw_data is not None and 'session' in raw_data.columns and 'student_id' in raw_data.columns:
-        # Display sessions information
-        sessions_info = raw_data.groupby('session')['student_id'].nunique()
-        
-        st.subheader("Session Breakdown")
-        
-        # Prepare data for bar chart
-        sessions = sessions_info.index.tolist()
-        student_counts = sessions_info.values.tolist()
-        
-        # Create bar chart
-        fig = go.Figure(data=[
-            go.Bar(
-                x=sessions, 
-                y=student_counts,
-                text=student_counts,
-                textposition='auto',
-                marker_color='royalblue'
-            )
-        ])
-        fig.update_layout(
-            title="Number of Students per Session",
-            xaxis_title="Session",
-            yaxis_title="Number of Students",
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    coverage = variant_index.coverage_curve()
+    fig = go.Figure(data=[go.Scatter(x=coverage['rank'], y=coverage['coverage'] * 100, mode='lines',
+                                     marker_color='darkblue')])
+    fig.update_layout(title="Variant Coverage", xaxis_title="Most frequent variants",
+                      yaxis_title="Cases covered (%)", height=350)
+    st.plotly_chart(fig, use_container_width=True)
     
-    # Success message
-    st.success(f"Dataset successfully loaded with {num_cases} cases containing {num_events:,} events.")
+    # The prefix is kept per rendered dataset and extended one activity at a time
+    prefix = cached_view_result(view_token, "variant_prefix", list)
+    st.subheader("Drill Down by Prefix")
+    st.markdown("**Prefix:** " + (format_pattern(tuple(map(str, prefix))) if prefix else "*(all cases)*"))
+    next_activities = variant_index.children(prefix)
+    if not next_activities.empty:
+        st.dataframe(next_activities, use_container_width=True)
+        col1, col2 = st.columns([3, 1])
+        next_activity = col1.selectbox("Next activity", next_activities['activity'].tolist(),
+                                       key="variant_next_activity")
+        col2.button("Add to prefix", on_click=prefix.append, args=(next_activity,))
+    if prefix:
+        st.button("Reset prefix", on_click=prefix.clear)
+    
+    st.subheader("Most Frequent Variants")
+    top_k = st.slider("Variants to show", min_value=5, max_value=100, value=20, step=5, key="variant_top_k")
+    top_variants = variant_index.top_variants(k=top_k, prefix=prefix)
+    table = top_variants.assign(variant=top_variants['variant'].map(lambda v: format_pattern(tuple(map(str, v)))))
+    st.dataframe(table.drop(columns='variant_id'), use_container_width=True)
+    
+    labels = {int(variant_id): f"#{rank + 1} ({count} cases)"
+              for rank, (variant_id, count) in enumerate(zip(top_variants['variant_id'], top_variants['count']))}
+    selected = st.multiselect("Filter the log to variants", list(labels), format_func=labels.get,
+                              key="variant_selection")
+    if selected:
+        filtered = variant_index.filter(event_log, variants=selected)
+        col1, col2 = st.columns(2)
+        col1.metric("Selected cases", f"{int(variant_index.case_mask(variants=selected).sum()):,}")
+        col2.metric("Selected events", f"{len(filtered):,}")
+        st.dataframe(filtered.head(1000), use_container_width=True)
+
+REWORK_SORT_COLUMNS = ["rework_count", "rework_rate", "self_loops", "return_loops", "mean_return_distance"]
+
+def display_rework_hot_spots(patterns):
+    """Rework per activity and per case from a pattern analysis, filtered and sorted without recomputing it."""
+    if "rework_by_activity" not in patterns:
+        return
+    st.subheader("Rework Hot Spots")
+    col1, col2 = st.columns(2)
+    min_rate = col1.slider("Minimum rework rate", min_value=0.0, max_value=1.0, value=0.0, step=0.05,
+                           key="rework_min_rate")
+    sort_by = col2.selectbox("Sort by", REWORK_SORT_COLUMNS, key="rework_sort_by")
+    for name, title in (("rework_by_activity", "By activity"), ("rework_by_case", "By case")):
+        table = patterns[name]
+        table = table[table["rework_rate"] >= min_rate].sort_values(sort_by, ascending=False, kind="stable")
+        st.markdown(f"**{title}**")
+        st.dataframe(table, use_container_width=True)
+
+@st.fragment
+def display_analysis_views(event_log, artifacts=None, view_token=None, window_dfg=None, profile_id=None):
+    """
+    Analysis views of the dashboard behind a view selector.
     
-    # Create tabs for different views in the main panel
-    tab1, tab2, tab3, tab4 = st.tabs(["Process Map", "Performance Metrics", "Patterns & Insights", "Conformance"])
+    Unlike st.tabs, which runs every tab body on every rerun, only the selected
+    view is computed. As a fragment, switching views reruns just this part of
+    the page, and each view's results are cached for the rendered dataset. The
+    process map, bottleneck and pattern analyses run as background jobs whose
+    partial results are shown while they compute. A window_dfg function,
+    returning the IncrementalDFG of the shown sessions, replaces the process
+    map's scan of the log. With a profile_id the background jobs are profiled.
+    """
+    view = st.radio("View", DASHBOARD_VIEWS, horizontal=True, key="dashboard_view",
+                    label_visibility="collapsed")
     
-    with tab1:
+    if view == "Process Map":
         st.header("Process Discovery Visualization")
         try:
-            process_map_fig = generate_process_map(event_log)
+            if artifacts:
+                dfg = artifacts.dfg()
+            elif window_dfg is not None:
+                dfg = cached_view_result(view_token, "dfg", lambda: window_dfg().to_dicts())
+            else:
+                # The map of the first cases is drawn while the rest of the log is processed
+                dfg_job = submit_analysis_job(view_token, "dfg", progressive_dfg, event_log, profile_id)
+                dfg = display_job(
+                    dfg_job, lambda result: None,
+                    render_partial=lambda partial: st.plotly_chart(generate_process_map(event_log, dfg=partial),
+                                                                   use_container_width=True)
+                )
+                show_job_profile(dfg_job, "process map")
+            process_map_fig = cached_view_result(view_token, "process_map",
+                                                 lambda: generate_process_map(event_log, dfg=dfg))
             st.plotly_chart(process_map_fig, use_container_width=True)
             
             st.subheader("Interpretation")
@@ -334,15 +507,20 @@ def display_dashboard(event_log, raw_data=None):
             st.error(f"Error generating process map: {str(e)}")
             st.info("Please try adjusting your filtering parameters or selecting different sessions.")
     
-    with tab2:
+    elif view == "Performance Metrics":
         st.header("Performance Metrics")
         try:
             display_metrics_panel(event_log)
             
             # Bottleneck analysis
-            bottlenecks = detect_bottlenecks(event_log)
             st.subheader("Bottleneck Analysis")
-            st.dataframe(bottlenecks)
+            if artifacts:
+                st.dataframe(artifacts.table('bottlenecks'))
+            else:
+                bottleneck_job = submit_analysis_job(view_token, "bottlenecks", progressive_bottlenecks, event_log,
+                                                     profile_id)
+                display_job(bottleneck_job, st.dataframe)
+                show_job_profile(bottleneck_job, "bottleneck")
             
             st.subheader("Interpretation")
             st.markdown("""
@@ -355,11 +533,20 @@ def display_dashboard(event_log, raw_data=None):
             st.error(f"Error generating performance metrics: {str(e)}")
             st.info("Please try adjusting your filtering parameters or selecting different sessions.")
     
-    with tab3:
+    elif view == "Patterns & Insights":
         st.header("Process Patterns & Insights")
         try:
-            patterns = analyze_patterns(event_log)
-            display_analysis_panel(patterns)
+            if artifacts:
+                patterns = artifacts.patterns()
+                display_analysis_panel(patterns)
+            else:
+                pattern_job = submit_analysis_job(view_token, "patterns", progressive_patterns, event_log, profile_id)
+                patterns = display_job(
+                    pattern_job, display_analysis_panel,
+                    render_partial=lambda partial: st.dataframe(partial["common_sequences"])
+                )
+                show_job_profile(pattern_job, "pattern")
+            display_rework_hot_spots(patterns)
             
             st.subheader("Interpretation")
             st.markdown("""
@@ -373,7 +560,19 @@ def display_dashboard(event_log, raw_data=None):
             st.error(f"Error analyzing patterns: {str(e)}")
             st.info("Please try adjusting your filtering parameters or selecting different sessions.")
     
-    with tab4:
+    elif view == "Variant Explorer":
+        st.header("Variant Explorer")
+        if isinstance(event_log, pd.DataFrame) and 'case:concept:name' in event_log.columns:
+            try:
+                variant_index = cached_view_result(view_token, "variant_index",
+                                                   lambda: VariantIndex.from_dataframe(event_log))
+                display_variant_explorer(event_log, variant_index, view_token)
+            except Exception as e:
+                st.error(f"Error exploring variants: {str(e)}")
+        else:
+            st.info("The variant explorer needs an event log DataFrame.")
+    
+    elif view == "Conformance":
         st.header("Conformance Checking")
         st.info("Upload a reference model (BPMN or Petri Net) to perform conformance checking")
         ref_model = st.file_uploader("Upload reference model", type=["pnml", "bpmn"])
@@ -394,117 +593,171 @@ def display_dashboard(event_log, raw_data=None):
             except Exception as e:
                 st.error(f"Error in conformance checking: {str(e)}")
     
-    # Additional analysis sections in the main panel (outside of tabs)
-    st.header("Activity Frequency Analysis")
+    elif view == "Activity Frequency":
+        st.header("Activity Frequency Analysis")
+        
+        activity_counts = {}
+        try:
+            activity_counts = cached_view_result(view_token, "activity_counts", lambda: count_activities(event_log))
+        except Exception as e:
+            st.error(f"Error calculating activity frequencies: {str(e)}")
+        
+        # Sort by frequency
+        sorted_activities = sorted(activity_counts.items(), key=lambda x: x[1], reverse=True)
+        
+        if sorted_activities:
+            # Display as horizontal bar chart
+            fig = go.Figure(data=[
+                go.Bar(
+                    y=[a[0] for a in sorted_activities[:15]],  # Top 15 activities
+                    x=[a[1] for a in sorted_activities[:15]],
+                    orientation='h',
+                    marker_color='lightblue'
+                )
+            ])
+            fig.update_layout(
+                title="Top 15 Most Frequent Activities",
+                yaxis_title="Activity",
+                xaxis_title="Frequency",
+                height=500
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No activity data available for frequency analysis.")
     
-    # Calculate activity frequencies - handle different event log formats
-    activity_counts = {}
+    elif view == "Hourly Activity":
+        st.header("Hourly Activity Distribution")
+        try:
+            time_index = None
+            if (isinstance(event_log, pd.DataFrame) and 'time:timestamp' in event_log.columns
+                    and pd.api.types.is_datetime64_any_dtype(event_log['time:timestamp'])):
+                # Sorted once per dataset; histograms and timelines of any date range then read its buckets
+                time_index = cached_view_result(view_token, "time_index", lambda: TimeIndex.from_dataframe(event_log))
+            
+            if time_index is not None and time_index.n_events:
+                days = time_index.timeline("day").index.date.tolist()
+                first_day, last_day = days[0], days[-1]
+                if len(days) > 1:
+                    first_day, last_day = st.select_slider("Date range", options=days, value=(first_day, last_day),
+                                                           key="hourly_date_range")
+                start, end = pd.Timestamp(first_day), pd.Timestamp(last_day) + pd.Timedelta(days=1)
+                hour_counts = time_index.hourly_distribution(start, end)
+            else:
+                time_index = None
+                hour_counts = cached_view_result(view_token, "hour_counts", lambda: count_event_hours(event_log))
+            
+            if hour_counts:
+                # Create hour labels for all 24 hours
+                hours = list(range(24))
+                counts = [hour_counts.get(hour, 0) for hour in hours]
+                
+                # Display as line chart
+                fig = go.Figure(data=[
+                    go.Scatter(
+                        x=hours,
+                        y=counts,
+                        mode='lines+markers',
+                        marker_color='darkblue',
+                        line=dict(width=2)
+                    )
+                ])
+                fig.update_layout(
+                    title="Activity Distribution by Hour of Day",
+                    xaxis_title="Hour of Day",
+                    yaxis_title="Number of Events",
+                    height=400,
+                    xaxis=dict(tickmode='array', tickvals=list(range(24)))
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                
+                st.markdown("""
+                The hourly activity distribution reveals when students are most active in their learning process.
+                This can help identify:
+                - **Peak learning hours**: When most educational activities take place
+                - **Study patterns**: Whether learning happens more in mornings, afternoons, or evenings
+                - **Potential for scheduling**: Optimal times for synchronous activities or support
+                """)
+                
+                if time_index is not None:
+                    display_event_timeline(time_index, start, end)
+            else:
+                st.info("No timestamp data available for hourly distribution analysis.")
+        except Exception as e:
+            st.info("Could not generate hourly activity distribution.")
+
+def display_dashboard(event_log, raw_data=None, artifacts=None, result_key=None, window_dfg=None, profile_id=None):
+    # Display dataset summary first
+    st.header("Dataset Summary")
+    
+    # Basic statistics - handle different event log formats
     try:
         if isinstance(event_log, pd.DataFrame):
-            if 'concept:name' in event_log.columns:
-                activity_counts = event_log['concept:name'].value_counts().to_dict()
+            num_cases = event_log['case:concept:name'].nunique() if 'case:concept:name' in event_log.columns else 0
+            num_events = len(event_log)
+            num_activities = event_log['concept:name'].nunique() if 'concept:name' in event_log.columns else 0
         else:
             # Try to handle as PM4Py EventLog object
+            num_cases = len(event_log)
+            num_events = sum(len(trace) for trace in event_log)
+            
+            # Extract activities from events
+            activities = set()
             for trace in event_log:
                 for event in trace:
-                    try:
-                        if 'concept:name' in event:
-                            activity = event["concept:name"]
-                            activity_counts[activity] = activity_counts.get(activity, 0) + 1
-                    except (TypeError, KeyError):
-                        continue
+                    if 'concept:name' in event:
+                        activities.add(event['concept:name'])
+            num_activities = len(activities)
     except Exception as e:
-        st.error(f"Error calculating activity frequencies: {str(e)}")
+        st.error(f"Error calculating statistics: {str(e)}")
+        num_cases = 0
+        num_events = 0
+        num_activities = 0
     
-    # Sort by frequency
-    sorted_activities = sorted(activity_counts.items(), key=lambda x: x[1], reverse=True)
+    # Display metrics in columns
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Cases", f"{num_cases:,}")
+    col2.metric("Total Events", f"{num_events:,}")
+    col3.metric("Unique Activities", num_activities)
     
-    if sorted_activities:
-        # Display as horizontal bar chart
+    # If we have raw data, display session information
+    if raw_data is not None and 'session' in raw_data.columns and 'student_id' in raw_data.columns:
+        # Display sessions information
+        sessions_info = raw_data.groupby('session')['student_id'].nunique()
+        
+        st.subheader("Session Breakdown")
+        
+        # Prepare data for bar chart
+        sessions = sessions_info.index.tolist()
+        student_counts = sessions_info.values.tolist()
+        
+        # Create bar chart
         fig = go.Figure(data=[
             go.Bar(
-                y=[a[0] for a in sorted_activities[:15]],  # Top 15 activities
-                x=[a[1] for a in sorted_activities[:15]],
-                orientation='h',
-                marker_color='lightblue'
+                x=sessions, 
+                y=student_counts,
+                text=student_counts,
+                textposition='auto',
+                marker_color='royalblue'
             )
         ])
         fig.update_layout(
-            title="Top 15 Most Frequent Activities",
-            yaxis_title="Activity",
-            xaxis_title="Frequency",
-            height=500
+            title="Number of Students per Session",
+            xaxis_title="Session",
+            yaxis_title="Number of Students",
+            height=400
         )
         st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No activity data available for frequency analysis.")
     
-    # Add hourly activity distribution if timestamp data is available
-    st.header("Hourly Activity Distribution")
-    
-    # Extract hour information from events - handle different event log formats
-    hour_counts = {}
+    # Success message
+    st.success(f"Dataset successfully loaded with {num_cases} cases containing {num_events:,} events.")
     
-    try:
-        if isinstance(event_log, pd.DataFrame):
-            if 'time:timestamp' in event_log.columns:
-                # Ensure timestamp is datetime
-                if pd.api.types.is_datetime64_any_dtype(event_log['time:timestamp']):
-                    hour_data = event_log['time:timestamp'].dt.hour.value_counts().to_dict()
-                    hour_counts.update(hour_data)
-        else:
-            # Try to handle as PM4Py EventLog object
-            for trace in event_log:
-                for event in trace:
-                    try:
-                        if "time:timestamp" in event:
-                            timestamp = event["time:timestamp"]
-                            if hasattr(timestamp, 'hour'):  # Check if it's a datetime object
-                                hour = timestamp.hour
-                                hour_counts[hour] = hour_counts.get(hour, 0) + 1
-                    except (TypeError, KeyError):
-                        continue
-        
-        if hour_counts:
-            # Create hour labels for all 24 hours
-            hours = list(range(24))
-            counts = [hour_counts.get(hour, 0) for hour in hours]
-            
-            # Display as line chart
-            fig = go.Figure(data=[
-                go.Scatter(
-                    x=hours,
-                    y=counts,
-                    mode='lines+markers',
-                    marker_color='darkblue',
-                    line=dict(width=2)
-                )
-            ])
-            fig.update_layout(
-                title="Activity Distribution by Hour of Day",
-                xaxis_title="Hour of Day",
-                yaxis_title="Number of Events",
-                height=400,
-                xaxis=dict(tickmode='array', tickvals=list(range(24)))
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.markdown("""
-            The hourly activity distribution reveals when students are most active in their learning process.
-            This can help identify:
-            - **Peak learning hours**: When most educational activities take place
-            - **Study patterns**: Whether learning happens more in mornings, afternoons, or evenings
-            - **Potential for scheduling**: Optimal times for synchronous activities or support
-            """)
-        else:
-            st.info("No timestamp data available for hourly distribution analysis.")
-    except Exception as e:
-        st.info("Could not generate hourly activity distribution.")
+    # Analysis views; only the selected one is computed
+    # A result key shares the background jobs with other sessions showing the same data
+    display_analysis_views(event_log, artifacts, result_key or uuid.uuid4().hex, window_dfg, profile_id)
     
     # Add footer with metadata
     st.markdown("---")
     st.markdown(f"<div class='dashboard-footer'>Analysis performed on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Dashboard by {AUTHOR}</div>", unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    # Deprecated entrypoint: consolidated into dashboard/enhanced_app.py
-    raise RuntimeError("Deprecated file. Use 'dashboard/enhanced_app.py'.")
+    main()
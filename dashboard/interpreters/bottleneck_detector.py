@@ -1,6 +1,238 @@
+import numpy as np
 import pandas as pd
-import pm4py
-from datetime import timedelta, datetime
+from datetime import datetime
+
+from quantile_sketch import KeyedSketches
+
+QUANTILES = (0.5, 0.95)
+
+
+class BottleneckAccumulator:
+    """
+    Activity processing times and transition waiting times, kept as mergeable
+    quantile sketches instead of lists of values.
+
+    Accumulators fed with different batches of complete cases (e.g. by
+    parallel workers or as new sessions arrive) can be merged.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.activity_durations = KeyedSketches(relative_accuracy)
+        self.waiting_times = KeyedSketches(relative_accuracy)
+
+    def update(self, cases, activities, timestamps, ordered=False):
+        """
+        Add a batch of events.
+
+        Args:
+            cases: Case identifier of every event
+            activities: Activity of every event
+            timestamps: Timestamp of every event (datetime64)
+            ordered: Whether the events are already grouped by case and ordered in time
+
+        Returns:
+            The accumulator itself
+        """
+        case_codes = pd.factorize(pd.Series(cases), sort=False)[0]
+        activity_codes, activity_labels = pd.factorize(pd.Series(activities), sort=False)
+        timestamps = pd.to_datetime(pd.Series(timestamps))
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert(None)
+        seconds = timestamps.to_numpy('datetime64[ns]').astype(np.int64) / 1e9
+        seconds[timestamps.isna().to_numpy()] = np.nan
+
+        keep = (case_codes >= 0) & (activity_codes >= 0)
+        if ordered:
+            order = np.flatnonzero(keep)
+        else:
+            order = np.lexsort((seconds, case_codes))
+            order = order[keep[order]]
+        case_codes, activity_codes, seconds = case_codes[order], activity_codes[order], seconds[order]
+        if not len(case_codes):
+            return self
+
+        same_case_next = np.zeros(len(case_codes), dtype=bool)
+        same_case_next[:-1] = case_codes[1:] == case_codes[:-1]
+        next_activity = np.full(len(case_codes), -1)
+        next_activity[:-1] = activity_codes[1:]
+
+        # An event completes its activity when the next event of the case is a different activity
+        completes = ~same_case_next | (next_activity != activity_codes)
+
+        # Processing time runs from the activity's first occurrence in the case; an activity
+        # completed at its very first occurrence has no measurable processing time
+        pairs = pd.DataFrame({'case': case_codes, 'activity': activity_codes})
+        occurrence = pairs.groupby(['case', 'activity'], sort=False).cumcount().to_numpy()
+        first_seen = pd.Series(seconds).groupby([case_codes, activity_codes], sort=False).transform('first').to_numpy()
+        measured = completes & (occurrence > 0)
+        self.activity_durations.add(activity_labels[activity_codes[measured]],
+                                    seconds[measured] - first_seen[measured])
+
+        # Waiting time from a completing event to the next event of the case
+        waits = np.flatnonzero(completes & same_case_next)
+        transitions = activity_labels[activity_codes[waits]].astype(str) + " → " + activity_labels[next_activity[waits]].astype(str)
+        self.waiting_times.add(transitions, seconds[waits + 1] - seconds[waits])
+        return self
+
+    def merge(self, other):
+        """Fold another accumulator into this one."""
+        self.activity_durations.merge(other.activity_durations)
+        self.waiting_times.merge(other.waiting_times)
+        return self
+
+    def bottlenecks(self, top_n=5):
+        """
+        Activities with the highest mean processing time and transitions with the highest mean waiting time.
+
+        Args:
+            top_n: Number of activities and of transitions to report
+
+        Returns:
+            List of bottleneck dictionaries
+        """
+        bottlenecks = []
+        for sketches, element_type, metric in ((self.activity_durations, "Activity", "Processing Time"),
+                                               (self.waiting_times, "Transition", "Waiting Time")):
+            if not len(sketches):
+                continue
+            summary = sketches.summary(quantiles=QUANTILES).sort_values('mean', ascending=False, kind='stable')
+            for element, row in summary.head(top_n).iterrows():
+                bottlenecks.append({
+                    "element": element,
+                    "type": element_type,
+                    "metric": metric,
+                    "value_seconds": row['mean'],
+                    "value_formatted": format_duration(row['mean']),
+                    "occurrences": int(row['count']),
+                    "p50_seconds": row['p50'],
+                    "p95_seconds": row['p95'],
+                    "max_seconds": row['max']
+                })
+        return bottlenecks
+
+
+def _empty_result(element, element_type, analysis_metadata):
+    return pd.DataFrame({
+        "element": [element],
+        "type": [element_type],
+        "metric": ["None"],
+        "value_seconds": [0],
+        "value_formatted": ["0 seconds"],
+        "occurrences": [0],
+        "analysis_date": [analysis_metadata["timestamp"]],
+        "analyst": [analysis_metadata["analyst"]]
+    })
+
 
 def detect_bottlenecks(event_log):
-    return {"message": "Bottleneck detection placeholder", "timestamp": datetime.now().isoformat()}
\ No newline at end of file
+    """
+    Detect bottlenecks in the process.
+    
+    Args:
+        event_log: PM4Py event log or pandas DataFrame
+        
+    Returns:
+        DataFrame with bottleneck analysis
+    """
+    # Add analysis metadata
+    analysis_metadata = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "analyst": "MustafaHameed"
+    }
+    
+    accumulator = BottleneckAccumulator()
+    
+    # Handle different event log formats
+    if isinstance(event_log, pd.DataFrame):
+        if 'case:concept:name' in event_log.columns and 'concept:name' in event_log.columns and 'time:timestamp' in event_log.columns:
+            timestamps = event_log['time:timestamp']
+            # Make sure timestamp is datetime
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                try:
+                    timestamps = pd.to_datetime(timestamps)
+                except:
+                    # Return empty results if we can't process timestamps
+                    return _empty_result("No bottlenecks found", "None", analysis_metadata)
+            
+            accumulator.update(event_log['case:concept:name'], event_log['concept:name'], timestamps)
+        else:
+            # Not properly formatted DataFrame
+            return _empty_result("Missing required columns", "Error", analysis_metadata)
+    else:
+        # Try PM4Py EventLog format
+        try:
+            cases, activities, timestamps = [], [], []
+            for case_number, trace in enumerate(event_log):
+                # Extract events with timestamps
+                ordered_events = []
+                
+                for event in trace:
+                    try:
+                        # Safe access to event attributes
+                        if isinstance(event, dict):
+                            activity = event.get("concept:name")
+                            timestamp = event.get("time:timestamp")
+                        else:
+                            activity = event["concept:name"]
+                            timestamp = event["time:timestamp"]
+                        
+                        if activity is not None and timestamp is not None:
+                            ordered_events.append((activity, timestamp))
+                    except (TypeError, KeyError, AttributeError):
+                        continue
+                
+                # Sort events by timestamp
+                ordered_events.sort(key=lambda x: x[1])
+                cases.extend([case_number] * len(ordered_events))
+                activities.extend(activity for activity, _ in ordered_events)
+                timestamps.extend(timestamp for _, timestamp in ordered_events)
+            
+            accumulator.update(cases, activities, timestamps, ordered=True)
+        except Exception as e:
+            # Return empty results if we can't process the event log
+            return _empty_result(f"Error: {str(e)}", "Error", analysis_metadata)
+    
+    return bottleneck_table(accumulator, analysis_metadata)
+
+def bottleneck_table(accumulator, analysis_metadata):
+    """
+    Bottleneck report of an accumulator, in the layout returned by detect_bottlenecks.
+    
+    Args:
+        accumulator: BottleneckAccumulator fed with the event log
+        analysis_metadata: Dictionary with the analysis timestamp and analyst
+        
+    Returns:
+        DataFrame with bottleneck analysis
+    """
+    # Identify bottlenecks - activities with highest duration or transitions with highest waiting times
+    bottlenecks = accumulator.bottlenecks(top_n=5)
+    
+    # If no bottlenecks found, add a placeholder
+    if not bottlenecks:
+        bottlenecks.append({
+            "element": "No bottlenecks found",
+            "type": "None",
+            "metric": "None",
+            "value_seconds": 0,
+            "value_formatted": "0 seconds",
+            "occurrences": 0
+        })
+    
+    # Add analysis metadata to each row
+    for item in bottlenecks:
+        item["analysis_date"] = analysis_metadata["timestamp"]
+        item["analyst"] = analysis_metadata["analyst"]
+    
+    return pd.DataFrame(bottlenecks)
+
+def format_duration(seconds):
+    """Format duration in seconds to a human-readable string"""
+    if seconds < 60:
+        return f"{seconds:.1f} seconds"
+    elif seconds < 3600:
+        return f"{seconds/60:.1f} minutes"
+    elif seconds < 86400:
+        return f"{seconds/3600:.1f} hours"
+    else:
+        return f"{seconds/86400:.1f} days"
@@ -1,4 +1,3 @@
-import pm4py
 import pandas as pd
 from datetime import datetime
 
@@ -1,6 +1,225 @@
 import pandas as pd
-import pm4py
+from collections import defaultdict
 from datetime import datetime
 
-def analyze_patterns(event_log: pd.DataFrame):
-    return {"message": "Pattern analysis placeholder", "timestamp": datetime.now().isoformat()}
\ No newline at end of file
+from encoded_log import EncodedLog
+from pattern_mining import NGramMiner, format_pattern
+from anomaly_detection import AnomalyDetector
+from rework_analysis import analyze_rework
+from variant_index import VariantIndex
+
+# Number of most anomalous cases reported
+ANOMALY_TOP_K = 10
+
+def analyze_patterns(event_log, encoded=None):
+    """
+    Analyze process patterns in the event log.
+    
+    Args:
+        event_log: PM4Py event log or pandas DataFrame
+        encoded: EncodedLog of a DataFrame event log, if the caller already built one
+        
+    Returns:
+        Dictionary with pattern analysis results
+    """
+    results = {}
+    
+    # Add metadata
+    results["analysis_metadata"] = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "analyst": "MustafaHameed"
+    }
+    
+    # PM4Py logs are converted once, so variants, n-grams, rework and anomalies
+    # are all computed on the integer-encoded log
+    frame = event_log
+    if not isinstance(event_log, pd.DataFrame):
+        try:
+            import pm4py
+            frame = pm4py.convert_to_dataframe(event_log)
+        except Exception:
+            # Logs that cannot be converted fall back to walking the traces
+            frame = None
+    encodable = (isinstance(frame, pd.DataFrame)
+                 and 'case:concept:name' in frame.columns and 'concept:name' in frame.columns)
+    
+    # Handle different event log formats
+    variant_index = None
+    variants = {}
+    if encodable:
+        # Index the variants of the encoded log (traces are ordered by timestamp if available)
+        if encoded is None:
+            encoded = EncodedLog.from_dataframe(frame)
+        variant_index = VariantIndex.from_encoded(encoded, n_rows=len(frame))
+    elif not isinstance(event_log, pd.DataFrame):
+        # Fallback: create variants manually
+        for trace in event_log:
+            try:
+                # Extract case ID
+                if hasattr(trace, 'attributes') and "concept:name" in trace.attributes:
+                    case_id = trace.attributes["concept:name"]
+                else:
+                    case_id = str(id(trace))  # Use object ID if case ID not available
+                
+                # Create variant from activities
+                activities = []
+                for event in trace:
+                    try:
+                        if isinstance(event, dict):
+                            activity = event.get("concept:name")
+                        else:
+                            activity = event["concept:name"]
+                        
+                        if activity is not None:
+                            activities.append(str(activity))
+                    except (TypeError, KeyError, AttributeError):
+                        continue
+                
+                variant = ','.join(activities)
+                if variant not in variants:
+                    variants[variant] = []
+                variants[variant].append(case_id)
+            except:
+                # Skip any trace that causes errors
+                continue
+    
+    # Create variant distribution
+    variant_distribution = []
+    other_count = 0
+    other_cases = 0
+    
+    if variant_index is not None:
+        # Take top 5 variants for visualization; the rest is answered from the index counts
+        top_variants = variant_index.top_variants(k=5)
+        for i, row in enumerate(top_variants.itertuples(index=False)):
+            variant_distribution.append({
+                "variant": f"Variant {i+1}",
+                "count": int(row.count),
+                "activities": ",".join(map(str, row.variant))
+            })
+        other_count = variant_index.n_cases - int(top_variants['count'].sum())
+        other_cases = variant_index.n_variants - len(top_variants)
+    else:
+        # Sort variants by frequency
+        sorted_variants = sorted(variants.items(), key=lambda x: len(x[1]), reverse=True)
+        
+        # Take top 5 variants for visualization
+        for i, (variant, traces) in enumerate(sorted_variants):
+            if i < 5:
+                variant_name = f"Variant {i+1}"
+                # Convert tuple variant to string if needed
+                variant_str = ",".join(variant) if isinstance(variant, tuple) else variant
+                variant_distribution.append({
+                    "variant": variant_name,
+                    "count": len(traces),
+                    "activities": variant_str
+                })
+            else:
+                other_count += len(traces)
+                other_cases += 1
+    
+    # Add "Other" category if there are more variants
+    if other_count > 0:
+        variant_distribution.append({
+            "variant": f"Other ({other_cases} variants)",
+            "count": other_count,
+            "activities": "Various"
+        })
+    
+    results["variant_distribution"] = pd.DataFrame(variant_distribution) if variant_distribution else pd.DataFrame({
+        "variant": ["No variants found"],
+        "count": [0],
+        "activities": ["None"]
+    })
+    
+    # Analyze common sequences (bigrams and longer n-grams)
+    common_sequences = []
+    
+    # Handle different event log formats
+    if encodable:
+        # Count n-grams on the integer-encoded log instead of building strings per transition
+        sequence_patterns = NGramMiner(encoded).mine(n_values=range(2, 6), top_k=10)
+        results["sequence_patterns"] = sequence_patterns
+        
+        for row in sequence_patterns[2].itertuples(index=False):
+            common_sequences.append({
+                "sequence": format_pattern(row.pattern),
+                "frequency": row.frequency
+            })
+    elif not isinstance(event_log, pd.DataFrame):
+        sequence_counts = defaultdict(int)
+        
+        # Process PM4Py EventLog
+        for trace in event_log:
+            # Extract activity names safely
+            activities = []
+            
+            for event in trace:
+                try:
+                    if isinstance(event, dict):
+                        activity = event.get("concept:name")
+                    else:
+                        activity = event["concept:name"]
+                    
+                    if activity is not None:
+                        activities.append(str(activity))
+                except (TypeError, KeyError, AttributeError):
+                    continue
+            
+            # Count sequences (bigrams)
+            for i in range(len(activities) - 1):
+                sequence_counts[(activities[i], activities[i+1])] += 1
+        
+        # Convert to DataFrame
+        for sequence, count in sorted(sequence_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
+            common_sequences.append({
+                "sequence": format_pattern(sequence),
+                "frequency": count
+            })
+    
+    # Ensure we have at least one row
+    if not common_sequences:
+        common_sequences.append({
+            "sequence": "No sequences found",
+            "frequency": 0
+        })
+    
+    results["common_sequences"] = pd.DataFrame(common_sequences)
+    
+    # Analyze rework (repeated activities within a case), per activity and per case
+    if variant_index is not None:
+        rework = analyze_rework(variant_index.encoded)
+        results["rework_by_activity"] = rework["by_activity"]
+        results["rework_by_case"] = rework["by_case"]
+        reworked = rework["by_activity"][rework["by_activity"]["rework_count"] > 0]
+        rework_patterns = reworked[["activity", "rework_count"]].reset_index(drop=True)
+    else:
+        rework_patterns = pd.DataFrame(columns=["activity", "rework_count"])
+    
+    # If rework_patterns is empty, add a placeholder row to avoid plotting errors
+    if rework_patterns.empty:
+        rework_patterns = pd.DataFrame([{
+            "activity": "No Rework",
+            "rework_count": 0
+        }])
+    
+    results["rework_patterns"] = rework_patterns
+    
+    # Detect potential anomalies: the cases least likely under a Markov model of the log
+    anomalies = pd.DataFrame()
+    if variant_index is not None:
+        anomalies = AnomalyDetector(variant_index).top_anomalies(ANOMALY_TOP_K)
+    
+    # If no anomalies found, add placeholder
+    if anomalies.empty:
+        anomalies = pd.DataFrame([{
+            "case_id": "None",
+            "variant": "None",
+            "length": 0,
+            "score": 0.0,
+            "reason": "No anomalies found"
+        }])
+    
+    results["anomalies"] = anomalies
+    
+    return results
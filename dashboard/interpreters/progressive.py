@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from encoded_log import EncodedLog
+from incremental_dfg import IncrementalDFG
+from pattern_mining import format_pattern
+
+from .bottleneck_detector import BottleneckAccumulator, bottleneck_table, detect_bottlenecks
+from .pattern_analyzer import analyze_patterns
+
+# Cases in the first batch; every following batch is GROWTH times larger, so the
+# first partial result comes quickly and a log needs only a few batches
+FIRST_BATCH_CASES = 50
+GROWTH = 2
+
+REQUIRED_COLUMNS = ['case:concept:name', 'concept:name', 'time:timestamp']
+
+
+def _is_dataframe_log(event_log):
+    return isinstance(event_log, pd.DataFrame) and all(col in event_log.columns for col in REQUIRED_COLUMNS)
+
+
+def case_batches(encoded, first_batch=FIRST_BATCH_CASES, growth=GROWTH):
+    """
+    Split the cases of an encoded log into growing batches of complete cases.
+
+    Args:
+        encoded: EncodedLog of the event log
+        first_batch: Number of cases in the first batch
+        growth: Size factor between consecutive batches
+
+    Returns:
+        List of (first case, end case) code ranges
+    """
+    batches = []
+    start, size = 0, first_batch
+    while start < encoded.n_cases:
+        end = min(start + size, encoded.n_cases)
+        batches.append((start, end))
+        start, size = end, size * growth
+    return batches
+
+
+def progressive_dfg(event_log, report):
+    """
+    Directly-follows graph, reporting the graph of the cases processed so far.
+
+    Args:
+        event_log: PM4Py event log or pandas DataFrame
+        report: Callback receiving (partial result, fraction done, message)
+
+    Returns:
+        Tuple of (dfg, start_activities, end_activities) dictionaries
+    """
+    if not isinstance(event_log, pd.DataFrame):
+        import pm4py
+        return pm4py.discover_directly_follows_graph(event_log)
+
+    encoded = EncodedLog.from_dataframe(event_log)
+    graph = IncrementalDFG(encoded.activities)
+
+    for start, end in case_batches(encoded):
+        graph.add_cases(encoded, slice(start, end))
+        if end < encoded.n_cases:
+            report(graph.to_dicts(), end / encoded.n_cases,
+                   f"Process map of the first {end:,} of {encoded.n_cases:,} cases")
+
+    return graph.to_dicts()
+
+
+def progressive_bottlenecks(event_log, report):
+    """
+    Bottleneck analysis, reporting the bottlenecks of the cases processed so far.
+
+    Args:
+        event_log: PM4Py event log or pandas DataFrame
+        report: Callback receiving (partial result, fraction done, message)
+
+    Returns:
+        DataFrame in the layout of detect_bottlenecks
+    """
+    if not _is_dataframe_log(event_log) or not pd.api.types.is_datetime64_any_dtype(event_log['time:timestamp']):
+        return detect_bottlenecks(event_log)
+
+    analysis_metadata = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "analyst": "MustafaHameed"
+    }
+    encoded = EncodedLog.from_dataframe(event_log)
+    accumulator = BottleneckAccumulator()
+
+    # Batches hold complete cases, so the merged sketches match a single pass over the log
+    for start, end in case_batches(encoded):
+        batch = event_log.iloc[encoded.order[encoded.offsets[start]:encoded.offsets[end]]]
+        accumulator.update(batch['case:concept:name'], batch['concept:name'], batch['time:timestamp'], ordered=True)
+        if end < encoded.n_cases:
+            report(bottleneck_table(accumulator, analysis_metadata), end / encoded.n_cases,
+                   f"Bottlenecks of the first {end:,} of {encoded.n_cases:,} cases")
+
+    return bottleneck_table(accumulator, analysis_metadata)
+
+
+def progressive_patterns(event_log, report, top_k=10):
+    """
+    Pattern analysis, reporting the most frequent transitions (bigrams) seen so far
+    while the full analysis runs.
+
+    The log is encoded once; the bigram partials come from an IncrementalDFG over
+    that encoding, and the final analysis mines the same encoded log.
+
+    Args:
+        event_log: PM4Py event log or pandas DataFrame
+        report: Callback receiving (partial result, fraction done, message)
+        top_k: Number of bigrams in the partial results
+
+    Returns:
+        Dictionary in the layout of analyze_patterns
+    """
+    frame = event_log
+    if not isinstance(event_log, pd.DataFrame):
+        # PM4Py logs are converted once and then take the DataFrame path
+        try:
+            import pm4py
+            frame = pm4py.convert_to_dataframe(event_log)
+        except Exception:
+            frame = None
+    if not _is_dataframe_log(frame):
+        return analyze_patterns(event_log)
+
+    encoded = EncodedLog.from_dataframe(frame)
+    n = encoded.n_activities
+    # The graph's vocabulary starts as the encoded activities, so its codes are the encoded codes
+    graph = IncrementalDFG(encoded.activities)
+
+    for start, end in case_batches(encoded):
+        graph.add_cases(encoded, slice(start, end))
+        flat = graph.transitions.ravel()
+        top = np.argsort(-flat, kind='stable')[:top_k]
+        top = top[flat[top] > 0]
+        common_sequences = pd.DataFrame({
+            "sequence": [format_pattern(tuple(encoded.decode([code // n, code % n]))) for code in top],
+            "frequency": flat[top]
+        })
+        if end < encoded.n_cases:
+            message = f"Most frequent transitions in the first {end:,} of {encoded.n_cases:,} cases"
+        else:
+            message = "Mining variants, longer sequences, rework and anomalies"
+        report({"common_sequences": common_sequences}, 0.5 * end / encoded.n_cases, message)
+
+    return analyze_patterns(frame, encoded=encoded)
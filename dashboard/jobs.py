@@ -0,0 +1,140 @@
+"""Background jobs for the dashboards.
+
+Heavy analyses run on a thread pool shared by all sessions instead of on the
+Streamlit script thread. A job publishes partial results while it runs, and
+``display_job`` renders them into a placeholder until the final result is in.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import streamlit as st
+
+MAX_WORKERS = 4
+# Finished jobs kept for reuse (e.g. when the user switches back to a view)
+MAX_FINISHED_JOBS = 32
+
+
+class Job:
+    """A background computation and the latest partial result it reported."""
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        self.future: Optional[Future] = None
+        # RunProfiler the job runs in, if it was submitted with submit_profiled
+        self.profiler = None
+        self._partial: Any = None
+        self._progress = 0.0
+        self._message = ""
+        self._lock = threading.Lock()
+
+    def report(self, partial: Any, progress: float, message: str = "") -> None:
+        """Publish a partial result; called from the worker thread."""
+        with self._lock:
+            self._partial, self._progress, self._message = partial, progress, message
+
+    def snapshot(self) -> Tuple[Any, float, str]:
+        """Latest (partial result, fraction done, message)."""
+        with self._lock:
+            return self._partial, self._progress, self._message
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """Final result; re-raises the job's exception if it failed."""
+        return self.future.result(timeout)
+
+
+class JobExecutor:
+    """Thread pool running keyed jobs; submitting a key that is already known returns the existing job."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_finished: int = MAX_FINISHED_JOBS):
+        # Threads rather than processes: the event logs are shared without pickling,
+        # and the numpy/pandas kernels the analyses spend their time in release the GIL
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard-job")
+        self._jobs: "OrderedDict[Hashable, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+
+    def submit(self, key: Hashable, fn: Callable, *args, **kwargs) -> Job:
+        """Run ``fn(*args, report=job.report, **kwargs)`` in the background unless a job with this key exists."""
+        return self._submit(key, fn, args, kwargs)
+
+    def submit_profiled(self, key: Hashable, profiler, fn: Callable, *args, **kwargs) -> Job:
+        """Like ``submit``, with ``fn`` run inside ``profiler`` (a RunProfiler) on the worker thread.
+
+        cProfile only records the thread that enables it, so a profiler around
+        the script run does not see the work done by the pool.
+        """
+        return self._submit(key, fn, args, kwargs, profiler)
+
+    def _submit(self, key: Hashable, fn: Callable, args: tuple, kwargs: dict, profiler=None) -> Job:
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self._jobs.move_to_end(key)
+                return job
+            job = Job(key)
+            job.profiler = profiler
+            if profiler is not None:
+                fn = _profiled(fn, profiler)
+            job.future = self._pool.submit(fn, *args, report=job.report, **kwargs)
+            self._jobs[key] = job
+            self._evict()
+            return job
+
+    def _evict(self) -> None:
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[key]
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+def _profiled(fn: Callable, profiler) -> Callable:
+    def run(*args, **kwargs):
+        with profiler:
+            return fn(*args, **kwargs)
+    return run
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_executor() -> JobExecutor:
+    """Process-wide executor, shared by every session of the app."""
+    return JobExecutor()
+
+
+def display_job(job: Job, render: Callable[[Any], None], render_partial: Optional[Callable[[Any], None]] = None,
+                poll_interval: float = 0.25) -> Any:
+    """Render a job's partial results into a placeholder as they arrive, then its final result.
+
+    A widget interaction reruns the script while this is polling; the job keeps
+    running and the next run picks it up again by key. Streamlit only stops a
+    script for a rerun inside an ``st`` call, so the progress bar is redrawn on
+    every poll, also while the partial result does not change.
+    """
+    render_partial = render_partial or render
+    status = st.empty()
+    placeholder = st.empty()
+    shown = None
+    while not job.done:
+        partial, progress, message = job.snapshot()
+        status.progress(min(max(progress, 0.0), 1.0), text=message or "Computing...")
+        if partial is not None and partial is not shown:
+            with placeholder.container():
+                render_partial(partial)
+            shown = partial
+        time.sleep(poll_interval)
+
+    status.empty()
+    result = job.result()
+    with placeholder.container():
+        render(result)
+    return result
@@ -2,13 +2,13 @@ import streamlit as st
 import pandas as pd
 import os
 from pathlib import Path
-from dashboard.data import load_epm_dataset, load_csv
+from dashboard.data import load_shared_epm_dataset, find_artifact_bundle, load_artifact_bundle, load_csv
 
 st.set_page_config(page_title="EPM Minimal Dashboard", layout="wide")
 
-@st.cache_data(show_spinner=True)
-def cached_load_epm(repo_root_str: str):
-    return load_epm_dataset(Path(repo_root_str))
+@st.cache_resource(show_spinner=True)
+def cached_load_bundle(bundle_dir: str):
+    return load_artifact_bundle(bundle_dir)
 
 @st.cache_data
 def cached_load_csv(path: str):
@@ -16,7 +16,7 @@ def cached_load_csv(path: str):
 
 def main():
     st.title("Educational Process Mining - Minimal")
-    source = st.radio("Data source", ["Bundled EPM Dataset", "CSV file"], index=0, horizontal=True)
+    source = st.radio("Data source", ["Bundled EPM Dataset", "Precomputed results", "CSV file"], index=0, horizontal=True)
 
     df = None
     if source == "Bundled EPM Dataset":
@@ -24,12 +24,28 @@ def main():
         dataset_dir = repo_root / "EPM Dataset 2"
         st.caption(f"Using dataset: {dataset_dir}")
         try:
-            raw, event_log, stats = cached_load_epm(str(repo_root))
+            # Shared by every session; rebuilt only when the session files change
+            version, event_log, stats = load_shared_epm_dataset(repo_root)
             df = event_log
             st.success(f"Loaded {stats.get('total_events', 0):,} events from {stats.get('total_cases', 0)} cases")
             st.dataframe(df.head(20))
         except Exception as e:
             st.error(f"Failed to load EPM dataset: {e}")
+    elif source == "Precomputed results":
+        repo_root = Path(__file__).resolve().parents[1]
+        try:
+            # Looked up on every run, so a newer bundle is picked up without restarting the server
+            bundle, event_log, stats = cached_load_bundle(find_artifact_bundle(repo_root))
+            df = event_log
+            st.caption(f"Using artifact bundle: {bundle.bundle_dir} (run {bundle.manifest['run_id']})")
+            st.success(f"Loaded {stats.get('total_events', 0):,} events from {stats.get('total_cases', 0)} cases")
+            st.dataframe(df.head(20))
+            st.subheader("Trace variants")
+            st.dataframe(bundle.table("variants").head(20))
+            st.subheader("Bottlenecks")
+            st.dataframe(bundle.table("bottlenecks"))
+        except Exception as e:
+            st.error(f"Failed to load artifact bundle: {e}")
     else:
         data_path = st.text_input("CSV path", value=os.getenv("EPM_DATA", ""))
         if data_path:
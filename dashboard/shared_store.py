@@ -0,0 +1,160 @@
+"""Result store shared by every session of a dashboard process.
+
+The event log of a dataset is built once per dataset version and kept as an
+Arrow IPC file that is memory-mapped on load, so sessions (and server
+processes) read the same pages instead of parsing the session files again.
+Analysis results are cached under (analysis, dataset version, parameters);
+concurrent requests for a result that is still being computed wait for that
+one computation instead of starting their own.
+"""
+from __future__ import annotations
+
+import glob
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from data_preprocessing import EPMDataProcessor
+from dataset_manifest import DatasetManifest
+
+# Bump when the stored event log layout changes so stale files are rebuilt
+STORE_VERSION = 1
+# Finished analysis results kept in memory
+MAX_RESULTS = 64
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable form of a parameter value (lists and sets become tuples, dicts sorted item tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(freeze(item) for item in value))
+    return value
+
+
+def write_arrow(df: pd.DataFrame, path: str) -> None:
+    """Write a DataFrame as an Arrow IPC file; categoricals are stored dictionary-encoded."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    temp_path = f"{path}.tmp"
+    with pa.OSFile(temp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temp_path, path)
+
+
+def read_arrow(path: str) -> pd.DataFrame:
+    """Memory-map an Arrow IPC file as a DataFrame; numeric columns without nulls stay backed by the map."""
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedStore:
+    """Dataset event logs and analysis results, shared across sessions and deduplicated while in flight."""
+
+    def __init__(self, max_results: int = MAX_RESULTS):
+        self._results: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_results = max_results
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Cached result of a computation.
+
+        The first caller of a key runs compute(); callers that arrive while it
+        runs wait for it and receive the same result. Failures are not cached.
+
+        Args:
+            key: Hashable key, normally (analysis, dataset version, frozen parameters)
+            compute: Function computing the result
+
+        Returns:
+            The result, shared between all callers (treat it as read-only)
+        """
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._results[key] = future
+            else:
+                self._results.move_to_end(key)
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                with self._lock:
+                    self._results.pop(key, None)
+                future.set_exception(e)
+                raise
+            with self._lock:
+                self._evict()
+        return future.result()
+
+    def _evict(self) -> None:
+        finished = [key for key, future in self._results.items() if future.done()]
+        for key in finished[:max(0, len(finished) - self.max_results)]:
+            del self._results[key]
+
+    @staticmethod
+    def dataset_version(dataset_path: str) -> str:
+        """Version of a dataset's session files; changes whenever one of them does."""
+        return f"{STORE_VERSION}-{DatasetManifest.from_scan(dataset_path).fingerprint()}"
+
+    def event_log(self, dataset_path: str) -> Tuple[str, pd.DataFrame]:
+        """
+        Event log of a dataset, built once per dataset version.
+
+        Args:
+            dataset_path: Path to the EPM dataset directory
+
+        Returns:
+            Tuple of (dataset version, event log DataFrame)
+        """
+        version = self.dataset_version(dataset_path)
+        event_log = self.get_or_compute(("event_log", os.path.abspath(dataset_path), version),
+                                        lambda: self._load_event_log(dataset_path, version))
+        return version, event_log
+
+    @staticmethod
+    def _load_event_log(dataset_path: str, version: str) -> pd.DataFrame:
+        cache_dir = os.path.join(dataset_path, "Data", ".cache")
+        path = os.path.join(cache_dir, f"event_log_{version}.arrow")
+        if not os.path.exists(path):
+            # Read from the session partitions: only sessions whose files changed are parsed again
+            event_log = EPMDataProcessor(dataset_path).load_event_log()
+            if event_log.empty:
+                return pd.DataFrame()
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                write_arrow(event_log, path)
+            except OSError as e:
+                print(f"Could not store the event log in {cache_dir}: {e}")
+                return event_log
+            # Files of older dataset versions are never read again
+            for stale in glob.glob(os.path.join(cache_dir, "event_log_*.arrow")):
+                if stale != path:
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+        return read_arrow(path)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_store() -> SharedStore:
+    """Process-wide store, shared by every session of the app."""
+    return SharedStore()
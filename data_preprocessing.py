@@ -11,6 +11,89 @@ from typing import List, Tuple, Dict
 import warnings
 warnings.filterwarnings('ignore')
 
+from epm_parser import read_session_file, read_session_files
+from dataset_manifest import DatasetManifest, session_folder
+
+# Low-cardinality identifiers and labels, stored as categoricals (raw and event log names)
+CATEGORICAL_COLUMNS = ['session', 'student_id', 'exercise', 'activity', 'case_id',
+                       'concept:name', 'case:concept:name']
+
+# Preferred dtype of each interaction counter; widened when the values do not fit
+COUNTER_DTYPES = {
+    'idle_time': 'int32',
+    'mouse_wheel': 'uint16',
+    'mouse_wheel_click': 'uint16',
+    'mouse_click_left': 'uint16',
+    'mouse_click_right': 'uint16',
+    'mouse_movement': 'uint32',
+    'keystroke': 'uint16'
+}
+
+
+def _fitting_integer_dtype(series: pd.Series, preferred: str):
+    """Narrowest of the preferred dtype, int32 and int64 that holds every value, or None."""
+    if not pd.api.types.is_integer_dtype(series) or series.empty:
+        return None
+    low, high = series.min(), series.max()
+    for dtype in [preferred, 'int32', 'int64']:
+        limits = np.iinfo(dtype)
+        if limits.min <= low and high <= limits.max:
+            return dtype
+    return None
+
+
+def apply_compact_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a raw or event log DataFrame to the compact schema in place.
+
+    Identifier and activity columns become categoricals (dropping categories no
+    row uses), interaction counters the narrowest integer type that fits.
+
+    Args:
+        df: Raw data or event log DataFrame
+
+    Returns:
+        The same DataFrame
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col not in df.columns:
+            continue
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+        else:
+            df[col] = df[col].astype('category')
+
+    for col, preferred in COUNTER_DTYPES.items():
+        if col in df.columns:
+            dtype = _fitting_integer_dtype(df[col], preferred)
+            if dtype is not None and dtype != df[col].dtype:
+                df[col] = df[col].astype(dtype)
+
+    if 'event_index' in df.columns:
+        df['event_index'] = df['event_index'].astype('int32')
+    return df
+
+
+def _strip_labels(series: pd.Series) -> pd.Series:
+    """Strip surrounding whitespace from string labels, on the categories when categorical."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.str.strip()
+    stripped = series.cat.categories.str.strip()
+    if stripped.is_unique:
+        return series.cat.rename_categories(stripped)
+    # Labels that only differ by whitespace collapse into one category
+    return series.astype(str).str.strip().astype('category')
+
+
+def _sort_codes(series: pd.Series) -> np.ndarray:
+    """Integer codes that order like sort_values would order the series (missing values last)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, n_values = series.cat.codes.to_numpy(), len(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        n_values = len(uniques)
+    return np.where(codes < 0, n_values, codes)
+
 
 class EPMDataProcessor:
     """Class to handle EPM dataset extraction and preprocessing for process mining."""
@@ -25,7 +108,28 @@ class EPMDataProcessor:
         self.dataset_path = dataset_path
         self.processes_path = os.path.join(dataset_path, "Data", "Processes")
         self.sessions = ["Session 1", "Session 2", "Session 3", "Session 4", "Session 5", "Session 6"]
+        self.parse_issues: List[Dict] = []
+        self._manifest = None
         
+    @property
+    def manifest(self) -> DatasetManifest:
+        """Planned student-session files, built once from logs.txt or a directory scan."""
+        if self._manifest is None:
+            self._manifest = DatasetManifest.load(self.dataset_path)
+            for _, row in self._manifest.discrepancies.iterrows():
+                print(f"Note: Session {row['session']} student {row['student_id']} is missing from {row['missing_from']}")
+        return self._manifest
+    
+    def _report_parse_issues(self, issues: List[Dict]) -> None:
+        """Keep the malformed-row reports of the last load and print a short summary."""
+        self.parse_issues = issues
+        if not issues:
+            return
+        files = len({issue['file'] for issue in issues})
+        print(f"Warning: {len(issues)} malformed rows in {files} files (see parse_issues)")
+        for issue in issues[:5]:
+            print(f"  {issue['file']}:{issue['line']}: {issue['reason']}")
+    
     def load_student_data(self, session: str, student_id: str) -> pd.DataFrame:
         """
         Load data for a specific student in a specific session.
@@ -37,62 +141,46 @@ class EPMDataProcessor:
         Returns:
             DataFrame with student's process data
         """
-        file_path = os.path.join(self.processes_path, session, student_id)
-        
-        if not os.path.exists(file_path):
+        if not self.manifest.contains(session, student_id):
             return pd.DataFrame()
+        file_path = os.path.join(self.processes_path, session_folder(session), str(student_id))
             
         try:
-            # Read CSV data with proper column names
-            columns = ['session', 'student_id', 'exercise', 'activity', 'start_time', 
-                      'end_time', 'idle_time', 'mouse_wheel', 'mouse_wheel_click',
-                      'mouse_click_left', 'mouse_click_right', 'mouse_movement', 'keystroke']
-            
-            df = pd.read_csv(file_path, header=None, names=columns)
-            
-            # Parse timestamps
-            df['start_time'] = pd.to_datetime(df['start_time'], format='%d.%m.%Y %H:%M:%S', errors='coerce')
-            df['end_time'] = pd.to_datetime(df['end_time'], format='%d.%m.%Y %H:%M:%S', errors='coerce')
-            
-            # Calculate duration in seconds
-            df['duration'] = (df['end_time'] - df['start_time']).dt.total_seconds()
-            
-            # Add case ID (combining student and session)
-            df['case_id'] = f"Student_{student_id}_Session_{df['session'].iloc[0]}"
-            
+            # Timestamps, durations and the case ID are derived by the EPM parser
+            df, issues = read_session_file(file_path)
+            self._report_parse_issues(issues)
             return df
             
         except Exception as e:
             print(f"Error loading data for student {student_id} in {session}: {e}")
             return pd.DataFrame()
     
-    def load_all_data(self) -> pd.DataFrame:
+    def load_all_data(self, students: List[int] = None, sessions: List[str] = None) -> pd.DataFrame:
         """
         Load data for all students across all sessions.
         
+        Args:
+            students: Only load these student IDs (default: all)
+            sessions: Only load these sessions, as numbers or folder names (default: self.sessions)
+            
         Returns:
             Combined DataFrame with all student data
         """
-        all_data = []
+        # The file list is planned up front, so no folder is listed and no file probed here
+        manifest = self.manifest.select(students=students, sessions=sessions or self.sessions)
         
-        print("Loading EPM dataset...")
-        for session in self.sessions:
-            session_path = os.path.join(self.processes_path, session)
-            if not os.path.exists(session_path):
-                continue
-                
-            student_files = os.listdir(session_path)
-            print(f"Loading {session}: {len(student_files)} students")
-            
-            for student_file in student_files:
-                if student_file.isdigit():  # Only process numeric student IDs
-                    student_data = self.load_student_data(session, student_file)
-                    if not student_data.empty:
-                        all_data.append(student_data)
+        print(f"Loading EPM dataset ({len(manifest)} files from {manifest.source})...")
+        for session, count in manifest.session_counts().items():
+            print(f"Loading {session_folder(session)}: {count} students")
+        file_paths = manifest.paths()
+        
+        # All files are parsed in one batch instead of one read_csv per student
+        combined_df, issues = read_session_files(file_paths)
+        self._report_parse_issues(issues)
         
-        if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
-            print(f"Loaded {len(combined_df)} events from {len(all_data)} student-session combinations")
+        if not combined_df.empty:
+            combined_df = apply_compact_schema(combined_df)
+            print(f"Loaded {len(combined_df)} events from {combined_df['case_id'].nunique()} student-session combinations")
             return combined_df
         else:
             print("No data loaded!")
@@ -111,32 +199,56 @@ class EPMDataProcessor:
         if df.empty:
             return df
             
-        # Create event log format
-        event_log = df.copy()
-        
-        # Rename columns for PM4Py compatibility
-        event_log = event_log.rename(columns={
+        # Rename columns for PM4Py compatibility. Under copy-on-write (the default from pandas 3)
+        # no data is copied here; older pandas copies the frame once, as the previous .copy() did
+        event_log = df.rename(columns={
             'case_id': 'case:concept:name',
             'activity': 'concept:name',
             'start_time': 'time:timestamp'
         })
         
         # Clean activity names (remove leading/trailing spaces)
-        event_log['concept:name'] = event_log['concept:name'].str.strip()
-        
-        # Filter out invalid timestamps
-        event_log = event_log.dropna(subset=['time:timestamp'])
+        event_log['concept:name'] = _strip_labels(event_log['concept:name'])
         
-        # Sort by case and timestamp
-        event_log = event_log.sort_values(['case:concept:name', 'time:timestamp'])
+        # Filter out invalid timestamps and sort by case and timestamp in a single selection,
+        # so the frame is materialized once instead of once per step
+        timestamps = event_log['time:timestamp'].to_numpy()
+        valid = np.flatnonzero(~pd.isna(timestamps))
+        case_codes = _sort_codes(event_log['case:concept:name'])
+        order = valid[np.lexsort((timestamps[valid], case_codes[valid]))]
+        if len(order) < len(event_log) or np.any(order[1:] < order[:-1]):
+            event_log = event_log.take(order)
         
         # Add event index within case
         event_log['event_index'] = event_log.groupby('case:concept:name').cumcount() + 1
         
+        # Keep the compact schema; cases and activities lost with invalid timestamps drop out
+        event_log = apply_compact_schema(event_log)
+        
         print(f"Created event log with {len(event_log)} events and {event_log['case:concept:name'].nunique()} cases")
         
         return event_log
     
+    def load_event_log(self, sessions: List[str] = None, students: List[int] = None,
+                       columns: List[str] = None) -> pd.DataFrame:
+        """
+        Load the event log from the partitioned cache, reading only the matching partitions.
+        
+        Sessions whose files changed since their partitions were written are
+        parsed again first; the rest are read from Parquet.
+        
+        Args:
+            sessions: Only load these sessions, as numbers or folder names (default: self.sessions)
+            students: Only load these student IDs (default: all)
+            columns: Only load these event log columns (default: all)
+            
+        Returns:
+            Event log DataFrame, as create_event_log(load_all_data(students, sessions)) would return
+        """
+        from partitioned_log import PartitionedEventLog
+        
+        return PartitionedEventLog(self).read(sessions or self.sessions, students, columns)
+    
     def get_activity_mapping(self) -> Dict[str, str]:
         """
         Get mapping of activity codes to descriptive names.
@@ -211,17 +323,20 @@ class EPMDataProcessor:
         if df.empty:
             return df
             
-        filtered_df = df.copy()
+        # Both criteria are combined into one event mask, so only the result is materialized;
+        # events without a case never pass the minimum-events criterion
+        keep = df['case:concept:name'].notna().to_numpy()
         
         # Exclude specified activities
         if exclude_activities:
-            filtered_df = filtered_df[~filtered_df['concept:name'].isin(exclude_activities)]
+            keep = keep & ~df['concept:name'].isin(exclude_activities).to_numpy()
             print(f"Excluded activities: {exclude_activities}")
         
-        # Filter cases with minimum events
-        case_counts = filtered_df['case:concept:name'].value_counts()
-        valid_cases = case_counts[case_counts >= min_events_per_case].index
-        filtered_df = filtered_df[filtered_df['case:concept:name'].isin(valid_cases)]
+        # Filter cases with minimum events (counted after the exclusion)
+        case_codes = _sort_codes(df['case:concept:name'])
+        case_counts = np.bincount(case_codes[keep], minlength=case_codes.max() + 1)
+        keep = keep & (case_counts[case_codes] >= min_events_per_case)
+        filtered_df = apply_compact_schema(df[keep])
         
         print(f"Filtered to {len(filtered_df)} events and {filtered_df['case:concept:name'].nunique()} cases")
         print(f"Excluded {len(df) - len(filtered_df)} events below quality threshold")
@@ -229,6 +344,110 @@ class EPMDataProcessor:
         return filtered_df
 
 
+class EventLogIndex:
+    """Event log kept in memory with precomputed per-case counts for fast re-filtering."""
+
+    def __init__(self, event_log: pd.DataFrame):
+        """
+        Build the index over an event log.
+
+        Args:
+            event_log: Event log DataFrame as returned by create_event_log
+        """
+        self.event_log = event_log
+
+        self.case_codes, self.case_ids = pd.factorize(event_log['case:concept:name'])
+        self.activity_codes, self.activities = pd.factorize(event_log['concept:name'])
+        self.activity_lookup = {activity: code for code, activity in enumerate(self.activities)}
+
+        n_cases = len(self.case_ids)
+        n_activities = len(self.activities)
+
+        # Events per (case, activity): the counts filter_by_criteria would recompute on every call;
+        # code -1 marks a missing case ID or activity
+        valid = (self.case_codes >= 0) & (self.activity_codes >= 0)
+        flat_codes = self.case_codes[valid].astype(np.int64) * n_activities + self.activity_codes[valid]
+        self.case_activity_counts = np.bincount(
+            flat_codes, minlength=n_cases * n_activities
+        ).reshape(n_cases, n_activities)
+        self.case_event_counts = self.case_activity_counts.sum(axis=1)
+
+        if 'session' in event_log.columns:
+            case_codes, first_event = np.unique(self.case_codes, return_index=True)
+            self.case_sessions = event_log['session'].to_numpy()[first_event[case_codes >= 0]]
+        else:
+            self.case_sessions = None
+
+    @staticmethod
+    def _session_number(session) -> int:
+        """Accept either a session folder name ("Session 3") or a session number."""
+        if isinstance(session, str):
+            return int(session.split()[-1])
+        return int(session)
+
+    def case_mask(self, sessions: List = None, min_events_per_case: int = 1,
+                  exclude_activities: List[str] = None) -> np.ndarray:
+        """
+        Select the cases that pass the filters.
+
+        Args:
+            sessions: Sessions to keep (folder names or numbers); all when None
+            min_events_per_case: Minimum number of events per case after exclusion
+            exclude_activities: List of activities to exclude
+
+        Returns:
+            Boolean array with one entry per case
+        """
+        counts = self.case_event_counts
+        excluded_codes = [self.activity_lookup[a] for a in exclude_activities or [] if a in self.activity_lookup]
+        if excluded_codes:
+            counts = counts - self.case_activity_counts[:, excluded_codes].sum(axis=1)
+
+        mask = counts >= min_events_per_case
+        if sessions is not None and self.case_sessions is not None:
+            session_numbers = [self._session_number(s) for s in sessions]
+            mask &= np.isin(self.case_sessions, session_numbers)
+        return mask
+
+    def event_mask(self, sessions: List = None, min_events_per_case: int = 1,
+                   exclude_activities: List[str] = None) -> np.ndarray:
+        """
+        Select the events that pass the filters.
+
+        Args:
+            sessions: Sessions to keep (folder names or numbers); all when None
+            min_events_per_case: Minimum number of events per case after exclusion
+            exclude_activities: List of activities to exclude
+
+        Returns:
+            Boolean array with one entry per event
+        """
+        # Trailing False so that events without a case (code -1) never pass, as in filter_by_criteria
+        mask = np.append(self.case_mask(sessions, min_events_per_case, exclude_activities), False)[self.case_codes]
+        if exclude_activities:
+            # Trailing False so that missing activities (code -1) are never excluded
+            excluded = np.append(np.isin(self.activities, exclude_activities), False)
+            mask &= ~excluded[self.activity_codes]
+        return mask
+
+    def filter(self, sessions: List = None, min_events_per_case: int = 1,
+               exclude_activities: List[str] = None) -> pd.DataFrame:
+        """
+        Filter the cached event log with the same semantics as filter_by_criteria.
+
+        Args:
+            sessions: Sessions to keep (folder names or numbers); all when None
+            min_events_per_case: Minimum number of events per case after exclusion
+            exclude_activities: List of activities to exclude
+
+        Returns:
+            Filtered DataFrame
+        """
+        return apply_compact_schema(
+            self.event_log[self.event_mask(sessions, min_events_per_case, exclude_activities)]
+        )
+
+
 def main():
     """Test the data preprocessing functionality."""
     processor = EPMDataProcessor()
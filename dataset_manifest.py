@@ -0,0 +1,182 @@
+"""
+Dataset manifest for the EPM session files.
+Plans the exact list of student-session files up front, from one scan of the
+session directories (checked against the logs.txt attendance matrix) or from
+logs.txt alone, so loaders open only files that exist and can select students
+or sessions.
+"""
+
+import hashlib
+import os
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Union
+
+from student_records import PRESENCE_FILE, StudentRecords
+
+SessionKey = Union[int, str]
+
+
+def session_number(session: SessionKey) -> int:
+    """Session number from an int or a folder name such as 'Session 3'."""
+    return session if isinstance(session, int) else int(str(session).split()[-1])
+
+
+def session_folder(session: SessionKey) -> str:
+    """Session folder name, e.g. 'Session 3'."""
+    return f"Session {session_number(session)}"
+
+
+class DatasetManifest:
+    """Student-session files of an EPM dataset, one row per file."""
+
+    def __init__(self, dataset_path: str, entries: pd.DataFrame, source: str):
+        """
+        Initialize the manifest.
+
+        Args:
+            dataset_path: Path to the EPM dataset directory
+            entries: DataFrame with session, student_id and path columns
+            source: Where the entries came from ('logs.txt' or 'scan')
+        """
+        self.dataset_path = dataset_path
+        self.entries = entries.sort_values(['session', 'student_id']).reset_index(drop=True)
+        self.source = source
+        self.discrepancies = pd.DataFrame(columns=['session', 'student_id', 'missing_from'])
+        self._keys = set(zip(self.entries['session'], self.entries['student_id']))
+
+    @staticmethod
+    def _entries(dataset_path: str, sessions: Iterable[int], students: Iterable[int]) -> pd.DataFrame:
+        processes_path = os.path.join(dataset_path, "Data", "Processes")
+        sessions, students = list(sessions), list(students)
+        return pd.DataFrame({
+            'session': pd.Series(sessions, dtype='int64'),
+            'student_id': pd.Series(students, dtype='int64'),
+            'path': [os.path.join(processes_path, session_folder(s), str(sid)) for s, sid in zip(sessions, students)]
+        })
+
+    @classmethod
+    def from_presence(cls, dataset_path: str, records: StudentRecords = None) -> 'DatasetManifest':
+        """
+        Build the manifest from the logs.txt attendance matrix, without touching the session folders.
+
+        Args:
+            dataset_path: Path to the EPM dataset directory
+            records: StudentRecords to take the (cached) attendance matrix from
+
+        Returns:
+            DatasetManifest
+        """
+        presence = (records or StudentRecords(dataset_path)).presence
+        attended = presence.stack()
+        attended = attended[attended]
+        students = attended.index.get_level_values(0)
+        sessions = attended.index.get_level_values(1)
+        return cls(dataset_path, cls._entries(dataset_path, sessions, students), PRESENCE_FILE)
+
+    @classmethod
+    def from_scan(cls, dataset_path: str) -> 'DatasetManifest':
+        """
+        Build the manifest with one directory listing per session folder.
+
+        Args:
+            dataset_path: Path to the EPM dataset directory
+
+        Returns:
+            DatasetManifest
+        """
+        processes_path = os.path.join(dataset_path, "Data", "Processes")
+        sessions, students = [], []
+        if os.path.isdir(processes_path):
+            for folder in os.scandir(processes_path):
+                if not (folder.is_dir() and folder.name.startswith("Session ")):
+                    continue
+                # Only numeric file names are student logs
+                for entry in os.scandir(folder.path):
+                    if entry.name.isdigit() and entry.is_file():
+                        sessions.append(session_number(folder.name))
+                        students.append(int(entry.name))
+        return cls(dataset_path, cls._entries(dataset_path, sessions, students), 'scan')
+
+    @classmethod
+    def load(cls, dataset_path: str, records: StudentRecords = None) -> 'DatasetManifest':
+        """
+        Build the manifest from a directory scan, cross-checked against logs.txt when present.
+
+        The scan decides which files are loaded; logs.txt does not always agree
+        with the folders, so its disagreements are kept in `discrepancies`.
+
+        Args:
+            dataset_path: Path to the EPM dataset directory
+            records: StudentRecords to take the (cached) attendance matrix from
+
+        Returns:
+            DatasetManifest
+        """
+        manifest = cls.from_scan(dataset_path)
+        if os.path.exists(os.path.join(dataset_path, "Data", PRESENCE_FILE)):
+            manifest.discrepancies = manifest.compare(cls.from_presence(dataset_path, records))
+        return manifest
+
+    def compare(self, other: 'DatasetManifest') -> pd.DataFrame:
+        """
+        Files present in only one of two manifests.
+
+        Args:
+            other: Manifest to compare with (e.g. one built from logs.txt)
+
+        Returns:
+            DataFrame with session, student_id and a 'missing_from' column naming the manifest without the file
+        """
+        merged = self.entries[['session', 'student_id']].merge(
+            other.entries[['session', 'student_id']], how='outer', indicator=True
+        )
+        merged = merged[merged['_merge'] != 'both']
+        merged['missing_from'] = merged['_merge'].map({'left_only': other.source, 'right_only': self.source})
+        return merged.drop(columns='_merge').astype({'missing_from': str}).reset_index(drop=True)
+
+    def select(self, students: Optional[Iterable[int]] = None,
+               sessions: Optional[Iterable[SessionKey]] = None) -> 'DatasetManifest':
+        """
+        Restrict the manifest to some students and/or sessions.
+
+        Args:
+            students: Student IDs to keep (None keeps all)
+            sessions: Session numbers or folder names to keep (None keeps all)
+
+        Returns:
+            New DatasetManifest with the matching files
+        """
+        mask = pd.Series(True, index=self.entries.index)
+        if students is not None:
+            mask &= self.entries['student_id'].isin([int(s) for s in students])
+        if sessions is not None:
+            mask &= self.entries['session'].isin([session_number(s) for s in sessions])
+        return DatasetManifest(self.dataset_path, self.entries[mask], self.source)
+
+    def contains(self, session: SessionKey, student_id: Union[int, str]) -> bool:
+        """Whether the student has a log file for the session."""
+        return (session_number(session), int(student_id)) in self._keys
+
+    def paths(self) -> List[str]:
+        """File paths in session, student order."""
+        return self.entries['path'].tolist()
+
+    def fingerprint(self) -> str:
+        """
+        Version of the files: a hash of the file list with every file's size and modification time.
+
+        Returns:
+            Hex digest that changes whenever a file is added, removed or modified
+        """
+        digest = hashlib.sha1()
+        for session, student_id, path in self.entries[['session', 'student_id', 'path']].itertuples(index=False):
+            stat = os.stat(path)
+            digest.update(f"{session}/{student_id}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()[:16]
+
+    def session_counts(self) -> Dict[int, int]:
+        """Number of student files per session."""
+        return self.entries['session'].value_counts().sort_index().to_dict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,116 @@
+"""
+Duration statistics engine for educational process mining.
+Computes count, mean, median, standard deviation and percentiles of a value
+column for every group (e.g. activity durations) in one sorted pass, or
+incrementally with quantile sketches when the data arrives in batches.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Sequence
+
+from quantile_sketch import KeyedSketches, quantile_label
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _statistics_columns(quantiles: Sequence[float]) -> list:
+    return ['count', 'mean', 'median', 'std'] + [quantile_label(q) for q in quantiles]
+
+
+def duration_statistics(df: pd.DataFrame, group_col: str = 'concept:name', value_col: str = 'duration',
+                        quantiles: Sequence[float] = DEFAULT_QUANTILES, sketch: bool = False,
+                        relative_accuracy: float = 0.01) -> pd.DataFrame:
+    """
+    Per-group statistics of a value column.
+
+    The exact engine sorts the values once by (group, value) and reads every
+    statistic off the sorted array; quantiles use linear interpolation, like
+    pandas. Missing values are ignored, as in pandas aggregations.
+
+    Args:
+        df: DataFrame with the group and value columns
+        group_col: Column to group by
+        value_col: Column to summarize
+        quantiles: Quantiles to report as p<percent> columns
+        sketch: Use quantile sketches (bounded memory; quantiles are within relative_accuracy
+            of the nearest order statistic instead of interpolated)
+        relative_accuracy: Relative error of the sketch quantiles
+
+    Returns:
+        DataFrame indexed by group with count, mean, median, std and the quantiles,
+        groups in order of first appearance
+    """
+    if sketch:
+        return DurationAccumulator(group_col, value_col, quantiles, relative_accuracy).update(df).statistics()
+
+    codes, groups = pd.factorize(df[group_col], sort=False)
+    values = df[value_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    n_groups = len(groups)
+
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        squared_deviations = np.bincount(codes, weights=np.square(values - means[codes]), minlength=n_groups)
+        stds = np.sqrt(squared_deviations / (counts - 1))
+    stds[counts < 2] = np.nan
+
+    def interpolated(q: float) -> np.ndarray:
+        result = np.full(n_groups, np.nan)
+        present = counts > 0
+        position = starts[present] + q * (counts[present] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        result[present] = values[lower] + (values[upper] - values[lower]) * (position - lower)
+        return result
+
+    stats = pd.DataFrame({'count': counts, 'mean': means, 'median': interpolated(0.5), 'std': stds},
+                         index=pd.Index(groups, name=group_col))
+    for q in quantiles:
+        stats[quantile_label(q)] = interpolated(q)
+    return stats
+
+
+class DurationAccumulator:
+    """Streaming per-group statistics backed by mergeable quantile sketches."""
+
+    def __init__(self, group_col: str = 'concept:name', value_col: str = 'duration',
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES, relative_accuracy: float = 0.01):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            group_col: Column to group by
+            value_col: Column to summarize
+            quantiles: Quantiles to report as p<percent> columns
+            relative_accuracy: Relative error of the quantile estimates
+        """
+        self.group_col = group_col
+        self.value_col = value_col
+        self.quantiles = list(quantiles)
+        self.sketches = KeyedSketches(relative_accuracy)
+
+    def update(self, batch: pd.DataFrame) -> 'DurationAccumulator':
+        """Add a batch of rows; only the sketches are kept, not the values."""
+        values = batch[self.value_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.sketches.add(batch[self.group_col].to_numpy(), values)
+        return self
+
+    def merge(self, other: 'DurationAccumulator') -> 'DurationAccumulator':
+        """Fold another accumulator (e.g. from another batch or worker) into this one."""
+        self.sketches.merge(other.sketches)
+        return self
+
+    def statistics(self) -> pd.DataFrame:
+        """Statistics in the same layout as duration_statistics."""
+        summary = self.sketches.summary(quantiles=[0.5] + self.quantiles, key_name=self.group_col)
+        summary['median'] = summary[quantile_label(0.5)]
+        return summary[_statistics_columns(self.quantiles)]
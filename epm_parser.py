@@ -0,0 +1,253 @@
+"""
+Parser for the raw EPM session files.
+Each file holds one student's events in one session as ", "-separated fields
+with d.m.Y H:M:S timestamps whose fields are not zero-padded (e.g. "2.10.2014 11:5:3").
+Files are parsed in one batch over a single byte buffer and malformed rows are
+reported instead of being silently turned into missing values.
+"""
+
+import csv
+import io
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence, Tuple
+
+# Columns of the raw per-student log files, in file order
+RAW_COLUMNS = ['session', 'student_id', 'exercise', 'activity', 'start_time',
+               'end_time', 'idle_time', 'mouse_wheel', 'mouse_wheel_click',
+               'mouse_click_left', 'mouse_click_right', 'mouse_movement', 'keystroke']
+
+NUMERIC_COLUMNS = ['session', 'student_id', 'idle_time', 'mouse_wheel', 'mouse_wheel_click',
+                   'mouse_click_left', 'mouse_click_right', 'mouse_movement', 'keystroke']
+
+TIMESTAMP_COLUMNS = ['start_time', 'end_time']
+
+# Separators between consecutive timestamp fields (day . month . year ' ' hour : minute : second)
+_TIMESTAMP_SEPARATORS = np.frombuffer(b'.. ::', dtype=np.uint8)
+# Allowed number of digits per timestamp field
+_MIN_DIGITS = np.array([1, 1, 4, 1, 1, 1])
+_MAX_DIGITS = np.array([2, 2, 4, 2, 2, 2])
+
+
+def _decode_timestamp_bytes(chars: np.ndarray) -> np.ndarray:
+    """
+    Decode a zero-padded uint8 matrix holding one "d.m.Y H:M:S" timestamp per row.
+
+    Digit runs are accumulated with one vectorized step per character position;
+    a valid row has exactly six runs separated by ".. ::" and only spaces or
+    padding around them.
+    """
+    n, width = chars.shape
+    if n == 0 or width == 0:
+        return np.full(n, np.datetime64('NaT'), dtype='datetime64[us]')
+
+    # Character positions along the first axis keep every per-position step contiguous
+    chars = np.ascontiguousarray(chars.T)
+    is_digit = (chars >= 48) & (chars <= 57)
+    digit_values = chars.astype(np.int32) - 48
+
+    # Value and length of the digit run ending at each position
+    run_value = np.zeros((width, n), dtype=np.int32)
+    run_length = np.zeros((width, n), dtype=np.int32)
+    for position in range(width):
+        digit = is_digit[position]
+        if position:
+            np.multiply(run_value[position - 1], 10, out=run_value[position], where=digit)
+            np.copyto(run_length[position], run_length[position - 1], where=digit)
+        run_value[position] += np.where(digit, digit_values[position], 0)
+        run_length[position] += digit
+        # Runs longer than four digits are invalid anyway; capping keeps int32 from overflowing
+        np.minimum(run_value[position], 99999, out=run_value[position])
+
+    run_end = is_digit.copy()
+    run_end[:-1] &= ~is_digit[1:]
+    ok = run_end.sum(axis=0) == 6
+
+    # Only the five separators may appear between the first and last digit, in order;
+    # only spaces and padding outside of that span
+    positions = np.arange(width)[:, None]
+    first = np.argmax(is_digit, axis=0)
+    last = width - 1 - np.argmax(is_digit[::-1], axis=0)
+    inside = (positions >= first) & (positions <= last)
+    ok &= ~np.any(~inside & (chars != 0) & (chars != 32), axis=0)
+    separator = inside & ~is_digit
+    ok &= separator.sum(axis=0) == 5
+    rank = np.minimum(np.maximum(np.cumsum(separator, axis=0, dtype=np.int8) - 1, 0), 4)
+    ok &= ~np.any(separator & (chars != _TIMESTAMP_SEPARATORS[rank]), axis=0)
+
+    # Run ends in row order: transposing back puts each row's six fields next to each other
+    ends = (run_end & ok).T
+    fields = np.zeros((n, 6), dtype=np.int64)
+    digits = np.zeros((n, 6), dtype=np.int64)
+    fields[ok] = run_value.T[ends].reshape(-1, 6)
+    digits[ok] = run_length.T[ends].reshape(-1, 6)
+    ok &= np.all((digits >= _MIN_DIGITS) & (digits <= _MAX_DIGITS), axis=1)
+
+    day, month, year, hour, minute, second = fields.T
+    ok &= (month >= 1) & (month <= 12) & (hour < 24) & (minute < 60) & (second < 60)
+
+    # Invalid rows get a harmless placeholder date before the calendar arithmetic
+    month_start = np.where(ok, (year - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    days_in_month = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype(np.int64)
+    ok &= (day >= 1) & (day <= days_in_month)
+
+    seconds = np.where(ok, (day - 1) * 86400 + hour * 3600 + minute * 60 + second, 0)
+    timestamps = month_start.astype('datetime64[s]') + seconds.astype('timedelta64[s]')
+    timestamps[~ok] = np.datetime64('NaT')
+    return timestamps.astype('datetime64[us]')
+
+
+def parse_timestamps(values: Sequence[str]) -> np.ndarray:
+    """
+    Decode "d.m.Y H:M:S" timestamps without zero padding.
+
+    Surrounding spaces are allowed; anything else that does not match the
+    format, or is not a real date and time, becomes NaT.
+
+    Args:
+        values: Timestamp strings
+
+    Returns:
+        datetime64[us] array
+    """
+    strings = np.asarray([v if isinstance(v, str) else '' for v in values], dtype=object)
+    try:
+        encoded = strings.astype('S')
+    except UnicodeEncodeError:
+        # Non-ASCII characters cannot be part of a valid timestamp; '?' keeps them invalid
+        encoded = np.array([v.encode('ascii', 'replace') for v in strings], dtype='S')
+    width = max(encoded.dtype.itemsize, 1)
+    return _decode_timestamp_bytes(encoded.view(np.uint8).reshape(len(encoded), width))
+
+
+def _field_bytes(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Zero-padded uint8 matrix with the byte ranges [starts, ends) of data, one per row."""
+    width = int((ends - starts).max()) if len(starts) else 0
+    index = starts[:, None] + np.arange(width)
+    return np.where(index < ends[:, None], data[np.minimum(index, len(data) - 1)], 0).astype(np.uint8)
+
+
+def _line_index(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Start and newline offsets of every line in data, plus the offsets of all commas."""
+    ends = np.flatnonzero(data == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    return starts, ends, np.flatnonzero(data == ord(','))
+
+
+def read_session_files(paths: Sequence[str]) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Parse raw EPM session files into one DataFrame.
+
+    Args:
+        paths: Files to read; the file name is the student ID
+
+    Returns:
+        Tuple of (DataFrame with the raw columns plus duration and case_id,
+        list of malformed-row reports with file, line, reason and text)
+    """
+    issues: List[Dict] = []
+    contents, file_names = [], []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            issues.append({'file': path, 'line': None, 'reason': f"unreadable: {e}", 'text': ''})
+            continue
+        if content and not content.endswith(b'\n'):
+            content += b'\n'
+        contents.append(content)
+        file_names.append(path)
+
+    blob = b''.join(contents)
+    data = np.frombuffer(blob, dtype=np.uint8)
+    starts, ends, commas = _line_index(data)
+
+    # File and line number of every line, for the reports
+    lines_per_file = np.array([content.count(b'\n') for content in contents], dtype=np.int64)
+    file_ids = np.repeat(np.arange(len(contents)), lines_per_file)
+    line_numbers = np.arange(len(starts)) - np.repeat(np.cumsum(lines_per_file) - lines_per_file, lines_per_file) + 1
+
+    def line_text(line: int) -> str:
+        return blob[starts[line]:ends[line]].decode('utf-8', 'replace').rstrip('\r')[:200]
+
+    def report(lines: np.ndarray, reason: str) -> None:
+        for line in lines:
+            issues.append({'file': file_names[file_ids[line]], 'line': int(line_numbers[line]),
+                           'reason': reason, 'text': line_text(line)})
+
+    # Field count of every line at once: commas between its start and its newline
+    separators = np.searchsorted(commas, ends) - np.searchsorted(commas, starts)
+    keep = separators == len(RAW_COLUMNS) - 1
+    for line in np.flatnonzero(~keep):
+        if line_text(line).strip():
+            report([line], f"expected {len(RAW_COLUMNS)} fields, found {separators[line] + 1}")
+
+    if not keep.all():
+        blob = b''.join(blob[start:end + 1] for start, end in zip(starts[keep], ends[keep]))
+        data = np.frombuffer(blob, dtype=np.uint8)
+        starts, ends, commas = _line_index(data)
+        file_ids, line_numbers = file_ids[keep], line_numbers[keep]
+    if not len(starts):
+        return pd.DataFrame(), issues
+
+    # One C-engine pass over every file; the timestamps are decoded straight from the buffer below
+    df = pd.read_csv(
+        io.BytesIO(blob), header=None, names=RAW_COLUMNS, skipinitialspace=True,
+        usecols=[col for col in RAW_COLUMNS if col not in TIMESTAMP_COLUMNS],
+        dtype={'exercise': 'category', 'activity': 'category'},
+        quoting=csv.QUOTE_NONE, encoding_errors='replace'
+    )
+
+    # Malformed timestamps are kept as NaT (create_event_log drops them) but reported
+    field_bounds = commas.reshape(-1, len(RAW_COLUMNS) - 1)
+    for col in TIMESTAMP_COLUMNS:
+        position = RAW_COLUMNS.index(col)
+        parsed = _decode_timestamp_bytes(
+            _field_bytes(data, field_bounds[:, position - 1] + 1, field_bounds[:, position])
+        )
+        df.insert(position, col, parsed)
+
+    # Rows with non-numeric identifiers or counters cannot be represented and are dropped
+    invalid = np.zeros(len(df), dtype=bool)
+    for col in NUMERIC_COLUMNS:
+        if not pd.api.types.is_integer_dtype(df[col]):
+            numeric = pd.to_numeric(df[col], errors='coerce')
+            bad = (numeric.isna() | (numeric % 1 != 0)).to_numpy() & ~invalid
+            report(np.flatnonzero(bad), f"non-integer {col}")
+            invalid |= bad
+            df[col] = numeric
+    for col in TIMESTAMP_COLUMNS:
+        report(np.flatnonzero(df[col].isna().to_numpy() & ~invalid), f"malformed {col}")
+    if invalid.any():
+        df, file_ids = df[~invalid].reset_index(drop=True), file_ids[~invalid]
+    df = df.astype({col: 'int64' for col in NUMERIC_COLUMNS if not pd.api.types.is_integer_dtype(df[col])})
+
+    # Calculate duration in seconds
+    df['duration'] = (df['end_time'] - df['start_time']).dt.total_seconds()
+
+    # Case ID combines the student (file name) with the session of the file's first event
+    file_codes, first_rows = np.unique(file_ids, return_index=True)
+    case_names = np.array([
+        f"Student_{os.path.basename(file_names[file_id])}_Session_{session}"
+        for file_id, session in zip(file_codes, df['session'].to_numpy()[first_rows])
+    ], dtype=object)
+    df['case_id'] = case_names[np.searchsorted(file_codes, file_ids)]
+
+    return df, issues
+
+
+def read_session_file(path: str) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Parse a single raw EPM session file.
+
+    Args:
+        path: File to read; the file name is the student ID
+
+    Returns:
+        Tuple of (DataFrame, list of malformed-row reports)
+    """
+    return read_session_files([path])
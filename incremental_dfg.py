@@ -0,0 +1,231 @@
+"""
+Incrementally maintained directly-follows graph for educational process mining.
+Keeps the DFG as a transition count matrix plus start and end vectors that
+can be updated by adding or removing cases and by appending events, and
+summed across graphs (e.g. one per session) without re-scanning events.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from encoded_log import EncodedLog
+
+CaseSelection = Union[None, slice, Sequence[int], np.ndarray]
+
+
+class IncrementalDFG:
+    """Directly-follows counts over a growing activity vocabulary."""
+
+    def __init__(self, activities: Iterable[str] = ()):
+        """
+        Initialize an empty graph.
+
+        Args:
+            activities: Initial activity vocabulary (more are added as they are seen)
+        """
+        self.activities: List[str] = []
+        self.activity_lookup: Dict[str, int] = {}
+        self.transitions = np.zeros((0, 0), dtype=np.int64)
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+        # Last activity code of every case in the graph, so events can be appended to it
+        self.case_last: Dict[object, int] = {}
+        self._codes(activities)
+
+    @property
+    def n_cases(self) -> int:
+        return len(self.case_last)
+
+    def _codes(self, activities: Iterable[str]) -> np.ndarray:
+        """Graph codes of activity labels, growing the vocabulary and the count arrays for new ones."""
+        codes = []
+        for activity in activities:
+            code = self.activity_lookup.get(activity)
+            if code is None:
+                code = len(self.activities)
+                self.activity_lookup[activity] = code
+                self.activities.append(activity)
+            codes.append(code)
+
+        n, old = len(self.activities), len(self.starts)
+        if n > old:
+            transitions = np.zeros((n, n), dtype=np.int64)
+            transitions[:old, :old] = self.transitions
+            self.transitions = transitions
+            self.starts = np.pad(self.starts, (0, n - old))
+            self.ends = np.pad(self.ends, (0, n - old))
+        return np.asarray(codes, dtype=np.int64)
+
+    def _update(self, encoded: EncodedLog, cases: CaseSelection, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) the counts of some cases of an encoded log."""
+        remap = self._codes(encoded.activities)
+        if cases is None:
+            cases = slice(0, encoded.n_cases)
+        if isinstance(cases, slice):
+            first_case, end_case, _ = cases.indices(encoded.n_cases)
+            selected = np.arange(first_case, end_case)
+            events = slice(encoded.offsets[first_case], encoded.offsets[end_case])
+            codes, case_index = encoded.codes[events], encoded.case_index[events]
+        else:
+            selected = np.unique(np.asarray(cases, dtype=np.int64))
+            mask = np.zeros(encoded.n_cases, dtype=bool)
+            mask[selected] = True
+            events = mask[encoded.case_index]
+            codes, case_index = encoded.codes[events], encoded.case_index[events]
+
+        n = len(self.activities)
+        codes = remap[codes]
+        same_case = case_index[1:] == case_index[:-1]
+        pairs = codes[:-1][same_case] * n + codes[1:][same_case]
+        self.transitions += sign * np.bincount(pairs, minlength=n * n).reshape(n, n)
+
+        selected = selected[encoded.offsets[selected + 1] > encoded.offsets[selected]]
+        first = remap[encoded.codes[encoded.offsets[selected]]]
+        last = remap[encoded.codes[encoded.offsets[selected + 1] - 1]]
+        self.starts += sign * np.bincount(first, minlength=n)
+        self.ends += sign * np.bincount(last, minlength=n)
+
+        case_ids = encoded.case_ids[selected]
+        if sign > 0:
+            self.case_last.update(zip(case_ids, last.tolist()))
+        else:
+            for case_id in case_ids:
+                self.case_last.pop(case_id, None)
+
+    def add_cases(self, encoded: EncodedLog, cases: CaseSelection = None) -> 'IncrementalDFG':
+        """
+        Add complete cases of an encoded log.
+
+        Args:
+            encoded: Encoded event log
+            cases: Case codes to add, as a slice or array (default: all cases)
+
+        Returns:
+            The graph itself
+        """
+        self._update(encoded, cases, 1)
+        return self
+
+    def remove_cases(self, encoded: EncodedLog, cases: CaseSelection = None) -> 'IncrementalDFG':
+        """
+        Remove cases that were added before, with the same traces.
+
+        Args:
+            encoded: Encoded event log holding the cases' traces
+            cases: Case codes to remove, as a slice or array (default: all cases)
+
+        Returns:
+            The graph itself
+        """
+        self._update(encoded, cases, -1)
+        return self
+
+    def append_events(self, events: pd.DataFrame, case_col: str = 'case:concept:name',
+                      activity_col: str = 'concept:name', timestamp_col: str = 'time:timestamp') -> 'IncrementalDFG':
+        """
+        Append new events, continuing the traces of cases already in the graph.
+
+        Args:
+            events: New events (any number per case, later than the case's events in the graph)
+            case_col: Case identifier column
+            activity_col: Activity column
+            timestamp_col: Timestamp column ordering the new events within a case
+
+        Returns:
+            The graph itself
+        """
+        encoded = EncodedLog.from_dataframe(events, case_col, activity_col, timestamp_col)
+        remap = self._codes(encoded.activities)
+        n = len(self.activities)
+        codes = remap[encoded.codes]
+        same_case = encoded.case_index[1:] == encoded.case_index[:-1]
+        pairs = codes[:-1][same_case] * n + codes[1:][same_case]
+        self.transitions += np.bincount(pairs, minlength=n * n).reshape(n, n)
+
+        # Only the seams between the graph and the new events need per-case work
+        non_empty = np.flatnonzero(encoded.case_lengths > 0)
+        first = codes[encoded.offsets[non_empty]]
+        last = codes[encoded.offsets[non_empty + 1] - 1]
+        for case_id, first_code, last_code in zip(encoded.case_ids[non_empty], first.tolist(), last.tolist()):
+            previous = self.case_last.get(case_id)
+            if previous is None:
+                self.starts[first_code] += 1
+            else:
+                self.transitions[previous, first_code] += 1
+                self.ends[previous] -= 1
+            self.ends[last_code] += 1
+            self.case_last[case_id] = last_code
+        return self
+
+    @classmethod
+    def from_encoded(cls, encoded: EncodedLog, cases: CaseSelection = None) -> 'IncrementalDFG':
+        """Graph of (some cases of) an encoded log."""
+        return cls(encoded.activities).add_cases(encoded, cases)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, **kwargs) -> 'IncrementalDFG':
+        """
+        Graph of an event log DataFrame.
+
+        Args:
+            df: Event log DataFrame
+            **kwargs: Column names passed to EncodedLog.from_dataframe
+
+        Returns:
+            IncrementalDFG
+        """
+        return cls.from_encoded(EncodedLog.from_dataframe(df, **kwargs))
+
+    @classmethod
+    def combine(cls, graphs: Iterable['IncrementalDFG']) -> 'IncrementalDFG':
+        """
+        Sum of graphs over disjoint sets of cases (e.g. the graphs of several sessions).
+
+        Args:
+            graphs: Graphs to add up
+
+        Returns:
+            New IncrementalDFG
+        """
+        combined = cls()
+        for graph in graphs:
+            remap = combined._codes(graph.activities)
+            np.add.at(combined.transitions, (remap[:, None], remap[None, :]), graph.transitions)
+            np.add.at(combined.starts, remap, graph.starts)
+            np.add.at(combined.ends, remap, graph.ends)
+            combined.case_last.update((case_id, int(remap[code])) for case_id, code in graph.case_last.items())
+        return combined
+
+    def __add__(self, other: 'IncrementalDFG') -> 'IncrementalDFG':
+        return IncrementalDFG.combine([self, other])
+
+    def to_dicts(self) -> Tuple[Dict, Dict, Dict]:
+        """Graph as the (dfg, start_activities, end_activities) dictionaries PM4Py returns."""
+        activities = self.activities
+        sources, targets = np.nonzero(self.transitions)
+        dfg = {(activities[s], activities[t]): int(self.transitions[s, t]) for s, t in zip(sources, targets)}
+        start_activities = {activities[a]: int(self.starts[a]) for a in np.flatnonzero(self.starts)}
+        end_activities = {activities[a]: int(self.ends[a]) for a in np.flatnonzero(self.ends)}
+        return dfg, start_activities, end_activities
+
+    def save(self, path: str) -> None:
+        """Store the graph as a .npz file."""
+        np.savez_compressed(
+            path,
+            activities=np.asarray(self.activities, dtype=str),
+            transitions=self.transitions, starts=self.starts, ends=self.ends,
+            case_ids=np.asarray(list(self.case_last), dtype=str),
+            case_last=np.asarray(list(self.case_last.values()), dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalDFG':
+        """Load a graph stored with save (case identifiers come back as strings)."""
+        with np.load(path) as data:
+            graph = cls(data['activities'].tolist())
+            graph.transitions = data['transitions']
+            graph.starts = data['starts']
+            graph.ends = data['ends']
+            graph.case_last = dict(zip(data['case_ids'].tolist(), data['case_last'].tolist()))
+        return graph
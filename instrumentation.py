@@ -0,0 +1,318 @@
+"""
+Instrumentation module for the educational process mining pipeline.
+Records wall time, CPU time, peak memory and row counts for pipeline stages
+and writes them to a machine-readable profile plus a summary table.
+"""
+
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+_active_profiler = None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of the current process so far, in bytes."""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss)
+    except ImportError:
+        return None
+
+
+def _count_rows(value) -> Optional[int]:
+    """Row count of a DataFrame-like value, None for anything else."""
+    if hasattr(value, 'shape') and hasattr(value, 'columns'):
+        return int(value.shape[0])
+    return None
+
+
+class StageProfiler:
+    """Collects timing and memory measurements for named pipeline stages."""
+
+    def __init__(self):
+        self.records: List[Dict] = []
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None):
+        """
+        Measure a block of code.
+
+        Args:
+            name: Stage name
+            rows_in: Number of input rows, if known
+
+        Yields:
+            The stage record; set record['rows_out'] to report output rows
+        """
+        record = {
+            'stage': name,
+            'depth': self._depth,
+            'rows_in': rows_in,
+            'rows_out': None
+        }
+        self.records.append(record)
+        self._depth += 1
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        rss_start = _peak_rss_bytes()
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            rss_end = _peak_rss_bytes()
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            record['peak_rss_mb'] = rss_end / 2**20 if rss_end is not None else None
+            record['peak_rss_growth_mb'] = (rss_end - rss_start) / 2**20 if rss_end is not None else None
+
+    @contextmanager
+    def activate(self):
+        """Make this profiler receive measurements from @instrumented functions."""
+        global _active_profiler
+        previous = _active_profiler
+        _active_profiler = self
+        try:
+            yield self
+        finally:
+            _active_profiler = previous
+
+    def summary_table(self) -> str:
+        """Format the recorded stages as a text table."""
+        lines = [
+            f"{'Stage':<55} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak RSS (MB)':>14} {'Rows in':>10} {'Rows out':>10}",
+            "-" * 114
+        ]
+        for record in self.records:
+            name = "  " * record['depth'] + record['stage']
+            peak = f"{record['peak_rss_mb']:.1f}" if record.get('peak_rss_mb') is not None else "n/a"
+            rows_in = f"{record['rows_in']:,}" if record['rows_in'] is not None else ""
+            rows_out = f"{record['rows_out']:,}" if record['rows_out'] is not None else ""
+            lines.append(
+                f"{name:<55} {record.get('wall_seconds', 0):>10.3f} {record.get('cpu_seconds', 0):>10.3f} "
+                f"{peak:>14} {rows_in:>10} {rows_out:>10}"
+            )
+        return "\n".join(lines)
+
+    def save(self, output_dir: str, run_id: str) -> Dict[str, str]:
+        """
+        Write the profile as JSON and the summary table as text.
+
+        Args:
+            output_dir: Directory to save outputs
+            run_id: Identifier used in the file names (e.g. a timestamp)
+
+        Returns:
+            Dictionary with the paths of the written files
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, f"pipeline_profile_{run_id}.json")
+        table_path = os.path.join(output_dir, f"pipeline_profile_{run_id}.txt")
+
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'run_id': run_id,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'stages': self.records
+            }, f, indent=2)
+        with open(table_path, 'w', encoding='utf-8') as f:
+            f.write(self.summary_table() + "\n")
+
+        return {'json': json_path, 'table': table_path}
+
+
+def instrumented(name: str = None) -> Callable:
+    """
+    Decorator that records a function call as a stage of the active profiler.
+
+    The input row count is taken from the first DataFrame argument and the
+    output row count from a DataFrame return value. Calls made while no
+    profiler is active run without any measurement.
+
+    Args:
+        name: Stage name (defaults to the function's qualified name)
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            rows_in = next((rows for rows in map(_count_rows, list(args) + list(kwargs.values()))
+                            if rows is not None), None)
+            with profiler.stage(stage_name, rows_in=rows_in) as record:
+                result = func(*args, **kwargs)
+                record['rows_out'] = _count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _frame_label(func: tuple) -> str:
+    """Readable, flamegraph-safe label for a cProfile function key."""
+    filename, line, name = func
+    if filename == '~':
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(';', ':')
+
+
+def write_collapsed_stacks(stats, path: str, min_seconds: float = 1e-3, max_depth: int = 64) -> None:
+    """
+    Write cProfile statistics as collapsed stacks for flamegraph tools.
+
+    cProfile only records caller/callee pairs, so full stacks are rebuilt by
+    walking the call graph from the root functions and splitting each
+    function's time across its callers in proportion to the edge timings.
+
+    Args:
+        stats: pstats.Stats instance
+        path: Destination file (one "frame;frame;frame microseconds" line per stack)
+        min_seconds: Stacks below this time are dropped
+        max_depth: Maximum reconstructed stack depth
+    """
+    raw = stats.stats
+    children = {}
+    for callee, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((callee, edge[3]))
+
+    totals = {}
+    roots = [func for func, entry in raw.items() if not entry[4]]
+
+    def walk(func, stack, weight):
+        _, _, self_time, cumulative, _ = raw[func]
+        if cumulative <= 0 or weight < min_seconds:
+            return
+        stack = stack + [_frame_label(func)]
+        own = weight * self_time / cumulative
+        if own >= min_seconds:
+            key = ";".join(stack)
+            totals[key] = totals.get(key, 0.0) + own
+        if len(stack) >= max_depth:
+            return
+        for child, edge_time in children.get(func, []):
+            if _frame_label(child) in stack:
+                continue
+            walk(child, stack, weight * edge_time / cumulative)
+
+    for root in roots:
+        walk(root, [], raw[root][3])
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for key, seconds in sorted(totals.items()):
+            f.write(f"{key} {int(round(seconds * 1e6))}\n")
+
+
+class RunProfiler:
+    """Wraps a whole run in a profiler and writes the results next to the other artifacts."""
+
+    ENGINES = ('cprofile', 'pyinstrument')
+
+    def __init__(self, output_dir: str, run_id: str, engine: str = 'cprofile'):
+        """
+        Initialize the run profiler.
+
+        Args:
+            output_dir: Directory to save outputs
+            run_id: Identifier used in the file names (e.g. a timestamp)
+            engine: 'cprofile' (deterministic) or 'pyinstrument' (sampling, optional dependency)
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown profiler engine '{engine}', expected one of {self.ENGINES}")
+        self.output_dir = output_dir
+        self.run_id = run_id
+        self.engine = engine
+        self.outputs: Dict[str, str] = {}
+        self._profiler = None
+
+    def _path(self, extension: str) -> str:
+        return os.path.join(self.output_dir, f"run_profile_{self.run_id}.{extension}")
+
+    def __enter__(self) -> 'RunProfiler':
+        if self.engine == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("pyinstrument is not installed, falling back to cProfile")
+                self.engine = 'cprofile'
+
+        if self.engine == 'pyinstrument':
+            self._profiler = Profiler()
+            self._profiler.start()
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.engine == 'pyinstrument':
+            self._profiler.stop()
+            self._save_pyinstrument()
+        else:
+            self._profiler.disable()
+            self._save_cprofile()
+
+        for kind, path in self.outputs.items():
+            print(f"✓ Run profile ({kind}) saved to {path}")
+        return False
+
+    def _save_cprofile(self) -> None:
+        import pstats
+
+        stats = pstats.Stats(self._profiler)
+        self.outputs['pstats'] = self._path('pstats')
+        stats.dump_stats(self.outputs['pstats'])
+
+        self.outputs['collapsed'] = self._path('collapsed')
+        write_collapsed_stacks(stats, self.outputs['collapsed'])
+
+    def _save_pyinstrument(self) -> None:
+        self.outputs['html'] = self._path('html')
+        with open(self.outputs['html'], 'w', encoding='utf-8') as f:
+            f.write(self._profiler.output_html())
+
+        # Sampled call tree flattened into collapsed stacks (self time per stack, in microseconds)
+        totals = {}
+
+        def walk(frame, stack):
+            stack = stack + [f"{frame.function} ({frame.file_path_short}:{frame.line_no})".replace(';', ':')]
+            own = frame.time - sum(child.time for child in frame.children)
+            if own > 0:
+                key = ";".join(stack)
+                totals[key] = totals.get(key, 0.0) + own
+            for child in frame.children:
+                walk(child, stack)
+
+        root = self._profiler.last_session.root_frame()
+        if root is not None:
+            walk(root, [])
+
+        self.outputs['collapsed'] = self._path('collapsed')
+        with open(self.outputs['collapsed'], 'w', encoding='utf-8') as f:
+            for key, seconds in sorted(totals.items()):
+                f.write(f"{key} {int(round(seconds * 1e6))}\n")
@@ -0,0 +1,206 @@
+"""
+Event log export for educational process mining.
+Writes the preprocessed event log as Parquet and Arrow IPC datasets
+partitioned by session, and as XES through a streaming writer that
+serializes a chunk of cases at a time instead of building a PM4Py EventLog.
+"""
+
+import gzip
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from encoded_log import EncodedLog
+
+EXPORT_FORMATS = ("parquet", "arrow", "xes")
+# Events serialized per XES chunk; bounds the memory of the formatted strings
+XES_CHUNK_EVENTS = 50_000
+# Level 6 compresses XES nearly as well as the default 9 in half the time
+XES_GZIP_LEVEL = 6
+
+XES_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" ?>\n'
+    '<log xes.version="1849-2016" xes.features="nested-attributes" xmlns="http://www.xes-standard.org/">\n'
+    '\t<extension name="Concept" prefix="concept" uri="http://www.xes-standard.org/concept.xesext"/>\n'
+    '\t<extension name="Time" prefix="time" uri="http://www.xes-standard.org/time.xesext"/>\n'
+)
+XES_FOOTER = '</log>\n'
+
+
+def _write_dataset(df: pd.DataFrame, path: str, file_format: str, partition_by: Optional[List[str]]) -> str:
+    """Write a DataFrame as a (hive-partitioned) pyarrow dataset, replacing earlier partitions."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    partitioning = None
+    if partition_by:
+        partitioning = ds.partitioning(pa.schema([table.schema.field(col) for col in partition_by]), flavor="hive")
+    ds.write_dataset(table, path, format=file_format, partitioning=partitioning,
+                     existing_data_behavior="delete_matching")
+    return path
+
+
+def export_parquet(df: pd.DataFrame, path: str, partition_by: Optional[List[str]] = None) -> str:
+    """
+    Write an event log as a Parquet dataset.
+
+    Args:
+        df: Event log DataFrame
+        path: Dataset directory
+        partition_by: Columns to partition by (hive layout, e.g. session=1/)
+
+    Returns:
+        Dataset directory
+    """
+    return _write_dataset(df, path, "parquet", partition_by)
+
+
+def export_arrow(df: pd.DataFrame, path: str, partition_by: Optional[List[str]] = None) -> str:
+    """
+    Write an event log as an Arrow IPC (Feather v2) dataset.
+
+    Args:
+        df: Event log DataFrame
+        path: Dataset directory
+        partition_by: Columns to partition by (hive layout, e.g. session=1/)
+
+    Returns:
+        Dataset directory
+    """
+    return _write_dataset(df, path, "ipc", partition_by)
+
+
+def _escape(values: pd.Series) -> pd.Series:
+    """Escape strings for use in an XML attribute value."""
+    return (values.str.replace("&", "&amp;", regex=False)
+                  .str.replace("<", "&lt;", regex=False)
+                  .str.replace(">", "&gt;", regex=False)
+                  .str.replace('"', "&quot;", regex=False))
+
+
+def _xes_type(series: pd.Series) -> str:
+    """XES attribute type of a column; categoricals take the type of their categories."""
+    dtype = series.cat.categories.dtype if isinstance(series.dtype, pd.CategoricalDtype) else series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "date"
+    return "string"
+
+
+def _xes_attributes(values: pd.Series, key: str, xes_type: str, indent: str) -> np.ndarray:
+    """One XES attribute element per value (empty for missing values), formatted column-wise."""
+    missing = values.isna().to_numpy()
+    if xes_type == "date":
+        # numpy formats ISO timestamps in C, far faster than Series.dt.strftime
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        text = pd.Series(np.datetime_as_string(values.to_numpy().astype("datetime64[ms]"), unit="ms"),
+                         index=values.index)
+    elif xes_type == "boolean":
+        text = values.map({True: "true", False: "false"})
+    else:
+        text = values.astype(str)
+        if xes_type == "string":
+            text = _escape(text)
+    key = key.replace("&", "&amp;").replace('"', "&quot;")
+    elements = (f'{indent}<{xes_type} key="{key}" value="' + text.astype(str) + '"/>\n').to_numpy(dtype=object)
+    elements[missing] = ""
+    return elements
+
+
+def write_xes(df: pd.DataFrame, path: str, case_col: str = 'case:concept:name',
+              activity_col: str = 'concept:name', timestamp_col: str = 'time:timestamp',
+              columns: Optional[Iterable[str]] = None, chunk_events: int = XES_CHUNK_EVENTS) -> str:
+    """
+    Stream an event log DataFrame to an XES file, one chunk of complete cases at a time.
+
+    Args:
+        df: Event log DataFrame
+        path: Output file; written gzip-compressed if it ends with .gz
+        case_col: Case identifier column (written as the trace's concept:name)
+        activity_col: Activity column (written as the event's concept:name)
+        timestamp_col: Timestamp column (orders events within a trace, written as time:timestamp)
+        columns: Further event attribute columns (all remaining columns by default)
+        chunk_events: Approximate number of events formatted per chunk
+
+    Returns:
+        Path of the written file
+    """
+    encoded = EncodedLog.from_dataframe(df, case_col, activity_col, timestamp_col)
+    if columns is None:
+        columns = [col for col in df.columns if col not in (case_col, activity_col, timestamp_col)]
+    event_columns = [(activity_col, 'concept:name')]
+    if timestamp_col in df.columns:
+        event_columns.append((timestamp_col, 'time:timestamp'))
+    event_columns += [(col, col) for col in columns]
+    types = {col: _xes_type(df[col]) for col, _ in event_columns}
+    trace_names = _escape(pd.Series(encoded.case_ids, dtype=object).astype(str)).to_numpy()
+
+    temp_path = f"{path}.tmp"
+    if path.endswith(".gz"):
+        f = gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=XES_GZIP_LEVEL)
+    else:
+        f = open(temp_path, "w", encoding="utf-8")
+    with f:
+        f.write(XES_HEADER)
+        first_case = 0
+        while first_case < encoded.n_cases:
+            # Chunks hold complete cases, so every trace is written from a single chunk
+            end_case = int(np.searchsorted(encoded.offsets, encoded.offsets[first_case] + chunk_events, side='right'))
+            end_case = min(max(end_case - 1, first_case + 1), encoded.n_cases)
+            start, end = encoded.offsets[first_case], encoded.offsets[end_case]
+            rows = df.iloc[encoded.order[start:end]]
+
+            events = np.full(end - start, "\t\t<event>\n", dtype=object)
+            for col, key in event_columns:
+                events = events + _xes_attributes(rows[col], key, types[col], "\t\t\t")
+            events = events + "\t\t</event>\n"
+
+            bounds = encoded.offsets[first_case:end_case + 1] - start
+            for case in range(first_case, end_case):
+                f.write(f'\t<trace>\n\t\t<string key="concept:name" value="{trace_names[case]}"/>\n')
+                f.write("".join(events[bounds[case - first_case]:bounds[case - first_case + 1]]))
+                f.write("\t</trace>\n")
+            first_case = end_case
+        f.write(XES_FOOTER)
+    os.replace(temp_path, path)
+    return path
+
+
+def export_event_log(df: pd.DataFrame, output_dir: str, formats: Iterable[str] = EXPORT_FORMATS,
+                     partition_by: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Export an event log in several formats.
+
+    Args:
+        df: Event log DataFrame
+        output_dir: Directory receiving parquet/, arrow/ and event_log.xes.gz
+        formats: Any of "parquet", "arrow" and "xes"
+        partition_by: Partition columns of the Parquet and Arrow datasets (session by default)
+
+    Returns:
+        Dictionary mapping each format to its output path
+    """
+    if partition_by is None:
+        partition_by = [col for col in ("session",) if col in df.columns]
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = {}
+    for file_format in formats:
+        if file_format == "parquet":
+            paths[file_format] = export_parquet(df, os.path.join(output_dir, "parquet"), partition_by)
+        elif file_format == "arrow":
+            paths[file_format] = export_arrow(df, os.path.join(output_dir, "arrow"), partition_by)
+        elif file_format == "xes":
+            paths[file_format] = write_xes(df, os.path.join(output_dir, "event_log.xes.gz"))
+        else:
+            raise ValueError(f"Unknown export format '{file_format}', expected one of {EXPORT_FORMATS}")
+    return paths
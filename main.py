@@ -11,10 +11,7 @@ import warnings
 
 warnings.filterwarnings("ignore")
 
-from data_preprocessing import EPMDataProcessor
-from process_discovery import ProcessDiscovery
-from performance_analysis import PerformanceAnalysis
-from conformance_checking import ConformanceChecker
+from instrumentation import StageProfiler, RunProfiler
 
 
 class EducationalProcessMiningAnalysis:
@@ -25,18 +22,38 @@ class EducationalProcessMiningAnalysis:
         self.output_dir = output_dir
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # The analysis modules pull in pandas and friends, so they are imported
+        # here rather than at module level to keep `main.py --help` fast
+        from data_preprocessing import EPMDataProcessor
+        from process_discovery import ProcessDiscovery
+        from performance_analysis import PerformanceAnalysis
+        from conformance_checking import ConformanceChecker
+        from student_records import StudentRecords
+
         # Initialize components
         self.data_processor = EPMDataProcessor(dataset_path)
         self.process_discovery = ProcessDiscovery(output_dir)
         self.performance_analysis = PerformanceAnalysis(output_dir)
         self.conformance_checker = ConformanceChecker(output_dir)
+        self.student_records = StudentRecords(dataset_path)
+        self.profiler = StageProfiler()
 
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
-    def run_complete_analysis(self, min_events_per_case: int = 10, exclude_activities: list | None = None) -> dict:
+    def run_complete_analysis(self, min_events_per_case: int = 10, exclude_activities: list | None = None,
+                              emit_artifacts: bool = False, export_formats: list | None = None) -> dict:
+        with self.profiler.activate():
+            try:
+                return self._run_stages(min_events_per_case, exclude_activities, emit_artifacts, export_formats)
+            finally:
+                self.save_profile()
+
+    def _run_stages(self, min_events_per_case: int, exclude_activities: list | None, emit_artifacts: bool = False,
+                    export_formats: list | None = None) -> dict:
         if exclude_activities is None:
             exclude_activities = ["Blank", "Other"]
+        stage = self.profiler.stage
 
         print("=" * 60)
         print("EDUCATIONAL PROCESS MINING ANALYSIS")
@@ -52,21 +69,27 @@ class EducationalProcessMiningAnalysis:
         print("STEP 1: DATA EXTRACTION AND PREPROCESSING")
         print("-" * 45)
 
-        raw_data = self.data_processor.load_all_data()
+        with stage("1. load_all_data") as record:
+            raw_data = self.data_processor.load_all_data()
+            record["rows_out"] = len(raw_data)
         if raw_data.empty:
             raise ValueError("Failed to load dataset. Please check the dataset path.")
 
-        event_log = self.data_processor.create_event_log(raw_data)
+        with stage("1. create_event_log", rows_in=len(raw_data)) as record:
+            event_log = self.data_processor.create_event_log(raw_data)
+            record["rows_out"] = len(event_log)
 
         basic_stats = self.data_processor.get_basic_statistics(event_log)
         print(f"✓ Loaded {basic_stats['total_events']:,} events from {basic_stats['total_cases']} cases")
         print(f"✓ {basic_stats['total_students']} students across {basic_stats['total_sessions']} sessions")
 
-        quality_log = self.data_processor.filter_by_criteria(
-            event_log,
-            min_events_per_case=min_events_per_case,
-            exclude_activities=exclude_activities,
-        )
+        with stage("1. filter_by_criteria", rows_in=len(event_log)) as record:
+            quality_log = self.data_processor.filter_by_criteria(
+                event_log,
+                min_events_per_case=min_events_per_case,
+                exclude_activities=exclude_activities,
+            )
+            record["rows_out"] = len(quality_log)
         quality_stats = self.data_processor.get_basic_statistics(quality_log)
         print(f"✓ Quality filtered to {quality_stats['total_events']:,} events from {quality_stats['total_cases']} cases")
 
@@ -82,7 +105,8 @@ class EducationalProcessMiningAnalysis:
         print()
         print("STEP 2: PROCESS DISCOVERY")
         print("-" * 30)
-        discovery_results = self.process_discovery.discover_all_models(quality_log)
+        with stage("2. process_discovery", rows_in=len(quality_log)):
+            discovery_results = self.process_discovery.discover_all_models(quality_log)
         print("✓ Process models discovered and visualized")
         results["process_discovery"] = discovery_results
 
@@ -90,15 +114,25 @@ class EducationalProcessMiningAnalysis:
         print()
         print("STEP 3: PERFORMANCE ANALYSIS")
         print("-" * 32)
-        performance_results = self.performance_analysis.run_complete_analysis(quality_log)
+        with stage("3. performance_analysis", rows_in=len(quality_log)):
+            performance_results = self.performance_analysis.run_complete_analysis(quality_log)
         print("✓ Performance analysis completed")
+
+        with stage("3. join_grades", rows_in=len(performance_results["metrics"])) as record:
+            graded_metrics = self.student_records.join_case_metrics(performance_results["metrics"])
+            record["rows_out"] = len(graded_metrics)
+        graded_path = os.path.join(self.output_dir, "case_metrics_with_grades.csv")
+        graded_metrics.to_csv(graded_path, index=False)
+        performance_results["graded_metrics"] = graded_metrics
+        print(f"✓ Case metrics joined with grades and saved to {graded_path}")
         results["performance_analysis"] = performance_results
 
         # Step 4: Conformance Checking
         print()
         print("STEP 4: CONFORMANCE CHECKING")
         print("-" * 32)
-        conformance_results = self.conformance_checker.run_complete_conformance_check(quality_log)
+        with stage("4. conformance_checking", rows_in=len(quality_log)):
+            conformance_results = self.conformance_checker.run_complete_conformance_check(quality_log)
         print("✓ Conformance analysis completed")
         results["conformance_checking"] = conformance_results
 
@@ -106,13 +140,43 @@ class EducationalProcessMiningAnalysis:
         print()
         print("STEP 5: GENERATING SUMMARY REPORT")
         print("-" * 38)
-        summary_report = self.generate_executive_summary(results)
+        with stage("5. executive_summary"):
+            summary_report = self.generate_executive_summary(results)
         summary_path = os.path.join(self.output_dir, f"executive_summary_{self.timestamp}.txt")
         with open(summary_path, "w", encoding="utf-8") as f:
             f.write(summary_report)
         print(f"✓ Executive summary saved to {summary_path}")
         results["executive_summary"] = summary_report
 
+        # Step 6: Artifact bundle for the dashboards
+        if emit_artifacts:
+            from artifacts import write_artifact_bundle
+
+            print()
+            print("STEP 6: WRITING ARTIFACT BUNDLE")
+            print("-" * 36)
+            with stage("6. emit_artifacts", rows_in=len(quality_log)):
+                bundle_path = write_artifact_bundle(
+                    results, self.output_dir, self.timestamp, self.dataset_path,
+                    parameters={"min_events_per_case": min_events_per_case, "exclude_activities": exclude_activities},
+                )
+            print(f"✓ Artifact bundle saved to {bundle_path}")
+            results["artifact_bundle"] = bundle_path
+
+        # Step 7: Preprocessed event log for external tools
+        if export_formats:
+            from log_export import export_event_log
+
+            print()
+            print("STEP 7: EXPORTING EVENT LOG")
+            print("-" * 31)
+            export_dir = os.path.join(self.output_dir, "exports", f"event_log_{self.timestamp}")
+            with stage("7. export_log", rows_in=len(quality_log)):
+                export_paths = export_event_log(quality_log, export_dir, export_formats)
+            for file_format, path in export_paths.items():
+                print(f"✓ {file_format} export saved to {path}")
+            results["log_exports"] = export_paths
+
         # Final summary
         print()
         print("=" * 60)
@@ -125,6 +189,16 @@ class EducationalProcessMiningAnalysis:
 
         return results
 
+    def save_profile(self) -> None:
+        if not self.profiler.records:
+            return
+        print()
+        print("STAGE PROFILE")
+        print("-" * 15)
+        print(self.profiler.summary_table())
+        paths = self.profiler.save(self.output_dir, self.timestamp)
+        print(f"✓ Stage profile saved to {paths['json']}")
+
     def generate_executive_summary(self, results: dict) -> str:
         summary: list[str] = []
         summary.append("=" * 70)
@@ -141,6 +215,10 @@ class EducationalProcessMiningAnalysis:
         summary.append(f"• Analyzed {basic_stats['total_students']} engineering students")
         summary.append(f"• {basic_stats['total_events']:,} learning activities recorded")
         summary.append(f"• {basic_stats['total_activities']} different activity types identified")
+        graded_metrics = results["performance_analysis"].get("graded_metrics")
+        if graded_metrics is not None and "final_grade" in graded_metrics.columns:
+            graded_students = graded_metrics.loc[graded_metrics["final_grade"].notna(), "student_id"].nunique()
+            summary.append(f"• {graded_students} of the analyzed students have a final exam grade")
         summary.append("")
 
         # Process insights
@@ -344,13 +422,28 @@ def main():
     parser.add_argument("--output", default="output", help="Output directory for results")
     parser.add_argument("--min-events", type=int, default=10, help="Minimum events per case for quality filtering")
     parser.add_argument("--exclude", nargs="*", default=["Blank", "Other"], help="Activities to exclude from analysis")
+    parser.add_argument("--profile", action="store_true", help="Profile the run and write .pstats/flamegraph files to the output directory")
+    parser.add_argument("--profiler", choices=RunProfiler.ENGINES, default="cprofile", help="Profiler used with --profile")
+    parser.add_argument("--emit-artifacts", action="store_true", help="Write a Parquet artifact bundle the dashboards load instead of recomputing")
+    parser.add_argument("--export-log", nargs="+", choices=["parquet", "arrow", "xes"], default=None,
+                        help="Export the preprocessed event log (Parquet/Arrow partitioned by session, streamed XES)")
 
     args = parser.parse_args()
 
     analysis = EducationalProcessMiningAnalysis(dataset_path=args.dataset, output_dir=args.output)
 
     try:
-        results = analysis.run_complete_analysis(min_events_per_case=args.min_events, exclude_activities=args.exclude)
+        if args.profile:
+            with RunProfiler(args.output, analysis.timestamp, engine=args.profiler):
+                results = analysis.run_complete_analysis(
+                    min_events_per_case=args.min_events, exclude_activities=args.exclude, emit_artifacts=args.emit_artifacts,
+                    export_formats=args.export_log,
+                )
+        else:
+            results = analysis.run_complete_analysis(
+                min_events_per_case=args.min_events, exclude_activities=args.exclude, emit_artifacts=args.emit_artifacts,
+                export_formats=args.export_log,
+            )
         analysis.create_analysis_index()
 
         print()
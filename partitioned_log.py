@@ -0,0 +1,187 @@
+"""
+Partitioned storage of the preprocessed EPM event log.
+The event log is cached as Parquet files partitioned by session and by
+ranges of student IDs, so a load restricted to some sessions or students
+reads only their files, and only the requested columns of them.
+"""
+
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_preprocessing import apply_compact_schema, _sort_codes
+from dataset_manifest import SessionKey, session_number
+
+# Bump when the partition layout or the stored columns change so partitions are rebuilt
+PARTITION_FORMAT_VERSION = 1
+# Student IDs per partition within a session
+STUDENT_RANGE = 32
+VERSION_FILE = "_VERSION"
+PARTITION_FILE = "part-0.parquet"
+
+
+def _write_partition(df: pd.DataFrame, path: str) -> None:
+    """
+    Write one partition as Parquet with int32 dictionary indices, so the
+    partitions of sessions built at different times share one schema.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = table.schema
+    for i, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type):
+            schema = schema.set(i, field.with_type(pa.dictionary(pa.int32(), field.type.value_type)))
+    pq.write_table(table.cast(schema), path)
+
+
+class PartitionedEventLog:
+    """Event log cache under <dataset>/Data/.cache/event_log_partitions/session=<n>/students=<lo>-<hi>/."""
+
+    def __init__(self, processor, student_range: int = STUDENT_RANGE, root: Optional[str] = None):
+        """
+        Initialize the partitioned log of a dataset.
+
+        Args:
+            processor: EPMDataProcessor of the dataset; builds the partitions of stale sessions
+            student_range: Number of student IDs per partition within a session
+            root: Partition directory (default: the dataset's Data/.cache/event_log_partitions)
+        """
+        self.processor = processor
+        self.student_range = student_range
+        self.root = root or os.path.join(processor.dataset_path, "Data", ".cache", "event_log_partitions")
+
+    def _session_dir(self, session: int) -> str:
+        return os.path.join(self.root, f"session={session}")
+
+    def _session_version(self, session: int) -> str:
+        """Version of a session's partitions: changes with any of its files or the layout."""
+        fingerprint = self.processor.manifest.select(sessions=[session]).fingerprint()
+        return f"{PARTITION_FORMAT_VERSION}-{self.student_range}-{fingerprint}"
+
+    def _stored_version(self, session: int) -> Optional[str]:
+        try:
+            with open(os.path.join(self._session_dir(session), VERSION_FILE), encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _write_session(self, session: int, event_log: pd.DataFrame, version: str) -> None:
+        """Write one session's partitions next to the old ones and swap them in."""
+        session_dir = self._session_dir(session)
+        temp_dir = f"{session_dir}.tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+        student_ids = event_log['student_id'].astype(np.int64).to_numpy()
+        ranges = student_ids // self.student_range
+        for student_range in np.unique(ranges):
+            low = int(student_range) * self.student_range
+            partition_dir = os.path.join(temp_dir, f"students={low}-{low + self.student_range - 1}")
+            os.makedirs(partition_dir)
+            _write_partition(event_log[ranges == student_range], os.path.join(partition_dir, PARTITION_FILE))
+        os.makedirs(temp_dir, exist_ok=True)
+        # The version file is written last, so a session without one is incomplete
+        with open(os.path.join(temp_dir, VERSION_FILE), 'w', encoding='utf-8') as f:
+            f.write(version)
+
+        shutil.rmtree(session_dir, ignore_errors=True)
+        os.replace(temp_dir, session_dir)
+
+    def ensure(self, sessions: Optional[Iterable[SessionKey]] = None) -> List[int]:
+        """
+        Build the partitions of sessions that are missing or stale, parsing their files in one batch.
+
+        Args:
+            sessions: Sessions to check, as numbers or folder names (default: all sessions of the dataset)
+
+        Returns:
+            Session numbers that have data
+        """
+        available = set(self.processor.manifest.session_counts())
+        wanted = sorted(available if sessions is None else {session_number(s) for s in sessions} & available)
+        versions = {session: self._session_version(session) for session in wanted}
+        stale = [session for session in wanted if self._stored_version(session) != versions[session]]
+
+        if stale:
+            print(f"Building event log partitions for sessions {', '.join(map(str, stale))}...")
+            raw_data = self.processor.load_all_data(sessions=stale)
+            event_log = self.processor.create_event_log(raw_data) if not raw_data.empty else raw_data
+            os.makedirs(self.root, exist_ok=True)
+            session_values = event_log['session'].astype(np.int64) if not event_log.empty else pd.Series(dtype='int64')
+            for session in stale:
+                self._write_session(session, event_log[session_values.to_numpy() == session], versions[session])
+        return wanted
+
+    def partition_files(self, sessions: Optional[Iterable[SessionKey]] = None,
+                        students: Optional[Iterable[int]] = None) -> List[str]:
+        """
+        Files holding the given sessions and students, built first if stale.
+
+        Args:
+            sessions: Sessions to read (default: all)
+            students: Student IDs to read (default: all)
+
+        Returns:
+            Parquet file paths in session, student order
+        """
+        ranges = None if students is None else {int(s) // self.student_range for s in students}
+        files = []
+        for session in self.ensure(sessions):
+            session_dir = self._session_dir(session)
+            partitions: Dict[int, str] = {}
+            for entry in os.scandir(session_dir):
+                if entry.is_dir() and entry.name.startswith("students="):
+                    low = int(entry.name[len("students="):].split("-")[0])
+                    partitions[low // self.student_range] = os.path.join(entry.path, PARTITION_FILE)
+            files += [partitions[r] for r in sorted(partitions) if ranges is None or r in ranges]
+        return files
+
+    def read(self, sessions: Optional[Iterable[SessionKey]] = None, students: Optional[Iterable[int]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read the event log of some sessions and students, touching only their partitions.
+
+        Args:
+            sessions: Sessions to read, as numbers or folder names (default: all)
+            students: Student IDs to read (default: all)
+            columns: Columns to read (default: all)
+
+        Returns:
+            Event log DataFrame in the layout of EPMDataProcessor.create_event_log, ordered by case and timestamp
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        files = self.partition_files(sessions, students)
+        if not files:
+            return pd.DataFrame(columns=columns)
+
+        # Sessions built at different times can differ in counter widths (the compact
+        # schema is fitted per build); read them all with the widest types
+        # (permissive promotion needs pyarrow >= 14, see requirements.txt)
+        schema = pa.unify_schemas([pq.read_schema(path) for path in files], promote_options="permissive")
+        dataset = ds.dataset(files, schema=schema, format="parquet")
+        row_filter = None
+        if students is not None:
+            # Partitions hold ranges of students; the rest of a range is filtered out while scanning
+            row_filter = ds.field('student_id').isin([int(s) for s in students])
+        table = dataset.to_table(columns=columns, filter=row_filter)
+        event_log = table.to_pandas()
+        # Dictionaries unified across partitions keep first-seen order; sort them as a single build would
+        for col in event_log.select_dtypes('category').columns:
+            categories = event_log[col].cat.categories
+            if not categories.is_monotonic_increasing:
+                event_log[col] = event_log[col].cat.reorder_categories(categories.sort_values())
+        event_log = apply_compact_schema(event_log)
+
+        # Partitions are read in session order; restore the case/timestamp order of create_event_log
+        if {'case:concept:name', 'time:timestamp'} <= set(event_log.columns):
+            order = np.lexsort((event_log['time:timestamp'].to_numpy(), _sort_codes(event_log['case:concept:name'])))
+            if np.any(order[1:] < order[:-1]):
+                event_log = event_log.take(order)
+        return event_log.reset_index(drop=True)
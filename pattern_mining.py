@@ -0,0 +1,159 @@
+"""
+Sequential pattern mining module for educational process mining.
+Counts n-grams (contiguous activity subsequences) over integer-encoded traces
+by packing each window into a single integer key.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Tuple, Union
+
+from encoded_log import EncodedLog
+
+
+def _bits_per_code(n_activities: int) -> int:
+    """Number of bits needed to pack one activity code."""
+    return max(1, int(np.ceil(np.log2(max(n_activities, 2)))))
+
+
+def _case_support(keys: np.ndarray, cases: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count occurrences and distinct supporting cases for every key.
+
+    Returns:
+        Tuple of (unique keys, occurrence counts, case support)
+    """
+    if len(keys) == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty
+
+    order = np.lexsort((cases, keys))
+    keys = keys[order]
+    cases = cases[order]
+
+    new_key = np.empty(len(keys), dtype=bool)
+    new_key[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=new_key[1:])
+    new_pair = new_key.copy()
+    new_pair[1:] |= cases[1:] != cases[:-1]
+
+    starts = np.flatnonzero(new_key)
+    counts = np.diff(np.append(starts, len(keys)))
+    support = np.add.reduceat(new_pair.astype(np.int64), starts)
+    return keys[starts], counts, support
+
+
+class NGramMiner:
+    """Frequent n-gram miner over an encoded event log."""
+
+    def __init__(self, encoded_log: EncodedLog):
+        """
+        Initialize the miner.
+
+        Args:
+            encoded_log: Encoded event log to mine
+        """
+        self.log = encoded_log
+        self.bits = _bits_per_code(encoded_log.n_activities)
+        # Longest n-gram that still fits in a signed 64-bit key
+        self.max_packed_n = 63 // self.bits
+
+    def _resolve_support(self, min_support: Union[int, float]) -> int:
+        if isinstance(min_support, float) and min_support <= 1:
+            return max(1, int(np.ceil(min_support * self.log.n_cases)))
+        return int(min_support)
+
+    def _decode_key(self, key: int, n: int) -> Tuple[str, ...]:
+        mask = (1 << self.bits) - 1
+        codes = [(key >> (self.bits * (n - 1 - j))) & mask for j in range(n)]
+        return tuple(self.log.decode(codes))
+
+    def _frame(self, patterns, counts, support, top_k) -> pd.DataFrame:
+        frame = pd.DataFrame({'pattern': patterns, 'frequency': counts, 'support': support})
+        frame = frame.sort_values(['frequency', 'support'], ascending=False, kind='stable')
+        return frame.head(top_k).reset_index(drop=True) if top_k else frame.reset_index(drop=True)
+
+    def mine(self, n_values: Iterable[int] = range(2, 6), top_k: int = 10,
+             min_support: Union[int, float] = 1) -> Dict[int, pd.DataFrame]:
+        """
+        Find the most frequent n-grams for several lengths.
+
+        Keys for length n are built from the keys for length n-1 by shifting in
+        the next activity code, so all lengths are produced in one rolling pass.
+
+        Args:
+            n_values: N-gram lengths to mine
+            top_k: Number of patterns to return per length (None for all)
+            min_support: Minimum number of cases (int) or fraction of cases (float)
+                that must contain a pattern
+
+        Returns:
+            Dictionary mapping n to a DataFrame with pattern, frequency and support
+        """
+        n_values = sorted(set(n_values))
+        min_cases = self._resolve_support(min_support)
+        codes = self.log.codes.astype(np.int64)
+        cases = self.log.case_index
+        results = {}
+
+        keys = codes
+        for n in range(1, (n_values[-1] if n_values else 0) + 1):
+            if n > 1:
+                if n <= self.max_packed_n:
+                    keys = (keys[:-1] << self.bits) | codes[n - 1:]
+                else:
+                    keys = None
+
+            if n not in n_values:
+                continue
+
+            n_windows = len(codes) - n + 1
+            if n_windows <= 0:
+                results[n] = self._frame([], [], [], top_k)
+                continue
+
+            # A window is valid when its first and last event belong to the same case
+            valid = cases[:n_windows] == cases[n - 1:]
+            window_cases = cases[:n_windows][valid]
+
+            if keys is not None:
+                uniq, counts, support = _case_support(keys[valid], window_cases)
+                keep = support >= min_cases
+                patterns = [self._decode_key(int(key), n) for key in uniq[keep]]
+                results[n] = self._frame(patterns, counts[keep], support[keep], top_k)
+            else:
+                results[n] = self._mine_unpacked(n, valid, window_cases, min_cases, top_k)
+
+        return results
+
+    def _mine_unpacked(self, n: int, valid: np.ndarray, window_cases: np.ndarray,
+                       min_cases: int, top_k: int) -> pd.DataFrame:
+        """Fallback for n-grams too long to pack into a 64-bit key."""
+        windows = np.lib.stride_tricks.sliding_window_view(self.log.codes, n)[valid]
+        uniq, inverse = np.unique(windows, axis=0, return_inverse=True)
+        _, counts, support = _case_support(inverse.ravel().astype(np.int64), window_cases)
+        keep = support >= min_cases
+        patterns = [tuple(self.log.decode(row)) for row in uniq[keep]]
+        return self._frame(patterns, counts[keep], support[keep], top_k)
+
+
+def mine_ngrams(df: pd.DataFrame, n_values: Iterable[int] = range(2, 6), top_k: int = 10,
+                min_support: Union[int, float] = 1) -> Dict[int, pd.DataFrame]:
+    """
+    Mine frequent n-grams from an event log DataFrame.
+
+    Args:
+        df: Event log DataFrame
+        n_values: N-gram lengths to mine
+        top_k: Number of patterns to return per length
+        min_support: Minimum number of cases (int) or fraction of cases (float)
+
+    Returns:
+        Dictionary mapping n to a DataFrame with pattern, frequency and support
+    """
+    return NGramMiner(EncodedLog.from_dataframe(df)).mine(n_values, top_k=top_k, min_support=min_support)
+
+
+def format_pattern(pattern: Tuple[str, ...]) -> str:
+    """Format a pattern tuple as 'A → B → C'."""
+    return " → ".join(pattern)
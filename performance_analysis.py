@@ -5,18 +5,15 @@ Analyzes student performance, timing patterns, and learning behaviors.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from datetime import timedelta
-import pm4py
-from pm4py.statistics.traces.generic.log import case_statistics
-from pm4py.statistics.variants.log import get as variants_get
 import os
 from typing import Dict, List, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+from pattern_mining import mine_ngrams
+from duration_stats import duration_statistics
+from instrumentation import instrumented
+
 
 class PerformanceAnalysis:
     """Class for analyzing educational process performance metrics."""
@@ -31,6 +28,7 @@ class PerformanceAnalysis:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
+    @instrumented()
     def calculate_case_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate performance metrics for each case (student-session).
@@ -110,6 +108,7 @@ class PerformanceAnalysis:
         
         return metrics_df
     
+    @instrumented()
     def analyze_activity_patterns(self, df: pd.DataFrame) -> Dict:
         """
         Analyze patterns in activity sequences and timing.
@@ -123,41 +122,29 @@ class PerformanceAnalysis:
         # Activity frequency analysis
         activity_freq = df['concept:name'].value_counts()
         
-        # Activity transition analysis
-        transitions = []
-        for case_id in df['case:concept:name'].unique():
-            case_data = df[df['case:concept:name'] == case_id].sort_values('time:timestamp')
-            activities = case_data['concept:name'].tolist()
-            
-            for i in range(len(activities) - 1):
-                transitions.append((activities[i], activities[i+1]))
-        
-        transition_freq = pd.Series(transitions).value_counts()
+        # Activity transition and longer sequence analysis over the encoded log
+        sequence_patterns = mine_ngrams(df, n_values=range(2, 6), top_k=20)
+        transition_freq = sequence_patterns[2]
         
-        # Time-based patterns
-        df['hour'] = df['time:timestamp'].dt.hour
-        hourly_activity = df.groupby('hour')['concept:name'].count()
+        # Time-based patterns (the hour is derived on the fly so the input frame is left untouched)
+        hourly_activity = df.groupby(df['time:timestamp'].dt.hour.rename('hour'))['concept:name'].count()
         
-        # Activity duration analysis (if duration available)
+        # Activity duration statistics, all activities in one grouped pass (if duration available)
         activity_durations = {}
         if 'duration' in df.columns:
-            for activity in df['concept:name'].unique():
-                activity_data = df[df['concept:name'] == activity]['duration']
-                activity_durations[activity] = {
-                    'mean': activity_data.mean(),
-                    'median': activity_data.median(),
-                    'std': activity_data.std()
-                }
+            activity_durations = duration_statistics(df, group_col='concept:name', value_col='duration').to_dict('index')
         
         patterns = {
             'activity_frequency': activity_freq.to_dict(),
-            'top_transitions': transition_freq.head(20).to_dict(),
+            'top_transitions': dict(zip(transition_freq['pattern'], transition_freq['frequency'])),
+            'sequence_patterns': sequence_patterns,
             'hourly_distribution': hourly_activity.to_dict(),
             'activity_durations': activity_durations
         }
         
         return patterns
     
+    @instrumented()
     def identify_learning_paths(self, df: pd.DataFrame) -> Dict:
         """
         Identify common learning paths and sequences.
@@ -214,6 +201,7 @@ class PerformanceAnalysis:
         
         return learning_paths
     
+    @instrumented()
     def analyze_performance_by_session(self, metrics_df: pd.DataFrame) -> Dict:
         """
         Analyze performance differences across sessions.
@@ -249,69 +237,56 @@ class PerformanceAnalysis:
         
         return session_analysis
     
-    def identify_student_clusters(self, metrics_df: pd.DataFrame) -> Dict:
+    @instrumented()
+    def identify_student_clusters(self, metrics_df: pd.DataFrame, n_clusters: int = None,
+                                  model_path: str = None) -> Dict:
         """
         Identify clusters of students with similar learning behaviors.
         
         Args:
             metrics_df: DataFrame with case metrics
+            n_clusters: Fixed number of clusters; selected by silhouette score when None
+            model_path: File to save the fitted scaler and model to, for assign_student_clusters
             
         Returns:
             Dictionary with clustering analysis
         """
-        from sklearn.cluster import KMeans
-        from sklearn.preprocessing import StandardScaler
-        
-        # Select features for clustering
-        feature_cols = [
-            'total_duration_hours', 'activity_diversity', 'total_clicks',
-            'total_keystrokes', 'deeds_time_ratio', 'study_time_ratio', 'texteditor_time_ratio'
-        ]
-        
-        # Filter available features
-        available_features = [col for col in feature_cols if col in metrics_df.columns]
-        
-        if len(available_features) < 3:
-            return {'error': 'Insufficient features for clustering'}
-        
-        # Prepare data
-        cluster_data = metrics_df[available_features].fillna(0)
-        scaler = StandardScaler()
-        scaled_data = scaler.fit_transform(cluster_data)
-        
-        # Perform clustering
-        n_clusters = min(5, len(metrics_df) // 3)  # Ensure reasonable cluster count
-        if n_clusters < 2:
-            return {'error': 'Insufficient data for clustering'}
-        
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-        clusters = kmeans.fit_predict(scaled_data)
-        
-        # Analyze clusters
-        cluster_analysis = {}
-        for i in range(n_clusters):
-            cluster_data = metrics_df[clusters == i]
-            
-            cluster_stats = {
-                'size': len(cluster_data),
-                'avg_duration': cluster_data['total_duration_hours'].mean(),
-                'avg_events': cluster_data['total_events'].mean(),
-                'avg_diversity': cluster_data['activity_diversity'].mean(),
-                'characteristics': {}
-            }
-            
-            # Add feature-specific characteristics
-            for feature in available_features:
-                cluster_stats['characteristics'][feature] = cluster_data[feature].mean()
-            
-            cluster_analysis[f'Cluster_{i}'] = cluster_stats
+        from student_clustering import StudentClustering
+        
+        engine = StudentClustering()
+        try:
+            labels = engine.fit(metrics_df, n_clusters=n_clusters)
+        except ValueError as e:
+            return {'error': str(e)}
+        
+        # Persist scaler and model so new sessions can be assigned without refitting
+        if model_path:
+            engine.save(model_path)
         
         return {
-            'clusters': cluster_analysis,
-            'features_used': available_features,
-            'n_clusters': n_clusters
+            'clusters': engine.cluster_statistics(metrics_df, labels),
+            'features_used': engine.features_used,
+            'n_clusters': engine.n_clusters,
+            'silhouette_scores': engine.silhouette_scores
         }
     
+    def assign_student_clusters(self, metrics_df: pd.DataFrame, model_path: str) -> pd.Series:
+        """
+        Assign new student sessions to previously fitted clusters.
+        
+        Args:
+            metrics_df: DataFrame with case metrics for the new sessions
+            model_path: Model saved by identify_student_clusters(model_path=...)
+            
+        Returns:
+            Series with the cluster label of each case
+        """
+        from student_clustering import StudentClustering
+        
+        engine = StudentClustering.load(model_path)
+        return pd.Series(engine.predict(metrics_df), index=metrics_df.index, name='cluster')
+    
+    @instrumented()
     def create_performance_visualizations(self, metrics_df: pd.DataFrame, patterns: Dict) -> None:
         """
         Create performance visualization charts.
@@ -320,6 +295,8 @@ class PerformanceAnalysis:
             metrics_df: DataFrame with case metrics
             patterns: Dictionary with activity patterns
         """
+        import matplotlib.pyplot as plt
+        
         # 1. Duration vs Events scatter plot
         plt.figure(figsize=(12, 8))
         plt.scatter(metrics_df['total_events'], metrics_df['total_duration_hours'], 
@@ -421,7 +398,14 @@ class PerformanceAnalysis:
         report.append("Top 5 Most Frequent Activities:")
         for i, (activity, count) in enumerate(list(patterns['activity_frequency'].items())[:5], 1):
             report.append(f"  {i}. {activity}: {count} occurrences")
-        
+
+        for n, sequences in patterns.get('sequence_patterns', {}).items():
+            if n < 3 or sequences.empty:
+                continue
+            report.append(f"Top {n}-Activity Sequences:")
+            for i, row in enumerate(sequences.head(3).itertuples(index=False), 1):
+                report.append(f"  {i}. {' → '.join(row.pattern)} ({row.frequency} times in {row.support} sessions)")
+
         # Learning paths
         report.append("\n3. LEARNING PATH ANALYSIS")
         report.append("-" * 30)
@@ -1,25 +1,12 @@
 """
 Process discovery module for educational process mining.
 Discovers process models from student learning event logs using PM4Py.
+
+PM4Py, matplotlib and seaborn are imported inside the methods that use them,
+so importing this module (and starting the CLI or a dashboard worker) stays cheap.
 """
 
 import pandas as pd
-import pm4py
-from pm4py.objects.log.exporter.xes import exporter as xes_exporter
-from pm4py.objects.log.importer.xes import importer as xes_importer
-from pm4py.algo.discovery.alpha import algorithm as alpha_miner
-from pm4py.algo.discovery.inductive import algorithm as inductive_miner
-from pm4py.algo.discovery.heuristics import algorithm as heuristics_miner
-from pm4py.visualization.petri_net import visualizer as pn_visualizer
-from pm4py.visualization.process_tree import visualizer as pt_visualizer
-from pm4py.visualization.heuristics_net import visualizer as hn_visualizer
-from pm4py.visualization.dfg import visualizer as dfg_visualizer
-from pm4py.algo.discovery.dfg import algorithm as dfg_discovery
-from pm4py.statistics.traces.generic.log import case_statistics
-from pm4py.statistics.start_activities.log import get as start_activities_get
-from pm4py.statistics.end_activities.log import get as end_activities_get
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 from typing import Dict, Tuple, List
 import warnings
@@ -58,28 +45,63 @@ class ProcessDiscovery:
         clean_df = df[required_cols].copy()
         clean_df = clean_df.dropna()
         
+        # PM4Py expects plain string columns, not the categoricals of the compact schema
+        for col in ['case:concept:name', 'concept:name']:
+            if isinstance(clean_df[col].dtype, pd.CategoricalDtype):
+                clean_df[col] = clean_df[col].astype(str)
+        
+        import pm4py
+        
         # Convert to PM4Py format using the updated API
         log = pm4py.convert_to_event_log(clean_df)
         
         print(f"Created PM4Py log with {len(log)} traces")
         return log
     
+    def discover_dfg_counts(self, df: pd.DataFrame) -> object:
+        """
+        Count the Directly-Follows Graph of a DataFrame on its integer encoding.
+        
+        Args:
+            df: Event log DataFrame
+            
+        Returns:
+            IncrementalDFG, which can be updated with further cases or events
+            and summed with the graphs of other sessions
+        """
+        from incremental_dfg import IncrementalDFG
+        
+        required_cols = ['case:concept:name', 'concept:name', 'time:timestamp']
+        return IncrementalDFG.from_dataframe(df[required_cols].dropna())
+    
     def discover_dfg(self, log: object) -> Tuple[Dict, Dict, Dict]:
         """
         Discover Directly-Follows Graph (DFG).
         
         Args:
-            log: PM4Py log object
+            log: PM4Py log object, event log DataFrame or IncrementalDFG
             
         Returns:
             Tuple of (dfg, start_activities, end_activities)
         """
-        # Discover DFG
-        dfg = dfg_discovery.apply(log)
+        from incremental_dfg import IncrementalDFG
+        
+        if isinstance(log, pd.DataFrame):
+            log = self.discover_dfg_counts(log)
         
-        # Get start and end activities
-        start_activities = start_activities_get.get_start_activities(log)
-        end_activities = end_activities_get.get_end_activities(log)
+        if isinstance(log, IncrementalDFG):
+            dfg, start_activities, end_activities = log.to_dicts()
+        else:
+            from pm4py.algo.discovery.dfg import algorithm as dfg_discovery
+            from pm4py.statistics.start_activities.log import get as start_activities_get
+            from pm4py.statistics.end_activities.log import get as end_activities_get
+            
+            # Discover DFG
+            dfg = dfg_discovery.apply(log)
+            
+            # Get start and end activities
+            start_activities = start_activities_get.get_start_activities(log)
+            end_activities = end_activities_get.get_end_activities(log)
         
         print(f"DFG discovered with {len(dfg)} edges")
         print(f"Start activities: {len(start_activities)}")
@@ -99,6 +121,8 @@ class ProcessDiscovery:
             title: Title for the visualization
         """
         try:
+            from pm4py.visualization.dfg import visualizer as dfg_visualizer
+            
             # Create visualization with basic parameters
             parameters = {dfg_visualizer.Variants.FREQUENCY.value.Parameters.FORMAT: "png"}
             gviz = dfg_visualizer.apply(dfg, start_activities, end_activities, parameters=parameters)
@@ -121,6 +145,9 @@ class ProcessDiscovery:
         Returns:
             Tuple of (process_tree, net, initial_marking, final_marking)
         """
+        import pm4py
+        from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+        
         # Apply inductive miner
         process_tree = inductive_miner.apply(log)
         
@@ -179,6 +206,8 @@ class ProcessDiscovery:
             title: Title for the visualization
         """
         try:
+            from pm4py.visualization.process_tree import visualizer as pt_visualizer
+            
             gviz = pt_visualizer.apply(process_tree, parameters={pt_visualizer.Variants.WO_DECORATION.value.Parameters.FORMAT: "png"})
             output_path = os.path.join(self.output_dir, f"{title.lower().replace(' ', '_')}.png")
             pt_visualizer.save(gviz, output_path)
@@ -198,6 +227,8 @@ class ProcessDiscovery:
             title: Title for the visualization
         """
         try:
+            from pm4py.visualization.petri_net import visualizer as pn_visualizer
+            
             gviz = pn_visualizer.apply(net, initial_marking, final_marking,
                                      parameters={pn_visualizer.Variants.WO_DECORATION.value.Parameters.FORMAT: "png"})
             output_path = os.path.join(self.output_dir, f"{title.lower().replace(' ', '_')}.png")
@@ -215,6 +246,8 @@ class ProcessDiscovery:
             title: Title for the visualization
         """
         try:
+            from pm4py.visualization.heuristics_net import visualizer as hn_visualizer
+            
             gviz = hn_visualizer.apply(heu_net, parameters={hn_visualizer.Variants.PYDOTPLUS.value.Parameters.FORMAT: "png"})
             output_path = os.path.join(self.output_dir, f"{title.lower().replace(' ', '_')}.png")
             hn_visualizer.save(gviz, output_path)
@@ -222,27 +255,39 @@ class ProcessDiscovery:
         except Exception as e:
             print(f"Error creating heuristics net visualization: {e}")
     
-    def analyze_process_variants(self, log: object) -> Dict:
+    def analyze_process_variants(self, df: object) -> Dict:
         """
         Analyze process variants (traces) in the log.
         
         Args:
-            log: PM4Py log object
+            df: Event log DataFrame, or a PM4Py log (converted to a DataFrame first)
             
         Returns:
-            Dictionary with variant analysis
+            Dictionary with variant analysis; 'variant_index' holds the full
+            VariantIndex for prefix queries, coverage curves and variant filters
         """
-        # Get case statistics
-        case_stats = case_statistics.get_variant_statistics(log)
+        from variant_index import VariantIndex
+        
+        if not isinstance(df, pd.DataFrame):
+            import pm4py
+            df = pm4py.convert_to_dataframe(df)
+        
+        variant_index = VariantIndex.from_dataframe(df)
+        top_variants = variant_index.top_variants(k=20)
+        case_stats = [{'variant': variant, 'count': int(count)}
+                      for variant, count in zip(top_variants['variant'], top_variants['count'])]
         
         # Create variant analysis
         variant_analysis = {
-            'total_variants': len(case_stats),
+            'total_variants': variant_index.n_variants,
             'most_common_variants': case_stats[:10],  # Top 10 variants
-            'variant_distribution': {variant['variant']: variant['count'] for variant in case_stats[:20]}
+            'variant_distribution': {variant['variant']: variant['count'] for variant in case_stats},
+            'variants_for_80_percent': variant_index.variants_for_coverage(0.8),
+            'variant_index': variant_index
         }
         
-        print(f"Process has {variant_analysis['total_variants']} unique variants")
+        print(f"Process has {variant_analysis['total_variants']} unique variants "
+              f"({variant_analysis['variants_for_80_percent']} cover 80% of the cases)")
         
         return variant_analysis
     
@@ -253,6 +298,9 @@ class ProcessDiscovery:
         Args:
             df: Event log DataFrame
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         plt.figure(figsize=(15, 8))
         
         # Get activity frequencies
@@ -282,6 +330,9 @@ class ProcessDiscovery:
             print("Session information not available for comparison")
             return
             
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         plt.figure(figsize=(15, 10))
         
         # Session activity heatmap
@@ -321,7 +372,8 @@ class ProcessDiscovery:
         
         # Discover DFG
         print("\n--- Discovering Directly-Follows Graph ---")
-        dfg, start_activities, end_activities = self.discover_dfg(log)
+        dfg_counts = self.discover_dfg_counts(df)
+        dfg, start_activities, end_activities = self.discover_dfg(dfg_counts)
         self.visualize_dfg(dfg, start_activities, end_activities, "Educational Process DFG")
         
         # Discover Inductive Model
@@ -339,7 +391,7 @@ class ProcessDiscovery:
         
         # Analyze variants
         print("\n--- Analyzing Process Variants ---")
-        variant_analysis = self.analyze_process_variants(log)
+        variant_analysis = self.analyze_process_variants(df)
         
         # Create additional visualizations
         print("\n--- Creating Additional Visualizations ---")
@@ -352,6 +404,7 @@ class ProcessDiscovery:
             'dfg': dfg,
             'start_activities': start_activities,
             'end_activities': end_activities,
+            'dfg_counts': dfg_counts,
             'process_tree': process_tree,
             'inductive_model': {
                 'net': inductive_net,
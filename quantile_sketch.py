@@ -0,0 +1,238 @@
+"""
+Mergeable quantile sketches for duration metrics.
+DDSketch-style log-bucketed histograms: every quantile estimate is within a
+fixed relative error of the true value, memory grows with the logarithm of the
+value range rather than with the number of values, and sketches built on
+separate batches or workers merge by adding bucket counts.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, Iterable, List, Sequence
+
+# Values closer to zero than this are counted in the zero bucket
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch of one stream of values."""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of the quantile estimates
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        # Count, mean and sum of squared deviations (M2), merged with Chan's
+        # parallel formula; raw power sums lose precision for large values
+        self.count = 0
+        self._mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def bucket_index(self, magnitudes: np.ndarray) -> np.ndarray:
+        """Bucket of each (positive) magnitude: bucket k covers (gamma^(k-1), gamma^k]."""
+        return np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def _merge_moments(self, count: int, mean: float, m2: float) -> None:
+        """Combine the moments of another batch of values into the sketch's."""
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def add(self, values: Sequence[float]) -> 'QuantileSketch':
+        """
+        Add values to the sketch; missing values are ignored.
+
+        Args:
+            values: Values to add
+
+        Returns:
+            The sketch itself
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        batch_mean = float(values.mean())
+        self._merge_moments(len(values), batch_mean, float(np.square(values - batch_mean).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        self.zero_count += int((np.abs(values) < MIN_INDEXABLE_VALUE).sum())
+        for store, selected in ((self.positive, values[values >= MIN_INDEXABLE_VALUE]),
+                                (self.negative, -values[values <= -MIN_INDEXABLE_VALUE])):
+            buckets, counts = np.unique(self.bucket_index(selected), return_counts=True)
+            for bucket, count in zip(buckets.tolist(), counts.tolist()):
+                store[bucket] = store.get(bucket, 0) + count
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Fold another sketch with the same accuracy into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            The sketch itself
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for bucket, count in other_store.items():
+                store[bucket] = store.get(bucket, 0) + count
+        self.zero_count += other.zero_count
+        self._merge_moments(other.count, other._mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value (NaN for an empty sketch)
+        """
+        if self.count == 0:
+            return np.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = 0
+        # Most negative values first: the largest negative buckets
+        for bucket in sorted(self.negative, reverse=True):
+            seen += self.negative[bucket]
+            if seen > rank:
+                return max(-self._bucket_value(bucket), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self.positive):
+            seen += self.positive[bucket]
+            if seen > rank:
+                return min(self._bucket_value(bucket), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as in pandas)."""
+        if self.count < 2:
+            return np.nan
+        return float(np.sqrt(self.m2 / (self.count - 1)))
+
+    @property
+    def n_buckets(self) -> int:
+        return len(self.positive) + len(self.negative) + (1 if self.zero_count else 0)
+
+
+class KeyedSketches:
+    """One quantile sketch per key (e.g. per activity or per transition)."""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize an empty collection.
+
+        Args:
+            relative_accuracy: Maximum relative error of the quantile estimates
+        """
+        self.relative_accuracy = relative_accuracy
+        self.sketches: Dict[Hashable, QuantileSketch] = {}
+
+    def sketch(self, key: Hashable) -> QuantileSketch:
+        """Sketch of a key, created empty on first use."""
+        if key not in self.sketches:
+            self.sketches[key] = QuantileSketch(self.relative_accuracy)
+        return self.sketches[key]
+
+    def add(self, keys: Sequence[Hashable], values: Sequence[float]) -> 'KeyedSketches':
+        """
+        Add a batch of (key, value) pairs.
+
+        The batch is grouped once by sorting, so the per-key work is a single
+        vectorized sketch update rather than one update per value.
+
+        Args:
+            keys: Key of every value
+            values: Values, parallel to keys
+
+        Returns:
+            The collection itself
+        """
+        codes, labels = pd.factorize(pd.Series(keys), sort=False)
+        values = np.asarray(values, dtype=np.float64)
+        keep = codes >= 0
+        codes, values = codes[keep], values[keep]
+
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        sorted_values = values[order]
+        for code, label in enumerate(labels):
+            self.sketch(label).add(sorted_values[bounds[code]:bounds[code + 1]])
+        return self
+
+    def merge(self, other: 'KeyedSketches') -> 'KeyedSketches':
+        """Fold another collection into this one, key by key."""
+        for key, sketch in other.sketches.items():
+            self.sketch(key).merge(sketch)
+        return self
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.95), key_name: str = 'key') -> pd.DataFrame:
+        """
+        Count, mean, std, min, max and quantiles of every key.
+
+        Args:
+            quantiles: Quantiles to report, as p<percent> columns
+            key_name: Name of the index
+
+        Returns:
+            DataFrame indexed by key
+        """
+        quantiles = list(dict.fromkeys(quantiles))
+        rows: List[Dict] = []
+        for sketch in self.sketches.values():
+            row = {'count': sketch.count, 'mean': sketch.mean, 'std': sketch.std,
+                   'min': sketch.min if sketch.count else np.nan,
+                   'max': sketch.max if sketch.count else np.nan}
+            for q in quantiles:
+                row[quantile_label(q)] = sketch.quantile(q)
+            rows.append(row)
+        columns = ['count', 'mean', 'std', 'min', 'max'] + [quantile_label(q) for q in quantiles]
+        return pd.DataFrame(rows, index=pd.Index(list(self.sketches), name=key_name), columns=columns)
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+
+def quantile_label(q: float) -> str:
+    """Column label of a quantile, e.g. 0.95 -> 'p95', 0.999 -> 'p99.9'."""
+    return f"p{q * 100:g}"
@@ -0,0 +1,106 @@
+"""
+Rework analysis module for educational process mining.
+Finds repeated activities within a case on the integer-encoded log: every
+repeat is a self-loop (A → A) or a return loop (A → … → A) with the number
+of events since the previous occurrence as its distance.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+from encoded_log import EncodedLog
+
+
+def rework_events(encoded: EncodedLog) -> pd.DataFrame:
+    """
+    Repeat information for every event of the encoded log.
+
+    Args:
+        encoded: Encoded event log
+
+    Returns:
+        DataFrame in encoded event order with case and activity codes, position in the case,
+        occurrence (0 for the first occurrence of the activity in the case), distance to the
+        previous occurrence (NaN for first occurrences), and self_loop / return_loop flags
+    """
+    events = pd.DataFrame({
+        'case': encoded.case_index,
+        'activity': encoded.codes,
+        'position': np.arange(encoded.n_events) - encoded.offsets[encoded.case_index]
+    })
+    grouped = events.groupby(['case', 'activity'], sort=False)
+    events['occurrence'] = grouped.cumcount()
+    events['distance'] = grouped['position'].diff()
+    events['self_loop'] = events['distance'] == 1
+    events['return_loop'] = events['distance'] > 1
+    return events
+
+
+def analyze_rework(encoded: EncodedLog) -> Dict[str, pd.DataFrame]:
+    """
+    Rework metrics per activity and per case.
+
+    Args:
+        encoded: Encoded event log
+
+    Returns:
+        Dictionary with 'by_activity' (occurrences, cases, rework_count, rework_cases,
+        self_loops, return_loops, mean/max return distance and rework_rate per activity,
+        most reworked first) and 'by_case' (events, rework_count, reworked_activities,
+        self_loops, return_loops, mean_return_distance and rework_rate per case)
+    """
+    events = rework_events(encoded)
+    n_activities, n_cases = encoded.n_activities, encoded.n_cases
+    activity, case = events['activity'].to_numpy(), events['case'].to_numpy()
+    repeat = events['occurrence'].to_numpy() > 0
+    self_loop = events['self_loop'].to_numpy()
+    return_loop = events['return_loop'].to_numpy()
+    return_distance = np.where(return_loop, events['distance'].to_numpy(), 0)
+
+    def per_activity(weights):
+        return np.bincount(activity, weights=weights, minlength=n_activities)
+
+    def per_case(weights):
+        return np.bincount(case, weights=weights, minlength=n_cases)
+
+    # Distinct cases per activity, and the (case, activity) pairs that repeat
+    first_occurrence = ~repeat
+    second_occurrence = events['occurrence'].to_numpy() == 1
+    occurrences = per_activity(None)
+    rework_count = per_activity(repeat)
+    return_loops = per_activity(return_loop)
+    max_distance = np.zeros(n_activities)
+    np.maximum.at(max_distance, activity[return_loop], return_distance[return_loop])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        by_activity = pd.DataFrame({
+            'activity': encoded.activities,
+            'occurrences': occurrences.astype(np.int64),
+            'cases': per_activity(first_occurrence).astype(np.int64),
+            'rework_count': rework_count.astype(np.int64),
+            'rework_cases': per_activity(second_occurrence).astype(np.int64),
+            'self_loops': per_activity(self_loop).astype(np.int64),
+            'return_loops': return_loops.astype(np.int64),
+            'mean_return_distance': per_activity(return_distance) / return_loops,
+            'max_return_distance': np.where(return_loops > 0, max_distance, np.nan),
+            'rework_rate': rework_count / occurrences
+        })
+
+        case_events = encoded.case_lengths
+        case_rework = per_case(repeat)
+        case_return_loops = per_case(return_loop)
+        by_case = pd.DataFrame({
+            'case_id': encoded.case_ids,
+            'events': case_events,
+            'rework_count': case_rework.astype(np.int64),
+            'reworked_activities': per_case(second_occurrence).astype(np.int64),
+            'self_loops': per_case(self_loop).astype(np.int64),
+            'return_loops': case_return_loops.astype(np.int64),
+            'mean_return_distance': per_case(return_distance) / case_return_loops,
+            'rework_rate': case_rework / case_events
+        })
+
+    by_activity = by_activity.sort_values('rework_count', ascending=False, kind='stable').reset_index(drop=True)
+    by_case = by_case.sort_values('rework_count', ascending=False, kind='stable').reset_index(drop=True)
+    return {'by_activity': by_activity, 'by_case': by_case}
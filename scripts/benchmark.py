@@ -0,0 +1,362 @@
+"""
+Benchmark harness for the educational process mining pipeline.
+Times every stage on the bundled dataset or on a synthetic EPM-shaped
+dataset and saves the results as JSON so runs can be compared across versions.
+
+It also measures interpreter startup (`main.py --help` and a bare import of
+the analysis modules) in fresh subprocesses and fails when the CLI startup
+exceeds its budget.
+
+Usage:
+    python scripts/benchmark.py --students 200 --sessions 6 --events 450
+    python scripts/benchmark.py --dataset "EPM Dataset 2" --compare output/benchmarks/baseline.json
+    python scripts/benchmark.py --stages --startup-budget 0.5
+    python scripts/benchmark.py --dataset "EPM Dataset 2" --stages --parser
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from synthetic_epm import generate_dataset
+
+STAGES = ['load', 'event_log', 'metrics', 'patterns', 'discovery', 'conformance', 'bottlenecks']
+
+# Commands timed in a fresh interpreter; only 'cli_help' is held to the startup budget
+STARTUP_COMMANDS = {
+    'cli_help': [sys.executable, 'main.py', '--help'],
+    'import_pipeline': [sys.executable, '-c',
+                        'import data_preprocessing, process_discovery, performance_analysis, conformance_checking']
+}
+STARTUP_BUDGET_SECONDS = 0.5
+
+
+def _run_stage(name: str, state: dict, work_dir: str):
+    """Run one pipeline stage, reading its inputs from and writing its outputs to state."""
+    if name == 'load':
+        from data_preprocessing import EPMDataProcessor
+        processor = EPMDataProcessor(state['dataset_path'])
+        state['raw_data'] = processor.load_all_data()
+        return state['raw_data']
+
+    if name == 'event_log':
+        from data_preprocessing import EPMDataProcessor
+        processor = EPMDataProcessor(state['dataset_path'])
+        event_log = processor.create_event_log(state['raw_data'])
+        state['quality_log'] = processor.filter_by_criteria(
+            event_log, min_events_per_case=10, exclude_activities=['Blank', 'Other']
+        )
+        return state['quality_log']
+
+    if name == 'metrics':
+        from performance_analysis import PerformanceAnalysis
+        return PerformanceAnalysis(work_dir).calculate_case_metrics(state['quality_log'])
+
+    if name == 'patterns':
+        from dashboard.interpreters.pattern_analyzer import analyze_patterns
+        return analyze_patterns(state['quality_log'])
+
+    if name == 'discovery':
+        from process_discovery import ProcessDiscovery
+        discovery = ProcessDiscovery(work_dir)
+        log = discovery.create_pm4py_log(state['quality_log'])
+        discovery.discover_dfg(log)
+        discovery.discover_inductive_model(log)
+        return discovery.analyze_process_variants(state['quality_log'])
+
+    if name == 'conformance':
+        from conformance_checking import ConformanceChecker
+        checker = ConformanceChecker(work_dir)
+        reference = checker.define_reference_model()
+        sequence = checker.calculate_sequence_conformance(state['quality_log'], reference)
+        behavioral = checker.calculate_behavioral_conformance(state['quality_log'], reference)
+        return checker.identify_deviations(sequence, behavioral)
+
+    if name == 'bottlenecks':
+        from dashboard.interpreters.bottleneck_detector import detect_bottlenecks
+        return detect_bottlenecks(state['quality_log'])
+
+    raise ValueError(f"Unknown stage: {name}")
+
+
+def _row_count(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def run_benchmarks(dataset_path: str, stages: list, repeat: int = 1, verbose: bool = False) -> dict:
+    """
+    Time each pipeline stage.
+
+    Args:
+        dataset_path: EPM dataset root
+        stages: Stages to run, in pipeline order
+        repeat: Number of timed repetitions per stage
+        verbose: Show the pipeline's own progress output
+
+    Returns:
+        Dictionary with per-stage timings
+    """
+    state = {'dataset_path': dataset_path}
+    results = {}
+
+    # Every stage needs the inputs produced by the stages before it
+    required = STAGES[:max(STAGES.index(s) for s in stages) + 1]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in required:
+            timed = name in stages
+            wall_times, cpu_times = [], []
+            for _ in range(repeat if timed else 1):
+                output = io.StringIO()
+                redirect = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(output)
+                with redirect:
+                    wall_start, cpu_start = time.perf_counter(), time.process_time()
+                    result = _run_stage(name, state, work_dir)
+                    wall_times.append(time.perf_counter() - wall_start)
+                    cpu_times.append(time.process_time() - cpu_start)
+
+            if timed:
+                results[name] = {
+                    'wall_seconds': min(wall_times),
+                    'cpu_seconds': min(cpu_times),
+                    'all_wall_seconds': wall_times,
+                    'rows': _row_count(result)
+                }
+                print(f"  {name:<12} {min(wall_times):9.3f}s wall  {min(cpu_times):9.3f}s cpu  rows={_row_count(result)}")
+
+    return results
+
+
+def measure_startup(repeat: int = 3, budget: float = STARTUP_BUDGET_SECONDS) -> dict:
+    """
+    Time the startup commands in fresh subprocesses.
+
+    Args:
+        repeat: Number of launches per command (minimum is reported)
+        budget: Maximum allowed wall time for `main.py --help`, in seconds
+
+    Returns:
+        Dictionary with per-command timings and the budget verdict
+    """
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        wall_times = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=REPO_ROOT, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            wall_times.append(time.perf_counter() - start)
+
+        results[name] = {'wall_seconds': min(wall_times), 'all_wall_seconds': wall_times}
+        if name == 'cli_help':
+            results[name]['budget_seconds'] = budget
+            results[name]['within_budget'] = min(wall_times) <= budget
+        verdict = ""
+        if 'within_budget' in results[name]:
+            verdict = "  (within budget)" if results[name]['within_budget'] else f"  <-- over {budget:.2f}s budget"
+        print(f"  {name:<16} {min(wall_times):9.3f}s wall{verdict}")
+
+    return results
+
+
+def _legacy_read_files(paths: list):
+    """The per-file read_csv + to_datetime path the EPM parser replaced, kept as a baseline."""
+    import pandas as pd
+    from epm_parser import RAW_COLUMNS
+
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path, header=None, names=RAW_COLUMNS)
+        df['start_time'] = pd.to_datetime(df['start_time'], format='%d.%m.%Y %H:%M:%S', errors='coerce')
+        df['end_time'] = pd.to_datetime(df['end_time'], format='%d.%m.%Y %H:%M:%S', errors='coerce')
+        df['duration'] = (df['end_time'] - df['start_time']).dt.total_seconds()
+        df['case_id'] = f"Student_{os.path.basename(path)}_Session_{df['session'].iloc[0]}"
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def benchmark_parser(dataset_path: str, repeat: int = 1) -> dict:
+    """
+    Compare raw-file parsing throughput of the EPM parser against the legacy path.
+
+    Args:
+        dataset_path: EPM dataset root
+        repeat: Number of timed repetitions (minimum is reported)
+
+    Returns:
+        Dictionary with seconds, rows per second and parsed timestamps per parser
+    """
+    from dataset_manifest import DatasetManifest
+    from epm_parser import read_session_files
+
+    paths = DatasetManifest.load(dataset_path).paths()
+
+    parsers = {
+        'legacy_read_csv': _legacy_read_files,
+        'epm_parser': lambda files: read_session_files(files)[0]
+    }
+    results = {}
+    for name, parse in parsers.items():
+        wall_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            df = parse(paths)
+            wall_times.append(time.perf_counter() - start)
+        results[name] = {
+            'wall_seconds': min(wall_times),
+            'rows': len(df),
+            'rows_per_second': len(df) / min(wall_times),
+            'valid_timestamps': int(df['start_time'].notna().sum())
+        }
+        print(f"  {name:<16} {min(wall_times):9.3f}s  {len(df) / min(wall_times):12,.0f} rows/s  "
+              f"valid timestamps={results[name]['valid_timestamps']:,}/{len(df):,}")
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def _library_versions() -> dict:
+    # Read from package metadata so the (slow) libraries themselves are not imported
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {}
+    for name, distribution in [('pandas', 'pandas'), ('numpy', 'numpy'), ('pm4py', 'pm4py'),
+                               ('sklearn', 'scikit-learn')]:
+        try:
+            versions[name] = version(distribution)
+        except PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def compare_results(current: dict, baseline_path: str) -> None:
+    """Print the ratio of each stage's wall time against a previous benchmark file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\nComparison against {baseline_path} (revision {baseline['meta'].get('revision')}):")
+    for name, stats in current.get('startup', {}).items():
+        previous = baseline.get('startup', {}).get(name)
+        if previous and previous['wall_seconds']:
+            ratio = stats['wall_seconds'] / previous['wall_seconds']
+            flag = "  <-- slower" if ratio > 1.1 else ""
+            print(f"  {name:<16} {previous['wall_seconds']:9.3f}s -> {stats['wall_seconds']:9.3f}s  ({ratio:.2f}x){flag}")
+    for name, stats in current['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if not previous or not previous['wall_seconds']:
+            continue
+        ratio = stats['wall_seconds'] / previous['wall_seconds']
+        flag = "  <-- slower" if ratio > 1.1 else ""
+        print(f"  {name:<12} {previous['wall_seconds']:9.3f}s -> {stats['wall_seconds']:9.3f}s  ({ratio:.2f}x){flag}")
+
+
+def _benchmark_stages(args, stages: list):
+    """Generate or locate the dataset and time the parsers and pipeline stages on it."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        if args.dataset:
+            dataset_path = args.dataset
+            dataset_info = {'dataset_path': dataset_path}
+        else:
+            print(f"Generating synthetic dataset: {args.students} students x {args.sessions} sessions, "
+                  f"~{args.events} events per case")
+            dataset_info = generate_dataset(data_dir, args.students, args.sessions, args.events, seed=args.seed)
+            dataset_path = dataset_info['dataset_path']
+
+        parser_results = {}
+        if args.parser:
+            print("Comparing raw-file parsers...")
+            parser_results = benchmark_parser(dataset_path, repeat=args.repeat)
+
+        stage_results = {}
+        if stages:
+            print("Running benchmarks...")
+            stage_results = run_benchmarks(dataset_path, stages, repeat=args.repeat, verbose=args.verbose)
+
+    if not args.dataset:
+        dataset_info['dataset_path'] = 'synthetic'
+
+    return stage_results, parser_results, dataset_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the educational process mining pipeline")
+    parser.add_argument("--dataset", default=None, help="Existing EPM dataset to benchmark (skips generation)")
+    parser.add_argument("--students", type=int, default=100, help="Synthetic cohort size")
+    parser.add_argument("--sessions", type=int, default=6, help="Synthetic number of sessions")
+    parser.add_argument("--events", type=int, default=450, help="Synthetic mean events per student-session")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic dataset")
+    parser.add_argument("--stages", nargs="*", default=STAGES, choices=STAGES, help="Stages to time")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed repetitions per stage (minimum is reported)")
+    parser.add_argument("--output", default=os.path.join("output", "benchmarks"), help="Directory for result JSON files")
+    parser.add_argument("--compare", default=None, help="Previous result JSON to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline progress output")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="Maximum wall time in seconds for `main.py --help`")
+    parser.add_argument("--skip-startup", action="store_true", help="Do not measure interpreter startup")
+    parser.add_argument("--parser", action="store_true",
+                        help="Compare raw-file parsing throughput against the legacy read_csv path")
+    args = parser.parse_args()
+
+    stages = [s for s in STAGES if s in args.stages]
+
+    startup_results = {}
+    if not args.skip_startup:
+        print("Measuring startup...")
+        startup_results = measure_startup(repeat=max(args.repeat, 3), budget=args.startup_budget)
+
+    if not stages and not args.parser:
+        stage_results, parser_results, dataset_info = {}, {}, None
+    else:
+        stage_results, parser_results, dataset_info = _benchmark_stages(args, stages)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'libraries': _library_versions(),
+            'dataset': dataset_info,
+            'repeat': args.repeat
+        },
+        'startup': startup_results,
+        'parser': parser_results,
+        'stages': stage_results
+    }
+
+    os.makedirs(args.output, exist_ok=True)
+    result_path = os.path.join(args.output, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {result_path}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+    if not startup_results.get('cli_help', {}).get('within_budget', True):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
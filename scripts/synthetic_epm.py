@@ -0,0 +1,143 @@
+"""
+Synthetic EPM dataset generator.
+Writes Data/Processes/Session N/<student> trees in the raw 13-column EPM
+format so the pipeline can be benchmarked at arbitrary cohort sizes.
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Activities tied to an exercise get an "_<session>_<exercise>" suffix, as in the real logs
+EXERCISE_ACTIVITIES = ['Study_Es', 'Deeds_Es', 'TextEditor_Es', 'FSM_Es']
+GENERIC_ACTIVITIES = ['Deeds', 'TextEditor', 'Diagram', 'Properties', 'Study_Materials',
+                      'FSM_Related', 'Aulaweb', 'Blank', 'Other']
+
+# Relative activity frequencies, roughly matching the EPM dataset
+ACTIVITY_WEIGHTS = {
+    'Study_Es': 0.09, 'Deeds_Es': 0.16, 'TextEditor_Es': 0.16, 'FSM_Es': 0.07,
+    'Deeds': 0.01, 'TextEditor': 0.02, 'Diagram': 0.09, 'Properties': 0.08,
+    'Study_Materials': 0.01, 'FSM_Related': 0.01, 'Aulaweb': 0.04, 'Blank': 0.11, 'Other': 0.15
+}
+
+EXERCISES_PER_SESSION = 6
+FIRST_SESSION_DATE = datetime(2014, 10, 2, 11, 0, 0)
+
+
+def format_timestamp(ts: datetime) -> str:
+    """Format a timestamp like the raw logs: d.m.Y H:M:S without zero padding."""
+    return f"{ts.day}.{ts.month}.{ts.year} {ts.hour}:{ts.minute}:{ts.second}"
+
+
+def generate_student_file(rng: np.random.Generator, session: int, student_id: int,
+                          n_events: int) -> str:
+    """
+    Generate the raw log of one student in one session.
+
+    Args:
+        rng: Random generator
+        session: Session number
+        student_id: Student ID
+        n_events: Number of events to generate
+
+    Returns:
+        File contents in the raw EPM format
+    """
+    activities = list(ACTIVITY_WEIGHTS)
+    weights = np.array(list(ACTIVITY_WEIGHTS.values()))
+    chosen = rng.choice(len(activities), size=n_events, p=weights / weights.sum())
+
+    # Students progress through the exercises of the session in order
+    exercise = np.minimum(
+        np.sort(rng.integers(1, EXERCISES_PER_SESSION + 1, size=n_events)), EXERCISES_PER_SESSION
+    )
+    durations = rng.integers(0, 60, size=n_events)
+    gaps = rng.integers(1, 4, size=n_events)
+    offsets = np.concatenate([[0], np.cumsum(durations + gaps)[:-1]])
+    counters = rng.poisson([3000, 1, 0.1, 4, 0.2, 150, 5], size=(n_events, 7))
+
+    session_start = (FIRST_SESSION_DATE + timedelta(weeks=session - 1)
+                     + timedelta(seconds=int(rng.integers(0, 900))))
+
+    lines = []
+    for i in range(n_events):
+        activity = activities[chosen[i]]
+        exercise_name = f"Es_{session}_{exercise[i]}"
+        if activity in EXERCISE_ACTIVITIES:
+            activity = f"{activity}_{session}_{exercise[i]}"
+        start = session_start + timedelta(seconds=int(offsets[i]))
+        end = start + timedelta(seconds=int(durations[i]))
+        fields = [session, student_id, exercise_name, activity,
+                  format_timestamp(start), format_timestamp(end), *counters[i]]
+        lines.append(", ".join(str(f) for f in fields))
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_dataset(output_dir: str, n_students: int = 100, n_sessions: int = 6,
+                     events_per_case: int = 450, attendance: float = 0.85,
+                     seed: int = 42) -> dict:
+    """
+    Write a synthetic EPM dataset.
+
+    Args:
+        output_dir: Dataset root (the equivalent of "EPM Dataset 2")
+        n_students: Number of students in the cohort
+        n_sessions: Number of lab sessions
+        events_per_case: Mean number of events per student-session
+        attendance: Probability that a student attended a session
+        seed: Random seed
+
+    Returns:
+        Dictionary describing the generated dataset
+    """
+    rng = np.random.default_rng(seed)
+    processes_path = os.path.join(output_dir, "Data", "Processes")
+    presence = rng.random((n_students, n_sessions)) < attendance
+
+    total_events = 0
+    for session in range(1, n_sessions + 1):
+        session_path = os.path.join(processes_path, f"Session {session}")
+        os.makedirs(session_path, exist_ok=True)
+        for student_id in range(1, n_students + 1):
+            if not presence[student_id - 1, session - 1]:
+                continue
+            n_events = max(2, int(rng.poisson(events_per_case)))
+            content = generate_student_file(rng, session, student_id, n_events)
+            with open(os.path.join(session_path, str(student_id)), "w", encoding="utf-8") as f:
+                f.write(content)
+            total_events += n_events
+
+    # Student x session presence matrix, in the same layout as the real logs.txt
+    header = "Student Id\t" + "\t".join(f"Session {s}" for s in range(1, n_sessions + 1))
+    rows = [f"{sid}\t" + "\t".join(str(int(p)) for p in presence[sid - 1])
+            for sid in range(1, n_students + 1)]
+    with open(os.path.join(output_dir, "Data", "logs.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join([header] + rows) + "\n")
+
+    return {
+        'dataset_path': output_dir,
+        'students': n_students,
+        'sessions': n_sessions,
+        'cases': int(presence.sum()),
+        'events': total_events
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic EPM-shaped dataset")
+    parser.add_argument("--output", default="synthetic_epm", help="Dataset root directory to write")
+    parser.add_argument("--students", type=int, default=100, help="Number of students")
+    parser.add_argument("--sessions", type=int, default=6, help="Number of sessions")
+    parser.add_argument("--events", type=int, default=450, help="Mean events per student-session")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    info = generate_dataset(args.output, args.students, args.sessions, args.events, seed=args.seed)
+    print(f"Generated {info['events']:,} events in {info['cases']} student-session files under {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Checks IncrementalDFG updates (adding and removing cases, appending events,
+combining graphs) against a directly-follows graph counted with pandas.
+
+Usage:
+    python scripts/test_incremental_dfg.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from encoded_log import EncodedLog
+from incremental_dfg import IncrementalDFG
+
+
+def pandas_dfg(df):
+    """(dfg, start_activities, end_activities) of a log, from shifted columns."""
+    ordered = df.sort_values(['case:concept:name', 'time:timestamp'])
+    case, activity = ordered['case:concept:name'], ordered['concept:name']
+    following = activity.shift(-1)
+    same_case = case.eq(case.shift(-1))
+    dfg = pd.DataFrame({'source': activity[same_case], 'target': following[same_case]}).value_counts()
+    starts = ordered.groupby('case:concept:name')['concept:name'].first().value_counts()
+    ends = ordered.groupby('case:concept:name')['concept:name'].last().value_counts()
+    return ({pair: int(count) for pair, count in dfg.items()},
+            {a: int(c) for a, c in starts.items()}, {a: int(c) for a, c in ends.items()})
+
+
+rng = np.random.default_rng(17)
+n_events = 3000
+log = pd.DataFrame({
+    'case:concept:name': rng.choice([f"case_{i}" for i in range(120)], n_events),
+    'concept:name': rng.choice(list("ABCDEFGH"), n_events),
+    'time:timestamp': pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.permutation(n_events), unit="s")
+})
+
+assert IncrementalDFG.from_dataframe(log).to_dicts() == pandas_dfg(log)
+print("full graph matches")
+
+# Cases added in batches, then some removed again
+encoded = EncodedLog.from_dataframe(log)
+graph = IncrementalDFG(encoded.activities)
+for start in range(0, encoded.n_cases, 25):
+    graph.add_cases(encoded, slice(start, start + 25))
+assert graph.to_dicts() == pandas_dfg(log)
+removed = np.arange(0, encoded.n_cases, 3)
+graph.remove_cases(encoded, removed)
+assert graph.to_dicts() == pandas_dfg(log[~log['case:concept:name'].isin(encoded.case_ids[removed])])
+assert graph.n_cases == encoded.n_cases - len(removed)
+print("batched adds and removals match")
+
+# Events appended to running cases: the graph of the earlier events plus the later ones
+cutoff = log['time:timestamp'].quantile(0.6)
+earlier = log[log['time:timestamp'] < cutoff]
+later = log[log['time:timestamp'] >= cutoff].sort_values('time:timestamp')
+graph = IncrementalDFG.from_dataframe(earlier)
+for rows in np.array_split(np.arange(len(later)), 4):
+    # Every chunk is later than the previous one, as in a live log
+    graph.append_events(later.iloc[rows])
+assert graph.to_dicts() == pandas_dfg(log)
+print("appended events match")
+
+# Graphs over disjoint case sets (e.g. sessions) add up to the graph of their union
+first_half = log['case:concept:name'].isin([f"case_{i}" for i in range(60)])
+combined = IncrementalDFG.combine([IncrementalDFG.from_dataframe(log[first_half]),
+                                   IncrementalDFG.from_dataframe(log[~first_half])])
+assert combined.to_dicts() == pandas_dfg(log)
+print("combined graphs match")
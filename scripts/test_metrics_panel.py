@@ -1,7 +1,7 @@
 from datetime import datetime
 try:
-    # Backward compatibility: if a fixed module existed before
-    from dashboard.components.metrics_panel_fixed import calculate_process_metrics  # type: ignore
+    # The metrics panel implementation lives in dashboard.components.metrics_panel
+    from dashboard.components.metrics_panel import calculate_process_metrics  # type: ignore
 except Exception:
     # Fallback to current API if available or provide a stub for smoke testing
     def calculate_process_metrics(log):
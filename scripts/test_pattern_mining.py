@@ -0,0 +1,63 @@
+"""
+Checks EncodedLog and the n-gram miner against plain pandas/Python counting
+on a small random log.
+
+Usage:
+    python scripts/test_pattern_mining.py
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from encoded_log import EncodedLog
+from pattern_mining import NGramMiner
+
+rng = np.random.default_rng(7)
+n_events = 2000
+log = pd.DataFrame({
+    'case:concept:name': rng.choice([f"case_{i}" for i in range(80)], n_events),
+    'concept:name': rng.choice(list("ABCDEFG"), n_events, p=[0.3, 0.2, 0.15, 0.15, 0.1, 0.05, 0.05]),
+    # Distinct timestamps, so the order within a case is unambiguous
+    'time:timestamp': pd.Timestamp("2025-01-01 09:00") + pd.to_timedelta(rng.permutation(n_events), unit="s")
+})
+# Events without an activity cannot be placed in a trace
+log.loc[rng.choice(n_events, 20, replace=False), 'concept:name'] = None
+
+# Naive traces: sort the events of every case by time
+ordered = log.dropna(subset=['concept:name']).sort_values(['case:concept:name', 'time:timestamp'])
+traces = ordered.groupby('case:concept:name')['concept:name'].apply(tuple).to_dict()
+
+encoded = EncodedLog.from_dataframe(log)
+assert encoded.n_events == len(ordered)
+assert sorted(encoded.activities) == sorted(ordered['concept:name'].unique())
+for case in range(encoded.n_cases):
+    assert tuple(encoded.decode(encoded.trace(case))) == traces.get(encoded.case_ids[case], ())
+print("encoded traces match:", encoded.n_cases, "cases,", encoded.n_events, "events")
+
+# One length past the longest packed key, to cover the unpacked fallback
+miner = NGramMiner(encoded)
+lengths = [2, 3, 4, 5, miner.max_packed_n + 1]
+mined = miner.mine(n_values=lengths, top_k=None)
+for n in lengths:
+    frequency, support = Counter(), Counter()
+    for trace in traces.values():
+        windows = [trace[i:i + n] for i in range(len(trace) - n + 1)]
+        frequency.update(windows)
+        support.update(set(windows))
+    expected = {pattern: (frequency[pattern], support[pattern]) for pattern in frequency}
+    actual = {row.pattern: (row.frequency, row.support) for row in mined[n].itertuples(index=False)}
+    assert actual == expected, f"n={n}"
+    assert mined[n]['frequency'].is_monotonic_decreasing
+    print(f"{n}-grams match:", len(expected), "patterns")
+
+# min_support keeps the patterns found in at least that many cases
+frequent = miner.mine(n_values=[3], top_k=None, min_support=5)[3]
+assert set(frequent['pattern']) == set(mined[3].loc[mined[3]['support'] >= 5, 'pattern'])
+print("min_support filter matches")
@@ -0,0 +1,60 @@
+"""
+Checks QuantileSketch and KeyedSketches, built in batches and merged, against
+numpy and pandas statistics computed on all values at once.
+
+Usage:
+    python scripts/test_quantile_sketch.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from quantile_sketch import KeyedSketches, QuantileSketch
+
+accuracy = 0.01
+rng = np.random.default_rng(13)
+# Durations in seconds around a large offset (where raw power sums lose precision), plus zeros and negatives
+values = np.concatenate([1e6 + rng.lognormal(3, 1.5, 20000), np.zeros(50), -rng.lognormal(1, 1, 200)])
+rng.shuffle(values)
+
+# One sketch per batch, merged, as the per-worker and per-batch accumulators do
+merged = QuantileSketch(accuracy)
+for batch in np.array_split(values, 7):
+    merged.merge(QuantileSketch(accuracy).add(batch))
+single = QuantileSketch(accuracy).add(values)
+
+assert merged.positive == single.positive and merged.negative == single.negative
+assert merged.zero_count == single.zero_count == 50
+assert merged.count == len(values)
+assert merged.min == values.min() and merged.max == values.max()
+assert np.isclose(merged.mean, values.mean(), rtol=1e-12)
+assert np.isclose(merged.std, values.std(ddof=1), rtol=1e-9)
+print("merged counts, mean and std match numpy")
+
+# Every estimate is within the relative accuracy of the value at its rank
+ordered = np.sort(values)
+for q in [0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999]:
+    exact = ordered[int(q * (len(values) - 1))]
+    assert abs(merged.quantile(q) - exact) <= accuracy * abs(exact) + 1e-12, q
+print("quantiles within", accuracy, "relative error")
+
+# Keyed sketches against a pandas groupby
+frame = pd.DataFrame({'key': rng.choice(list("abcd"), len(values)), 'value': values})
+frame.loc[rng.choice(len(frame), 30, replace=False), 'value'] = np.nan
+keyed = KeyedSketches(accuracy)
+for rows in np.array_split(np.arange(len(frame)), 5):
+    batch = frame.iloc[rows]
+    keyed.merge(KeyedSketches(accuracy).add(batch['key'], batch['value']))
+summary = keyed.summary(quantiles=[0.5]).sort_index()
+expected = frame.groupby('key')['value'].agg(['count', 'mean', 'std', 'min', 'max'])
+pd.testing.assert_frame_equal(summary[expected.columns], expected, check_dtype=False, check_names=False, rtol=1e-9)
+for key, group in frame.dropna().groupby('key'):
+    exact = np.sort(group['value'].to_numpy())[int(0.5 * (len(group) - 1))]
+    assert abs(summary.loc[key, 'p50'] - exact) <= accuracy * abs(exact)
+print("keyed summaries match pandas")
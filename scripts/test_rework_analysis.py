@@ -0,0 +1,81 @@
+"""
+Checks the rework analysis against a per-trace Python walk on a small random log.
+
+Usage:
+    python scripts/test_rework_analysis.py
+"""
+
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from encoded_log import EncodedLog
+from rework_analysis import analyze_rework
+
+rng = np.random.default_rng(3)
+rows = []
+for case in range(150):
+    trace = rng.choice(list("ABCDE"), rng.integers(1, 15), p=[0.4, 0.2, 0.2, 0.1, 0.1])
+    for position, activity in enumerate(trace):
+        rows.append((f"case_{case}", activity, pd.Timestamp("2025-01-01") + pd.Timedelta(minutes=position)))
+log = pd.DataFrame(rows, columns=['case:concept:name', 'concept:name', 'time:timestamp'])
+traces = log.groupby('case:concept:name', sort=False)['concept:name'].apply(list)
+
+# Every repeat of an activity in a case, with the events since its previous occurrence
+per_activity = defaultdict(lambda: defaultdict(int))
+per_activity_distances = defaultdict(list)
+per_case = {}
+for case_id, trace in traces.items():
+    last_seen, case_row, case_distances = {}, defaultdict(int), []
+    counts = pd.Series(trace).value_counts()
+    for position, activity in enumerate(trace):
+        per_activity[activity]['occurrences'] += 1
+        if activity in last_seen:
+            distance = position - last_seen[activity]
+            per_activity[activity]['rework_count'] += 1
+            case_row['rework_count'] += 1
+            if distance == 1:
+                per_activity[activity]['self_loops'] += 1
+                case_row['self_loops'] += 1
+            else:
+                per_activity[activity]['return_loops'] += 1
+                per_activity_distances[activity].append(distance)
+                case_row['return_loops'] += 1
+                case_distances.append(distance)
+        last_seen[activity] = position
+    for activity, count in counts.items():
+        per_activity[activity]['cases'] += 1
+        per_activity[activity]['rework_cases'] += int(count > 1)
+    case_row['events'] = len(trace)
+    case_row['reworked_activities'] = int((counts > 1).sum())
+    case_row['mean_return_distance'] = np.mean(case_distances) if case_distances else np.nan
+    per_case[case_id] = case_row
+
+rework = analyze_rework(EncodedLog.from_dataframe(log))
+
+by_activity = rework['by_activity'].set_index('activity')
+for activity, expected in per_activity.items():
+    row = by_activity.loc[activity]
+    for column in ['occurrences', 'cases', 'rework_count', 'rework_cases', 'self_loops', 'return_loops']:
+        assert row[column] == expected[column], (activity, column)
+    distances = per_activity_distances[activity]
+    assert np.isclose(row['mean_return_distance'], np.mean(distances) if distances else np.nan, equal_nan=True)
+    assert np.isclose(row['max_return_distance'], max(distances) if distances else np.nan, equal_nan=True)
+    assert np.isclose(row['rework_rate'], expected['rework_count'] / expected['occurrences'])
+assert rework['by_activity']['rework_count'].is_monotonic_decreasing
+print("rework per activity matches:", len(per_activity), "activities")
+
+by_case = rework['by_case'].set_index('case_id')
+for case_id, expected in per_case.items():
+    row = by_case.loc[case_id]
+    for column in ['events', 'rework_count', 'reworked_activities', 'self_loops', 'return_loops']:
+        assert row[column] == expected[column], (case_id, column)
+    assert np.isclose(row['mean_return_distance'], expected['mean_return_distance'], equal_nan=True)
+    assert np.isclose(row['rework_rate'], expected['rework_count'] / expected['events'])
+print("rework per case matches:", len(per_case), "cases")
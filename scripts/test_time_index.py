@@ -0,0 +1,69 @@
+"""
+Checks TimeIndex queries against pandas timestamp masks and resampling, and
+TimeIndex.extend against rebuilding the index over all rows.
+
+Usage:
+    python scripts/test_time_index.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from time_index import TimeIndex
+
+
+def random_times(rng, n, start):
+    times = pd.Series(pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, 3 * 24 * 3600, n), unit="s"))
+    # Events without a timestamp are left out of the index
+    times[rng.choice(n, n // 50, replace=False)] = pd.NaT
+    return times
+
+
+def assert_same_index(actual, expected):
+    assert actual.n_rows == expected.n_rows
+    assert np.array_equal(actual.times, expected.times)
+    assert np.array_equal(actual.order, expected.order)
+    for granularity in expected.buckets:
+        for got, want in zip(actual.buckets[granularity], expected.buckets[granularity]):
+            assert np.array_equal(got, want), granularity
+
+
+rng = np.random.default_rng(19)
+times = random_times(rng, 5000, "2025-03-01 08:00")
+index = TimeIndex(times)
+
+windows = [(None, None), ("2025-03-01 12:00", "2025-03-02 12:00"), ("2025-03-02 09:30:15", None),
+           (None, "2025-03-01 08:00"), ("2025-03-05", "2025-03-06")]
+for start, end in windows:
+    inside = times.notna()
+    if start is not None:
+        inside &= times >= pd.Timestamp(start)
+    if end is not None:
+        inside &= times < pd.Timestamp(end)
+    assert index.count(start, end) == inside.sum(), (start, end)
+    assert np.array_equal(index.rows(start, end), np.flatnonzero(inside)), (start, end)
+
+    selected = times[inside]
+    expected_hours = selected.dt.hour.value_counts().reindex(range(24), fill_value=0).to_numpy()
+    assert np.array_equal(index.hour_of_day_counts(start, end), expected_hours), (start, end)
+    for granularity, unit in [("minute", "min"), ("hour", "h"), ("day", "D")]:
+        expected = selected.dt.floor(unit).value_counts().sort_index()
+        timeline = index.timeline(granularity, start, end)
+        assert np.array_equal(timeline.index.to_numpy(), expected.index.to_numpy()), (granularity, start, end)
+        assert np.array_equal(timeline.to_numpy(), expected.to_numpy()), (granularity, start, end)
+print("counts, rows, hourly histograms and timelines match pandas")
+
+# Appending later rows (the live case) and earlier rows (a re-sort) both equal a rebuild
+later = random_times(rng, 1000, "2025-03-04 08:00")
+earlier = random_times(rng, 1000, "2025-02-27 08:00")
+extended = TimeIndex(times).extend(later)
+assert_same_index(extended, TimeIndex(pd.concat([times, later], ignore_index=True)))
+extended.extend(earlier)
+assert_same_index(extended, TimeIndex(pd.concat([times, later, earlier], ignore_index=True)))
+print("extend matches a rebuilt index")
@@ -0,0 +1,72 @@
+"""
+Checks VariantIndex against grouping the traces with plain pandas/Python
+on a small random log with repeated variants.
+
+Usage:
+    python scripts/test_variant_index.py
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from variant_index import VariantIndex
+
+rng = np.random.default_rng(11)
+# Traces drawn from a few templates, some with one activity replaced, so variants share prefixes
+templates = [list("ABCD"), list("ABCE"), list("ABD"), list("AFFG"), list("B")]
+rows = []
+for case in range(300):
+    trace = list(templates[rng.integers(len(templates))])
+    if rng.random() < 0.3:
+        trace[rng.integers(len(trace))] = rng.choice(list("ABCDEFG"))
+    for position, activity in enumerate(trace):
+        rows.append((f"case_{case}", activity, pd.Timestamp("2025-01-01") + pd.Timedelta(minutes=position)))
+# Rows shuffled: the index orders every case by timestamp
+log = pd.DataFrame(rows, columns=['case:concept:name', 'concept:name', 'time:timestamp'])
+log = log.sample(frac=1, random_state=3).reset_index(drop=True)
+
+traces = (log.sort_values(['case:concept:name', 'time:timestamp'])
+          .groupby('case:concept:name')['concept:name'].apply(tuple))
+variant_counts = Counter(traces)
+
+index = VariantIndex.from_dataframe(log)
+assert index.n_cases == len(traces) and index.n_variants == len(variant_counts)
+
+top = index.top_variants(k=None)
+assert dict(zip(top['variant'], top['count'])) == variant_counts
+assert list(top['count']) == sorted(variant_counts.values(), reverse=True)
+assert list(index.top_variants(k=3)['count']) == sorted(variant_counts.values(), reverse=True)[:3]
+print("variant counts match:", index.n_variants, "variants")
+
+for prefix in [(), ('A',), ('A', 'B'), ('A', 'B', 'C'), ('Z',)]:
+    below = {v: c for v, c in variant_counts.items() if v[:len(prefix)] == prefix}
+    top = index.top_variants(k=None, prefix=list(prefix))
+    assert dict(zip(top['variant'], top['count'])) == below, prefix
+
+    next_counts = Counter()
+    for variant, count in below.items():
+        if len(variant) > len(prefix):
+            next_counts[variant[len(prefix)]] += count
+    children = index.children(list(prefix))
+    assert dict(zip(children['activity'], children['cases'])) == next_counts, prefix
+
+    starts = traces.map(lambda trace: trace[:len(prefix)] == prefix).reindex(index.encoded.case_ids)
+    assert (index.case_mask(prefix=list(prefix)) == starts.to_numpy()).all(), prefix
+print("prefix queries match")
+
+coverage = index.coverage_curve()
+assert list(coverage['count']) == sorted(variant_counts.values(), reverse=True)
+assert index.variants_for_coverage(1.0) == len(variant_counts)
+
+# Filtering by variant keeps exactly the rows of the cases with that trace
+chosen = [variant for variant, _ in variant_counts.most_common(2)]
+expected_rows = log[log['case:concept:name'].map(traces).isin(chosen)]
+assert index.filter(log, variants=[list(v) for v in chosen]).index.equals(expected_rows.index)
+print("coverage and variant filter match")
@@ -0,0 +1,234 @@
+"""
+Student clustering module for educational process mining.
+Groups student sessions with similar learning behaviours and persists the
+fitted model so that new sessions can be assigned without refitting.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Case-level features used to characterise learning behaviour
+CLUSTER_FEATURES = [
+    'total_duration_hours', 'activity_diversity', 'total_clicks',
+    'total_keystrokes', 'deeds_time_ratio', 'study_time_ratio', 'texteditor_time_ratio'
+]
+
+
+def _make_model(k: int, use_minibatch: bool, random_state: int):
+    """Unfitted clustering model with k clusters."""
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if use_minibatch:
+        return MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3)
+    return KMeans(n_clusters=k, random_state=random_state, n_init=10)
+
+
+def _silhouette_for_k(scaled_data: np.ndarray, k: int, use_minibatch: bool,
+                      random_state: int, sample_size: Optional[int]) -> Tuple[float, object, np.ndarray]:
+    """Fit a model with k clusters; return its silhouette score, the fitted model and its labels."""
+    from sklearn.metrics import silhouette_score
+
+    model = _make_model(k, use_minibatch, random_state)
+    labels = model.fit_predict(scaled_data)
+
+    if len(np.unique(labels)) < 2:
+        return -1.0, model, labels
+    score = float(silhouette_score(scaled_data, labels, sample_size=sample_size,
+                                   random_state=random_state))
+    return score, model, labels
+
+
+class StudentClustering:
+    """Clustering engine for case-level student metrics."""
+
+    def __init__(self, feature_cols: List[str] = None, max_clusters: int = 8,
+                 minibatch_threshold: int = 5000, n_jobs: int = -1,
+                 silhouette_sample_size: int = 10000, random_state: int = 42):
+        """
+        Initialize the clustering engine.
+
+        Args:
+            feature_cols: Metric columns to cluster on (defaults to CLUSTER_FEATURES)
+            max_clusters: Upper bound for automatic k selection
+            minibatch_threshold: Number of cases from which MiniBatchKMeans is used
+            n_jobs: Parallel workers for silhouette-based k selection (-1 = all cores)
+            silhouette_sample_size: Maximum cases sampled when scoring a candidate k
+            random_state: Seed for reproducible clustering
+        """
+        self.feature_cols = feature_cols or CLUSTER_FEATURES
+        self.max_clusters = max_clusters
+        self.minibatch_threshold = minibatch_threshold
+        self.n_jobs = n_jobs
+        self.silhouette_sample_size = silhouette_sample_size
+        self.random_state = random_state
+
+        self.features_used: List[str] = []
+        self.scaler = None
+        self.model = None
+        self.silhouette_scores: Dict[int, float] = {}
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.model is not None
+
+    @property
+    def n_clusters(self) -> int:
+        return int(self.model.n_clusters) if self.model is not None else 0
+
+    def _prepare(self, metrics_df: pd.DataFrame) -> np.ndarray:
+        return metrics_df[self.features_used].fillna(0).to_numpy(dtype=np.float64)
+
+    def select_k(self, scaled_data: np.ndarray, candidates: List[int]) -> Dict[int, Tuple[float, object, np.ndarray]]:
+        """
+        Score candidate cluster counts by silhouette, in parallel across cores.
+
+        Args:
+            scaled_data: Standardised feature matrix
+            candidates: Cluster counts to evaluate
+
+        Returns:
+            Dictionary mapping k to (silhouette score, fitted model, labels)
+        """
+        from joblib import Parallel, delayed
+
+        use_minibatch = len(scaled_data) >= self.minibatch_threshold
+        sample_size = self.silhouette_sample_size if len(scaled_data) > self.silhouette_sample_size else None
+
+        fits = Parallel(n_jobs=self.n_jobs)(
+            delayed(_silhouette_for_k)(scaled_data, k, use_minibatch, self.random_state, sample_size)
+            for k in candidates
+        )
+        return dict(zip(candidates, fits))
+
+    def fit(self, metrics_df: pd.DataFrame, n_clusters: int = None) -> np.ndarray:
+        """
+        Fit the scaler and clustering model on case metrics.
+
+        Args:
+            metrics_df: DataFrame with case metrics
+            n_clusters: Fixed number of clusters; selected by silhouette when None
+
+        Returns:
+            Array with the cluster label of each case
+        """
+        from sklearn.preprocessing import StandardScaler
+
+        self.features_used = [col for col in self.feature_cols if col in metrics_df.columns]
+        if len(self.features_used) < 3:
+            raise ValueError('Insufficient features for clustering')
+
+        max_k = min(self.max_clusters, len(metrics_df) // 3)
+        if max_k < 2:
+            raise ValueError('Insufficient data for clustering')
+
+        self.scaler = StandardScaler()
+        scaled_data = self.scaler.fit_transform(self._prepare(metrics_df))
+
+        use_minibatch = len(metrics_df) >= self.minibatch_threshold
+        if n_clusters is None:
+            fits = self.select_k(scaled_data, list(range(2, max_k + 1)))
+            self.silhouette_scores = {k: score for k, (score, _, _) in fits.items()}
+            n_clusters = max(self.silhouette_scores, key=self.silhouette_scores.get)
+            # The search fitted every candidate with the final settings; keep the chosen one
+            _, self.model, labels = fits[n_clusters]
+            return labels
+
+        self.model = _make_model(n_clusters, use_minibatch, self.random_state)
+        return self.model.fit_predict(scaled_data)
+
+    def predict(self, metrics_df: pd.DataFrame) -> np.ndarray:
+        """
+        Assign cases to the clusters of an already fitted model.
+
+        Args:
+            metrics_df: DataFrame with case metrics for new sessions
+
+        Returns:
+            Array with the cluster label of each case
+        """
+        if not self.is_fitted:
+            raise ValueError('Clustering model has not been fitted')
+
+        missing = [col for col in self.features_used if col not in metrics_df.columns]
+        if missing:
+            raise ValueError(f"Metrics are missing clustering features: {missing}")
+
+        return self.model.predict(self.scaler.transform(self._prepare(metrics_df)))
+
+    def cluster_statistics(self, metrics_df: pd.DataFrame, labels: np.ndarray) -> Dict:
+        """
+        Summarise every cluster with a single grouped aggregation.
+
+        Args:
+            metrics_df: DataFrame with case metrics
+            labels: Cluster label of each case
+
+        Returns:
+            Dictionary with per-cluster statistics
+        """
+        summary_cols = ['total_duration_hours', 'total_events', 'activity_diversity']
+        stat_cols = list(dict.fromkeys(summary_cols + self.features_used))
+        stat_cols = [col for col in stat_cols if col in metrics_df.columns]
+
+        grouped = metrics_df[stat_cols].groupby(np.asarray(labels))
+        means = grouped.mean()
+        sizes = grouped.size()
+
+        cluster_analysis = {}
+        for label in means.index:
+            row = means.loc[label]
+            cluster_analysis[f'Cluster_{label}'] = {
+                'size': int(sizes.loc[label]),
+                'avg_duration': row.get('total_duration_hours', np.nan),
+                'avg_events': row.get('total_events', np.nan),
+                'avg_diversity': row.get('activity_diversity', np.nan),
+                'characteristics': {feature: row[feature] for feature in self.features_used}
+            }
+
+        return cluster_analysis
+
+    def save(self, path: str) -> None:
+        """
+        Persist the fitted scaler and model.
+
+        Args:
+            path: Destination file (joblib format)
+        """
+        import joblib
+
+        if not self.is_fitted:
+            raise ValueError('Clustering model has not been fitted')
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump({
+            'features_used': self.features_used,
+            'scaler': self.scaler,
+            'model': self.model,
+            'silhouette_scores': self.silhouette_scores
+        }, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'StudentClustering':
+        """
+        Load a previously saved clustering engine.
+
+        Args:
+            path: File written by save()
+
+        Returns:
+            Fitted StudentClustering instance
+        """
+        import joblib
+
+        state = joblib.load(path)
+        engine = cls(feature_cols=state['features_used'])
+        engine.features_used = state['features_used']
+        engine.scaler = state['scaler']
+        engine.model = state['model']
+        engine.silhouette_scores = state.get('silhouette_scores', {})
+        return engine
@@ -0,0 +1,204 @@
+"""
+Student records module for the EPM dataset.
+Loads the grade sheets and the session attendance matrix (logs.txt) once into
+tables indexed by student ID, caches the parsed tables, and joins them to the
+case-level metrics.
+"""
+
+import os
+import pickle
+import pandas as pd
+from typing import Callable, Dict
+import warnings
+warnings.filterwarnings('ignore')
+
+INTERMEDIATE_GRADES_FILE = "intermediate_grades.xlsx"
+FINAL_GRADES_FILE = "final_grades.xlsx"
+PRESENCE_FILE = "logs.txt"
+
+# Bump when the parsed table layout changes so stale caches are rebuilt
+CACHE_VERSION = 1
+
+
+def _session_number(label) -> int:
+    """Session number from a column label such as 'Session 3'."""
+    return int(str(label).split()[-1])
+
+
+def parse_intermediate_grades(path: str) -> pd.DataFrame:
+    """
+    Parse the per-session assignment grades (sessions 2 to 6).
+
+    Args:
+        path: Path of intermediate_grades.xlsx
+
+    Returns:
+        DataFrame indexed by (student_id, session) with an intermediate_grade column
+    """
+    sheet = pd.read_excel(path)
+    sheet = sheet.rename(columns={sheet.columns[0]: 'student_id'})
+    grades = sheet.melt(id_vars='student_id', var_name='session', value_name='intermediate_grade')
+    grades['session'] = grades['session'].map(_session_number)
+    return grades.astype({'student_id': 'int64'}).set_index(['student_id', 'session']).sort_index()
+
+
+def parse_final_grades(path: str) -> pd.DataFrame:
+    """
+    Parse the final exam totals of both exam dates.
+
+    Some students sat the exam twice; both totals are kept and final_grade is the better one.
+
+    Args:
+        path: Path of final_grades.xlsx
+
+    Returns:
+        DataFrame indexed by student_id
+    """
+    attempts = []
+    for attempt, sheet in enumerate(pd.read_excel(path, sheet_name=None).values(), start=1):
+        total_column = next(col for col in sheet.columns if str(col).strip().upper().startswith('TOTAL'))
+        attempts.append(
+            sheet.set_index(sheet.columns[0])[total_column].rename(f'final_grade_attempt_{attempt}')
+        )
+    grades = pd.concat(attempts, axis=1)
+    grades.index = grades.index.astype('int64').rename('student_id')
+    grades['final_exam_attempts'] = grades.notna().sum(axis=1)
+    grades['final_grade'] = grades.filter(like='final_grade_attempt_').max(axis=1)
+    return grades.sort_index()
+
+
+def parse_presence(path: str) -> pd.DataFrame:
+    """
+    Parse the student x session attendance matrix.
+
+    Args:
+        path: Path of logs.txt
+
+    Returns:
+        Boolean DataFrame indexed by student_id with one column per session number
+    """
+    presence = pd.read_csv(path, sep='\t', index_col=0)
+    presence.index = presence.index.astype('int64').rename('student_id')
+    presence.columns = [_session_number(col) for col in presence.columns]
+    return presence.astype(bool).sort_index()
+
+
+class StudentRecords:
+    """Grades and attendance of the EPM students, loaded once and cached."""
+
+    def __init__(self, dataset_path: str = "EPM Dataset 2", cache_dir: str = None):
+        """
+        Initialize the student records.
+
+        Args:
+            dataset_path: Path to the EPM dataset directory
+            cache_dir: Directory for the parsed-table cache (defaults to Data/.cache in the dataset)
+        """
+        self.data_path = os.path.join(dataset_path, "Data")
+        self.cache_dir = cache_dir or os.path.join(self.data_path, ".cache")
+        self._tables: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def intermediate_grades(self) -> pd.DataFrame:
+        """Assignment grades indexed by (student_id, session)."""
+        return self._table('intermediate_grades', INTERMEDIATE_GRADES_FILE, parse_intermediate_grades)
+
+    @property
+    def final_grades(self) -> pd.DataFrame:
+        """Final exam grades indexed by student_id."""
+        return self._table('final_grades', FINAL_GRADES_FILE, parse_final_grades)
+
+    @property
+    def presence(self) -> pd.DataFrame:
+        """Session attendance indexed by student_id, one boolean column per session."""
+        return self._table('presence', PRESENCE_FILE, parse_presence)
+
+    def _table(self, name: str, file_name: str, parser: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        """Parsed table from memory, the on-disk cache, or the source file, in that order."""
+        if name in self._tables:
+            return self._tables[name]
+
+        source = os.path.join(self.data_path, file_name)
+        if not os.path.exists(source):
+            print(f"{file_name} not found in {self.data_path}")
+            self._tables[name] = pd.DataFrame()
+            return self._tables[name]
+
+        # The cache is valid while the source file keeps its size and modification time
+        stat = os.stat(source)
+        signature = (CACHE_VERSION, stat.st_size, stat.st_mtime_ns)
+        cache_path = os.path.join(self.cache_dir, f"{name}.pkl")
+
+        table = None
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('signature') == signature:
+                table = cached['table']
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+            pass
+
+        if table is None:
+            table = parser(source)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                temp_path = f"{cache_path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    pickle.dump({'signature': signature, 'table': table}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
+            except OSError as e:
+                print(f"Could not cache {file_name}: {e}")
+
+        self._tables[name] = table
+        return table
+
+    def join_case_metrics(self, metrics_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the student's grades to each case (student-session) of the metrics.
+
+        Args:
+            metrics_df: Case-level metrics with student_id and session columns
+
+        Returns:
+            Copy of metrics_df with intermediate_grade and the final grade columns
+        """
+        if metrics_df.empty or not {'student_id', 'session'} <= set(metrics_df.columns):
+            return metrics_df.copy()
+
+        # Integer join keys; the metrics keep them as categoricals
+        keys = pd.DataFrame({
+            'student_id': pd.to_numeric(metrics_df['student_id'], errors='coerce').astype('Int64'),
+            'session': pd.to_numeric(metrics_df['session'], errors='coerce').astype('Int64')
+        }, index=metrics_df.index)
+
+        # A grade sheet may repeat a student; the first row per key is used, so the
+        # joins never add rows and their results align with the metrics by index
+        joined = metrics_df.copy()
+        intermediate = self.intermediate_grades
+        if not intermediate.empty:
+            intermediate = intermediate[~intermediate.index.duplicated()]
+            matched = keys.merge(intermediate.astype('float64'), how='left',
+                                 left_on=['student_id', 'session'], right_index=True, validate='many_to_one')
+            joined['intermediate_grade'] = matched['intermediate_grade']
+
+        final = self.final_grades
+        if not final.empty:
+            final = final[~final.index.duplicated()]
+            matched = keys[['student_id']].merge(final, how='left', left_on='student_id', right_index=True,
+                                                 validate='many_to_one')
+            for col in final.columns:
+                joined[col] = matched[col]
+
+        return joined
+
+    def summary(self) -> Dict:
+        """Counts of the students covered by each table."""
+        intermediate = self.intermediate_grades
+        return {
+            'students_with_intermediate_grades': (
+                intermediate.index.get_level_values('student_id').nunique() if not intermediate.empty else 0
+            ),
+            'students_with_final_grade': len(self.final_grades),
+            'students_in_presence_matrix': len(self.presence),
+            'attended_sessions': int(self.presence.to_numpy().sum()) if not self.presence.empty else 0
+        }
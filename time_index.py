@@ -0,0 +1,195 @@
+"""
+Time-bucketed event index for educational process mining.
+Sorts the events of a log by timestamp once and records where every
+minute, hour and day starts in that order, so time-range filters,
+hour-of-day histograms and timelines cost O(buckets) instead of O(events).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Bucket granularities and their numpy datetime units
+GRANULARITIES = {"minute": "m", "hour": "h", "day": "D"}
+
+TimeBound = Optional[object]
+
+
+def _wall_clock(timestamps) -> np.ndarray:
+    """Timestamps as tz-naive datetime64[ns] wall-clock times (what Series.dt.hour reports)."""
+    timestamps = pd.Series(timestamps)
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return timestamps.to_numpy().astype("datetime64[ns]")
+
+
+def _buckets(times: np.ndarray, unit: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Start of every non-empty bucket of sorted times, and the bucket offsets into them."""
+    keys = times.astype(f"datetime64[{unit}]")
+    if not len(keys):
+        return keys, np.zeros(1, dtype=np.int64)
+    change = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    return keys[np.r_[0, change]], np.r_[0, change, len(keys)].astype(np.int64)
+
+
+class TimeIndex:
+    """Events sorted by timestamp with bucket offsets at minute, hour and day granularity."""
+
+    def __init__(self, timestamps):
+        """
+        Sort the events and build the buckets.
+
+        Args:
+            timestamps: Event timestamps in row order (events without one are left out)
+        """
+        times = _wall_clock(timestamps)
+        self.n_rows = len(times)
+        valid = np.flatnonzero(~np.isnat(times))
+        # Row positions of the events in timestamp order, and their timestamps
+        self.order = valid[np.argsort(times[valid], kind="stable")]
+        self.times = times[self.order]
+        # granularity -> (bucket starts, offsets); only non-empty buckets are stored
+        self.buckets: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            granularity: _buckets(self.times, unit) for granularity, unit in GRANULARITIES.items()
+        }
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, timestamp_col: str = 'time:timestamp') -> 'TimeIndex':
+        """
+        Index the timestamps of an event log DataFrame.
+
+        Args:
+            df: Event log DataFrame
+            timestamp_col: Timestamp column
+
+        Returns:
+            TimeIndex whose positions are row positions of df
+        """
+        return cls(df[timestamp_col])
+
+    @property
+    def n_events(self) -> int:
+        return len(self.times)
+
+    @property
+    def start(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self.times[0]) if self.n_events else None
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self.times[-1]) if self.n_events else None
+
+    def _positions(self, start: TimeBound, end: TimeBound) -> Tuple[int, int]:
+        """Sorted positions [lo, hi) of the events in [start, end); open bounds when None."""
+        lo = 0 if start is None else int(np.searchsorted(self.times, np.datetime64(pd.Timestamp(start), "ns"), side="left"))
+        hi = self.n_events if end is None else int(np.searchsorted(self.times, np.datetime64(pd.Timestamp(end), "ns"), side="left"))
+        return lo, max(lo, hi)
+
+    def count(self, start: TimeBound = None, end: TimeBound = None) -> int:
+        """Number of events in [start, end)."""
+        lo, hi = self._positions(start, end)
+        return hi - lo
+
+    def rows(self, start: TimeBound = None, end: TimeBound = None) -> np.ndarray:
+        """
+        Row positions of the events in [start, end).
+
+        Args:
+            start: First timestamp included (default: no lower bound)
+            end: First timestamp excluded (default: no upper bound)
+
+        Returns:
+            Sorted row positions
+        """
+        lo, hi = self._positions(start, end)
+        return np.sort(self.order[lo:hi])
+
+    def filter(self, df: pd.DataFrame, start: TimeBound = None, end: TimeBound = None) -> pd.DataFrame:
+        """Rows of the indexed DataFrame with a timestamp in [start, end), in their original order."""
+        return df.iloc[self.rows(start, end)]
+
+    def _bucket_counts(self, granularity: str, start: TimeBound, end: TimeBound) -> Tuple[np.ndarray, np.ndarray]:
+        """Starts and event counts of the buckets overlapping [start, end); partial edge buckets are clipped."""
+        starts, offsets = self.buckets[granularity]
+        lo, hi = self._positions(start, end)
+        if lo == hi:
+            return starts[:0], np.zeros(0, dtype=np.int64)
+        first = int(np.searchsorted(offsets, lo, side="right")) - 1
+        last = int(np.searchsorted(offsets, hi, side="left"))
+        return starts[first:last], np.diff(np.clip(offsets[first:last + 1], lo, hi))
+
+    def timeline(self, granularity: str = "day", start: TimeBound = None, end: TimeBound = None) -> pd.Series:
+        """
+        Events per bucket over time.
+
+        Args:
+            granularity: "minute", "hour" or "day"
+            start: First timestamp included (default: no lower bound)
+            end: First timestamp excluded (default: no upper bound)
+
+        Returns:
+            Series of event counts indexed by bucket start (non-empty buckets only)
+        """
+        starts, counts = self._bucket_counts(granularity, start, end)
+        return pd.Series(counts, index=pd.DatetimeIndex(starts.astype("datetime64[ns]"), name="time"), name="events")
+
+    def hour_of_day_counts(self, start: TimeBound = None, end: TimeBound = None) -> np.ndarray:
+        """
+        Hour-of-day histogram of the events in [start, end), from the hour buckets.
+
+        Returns:
+            Array of 24 event counts, index = hour of the day
+        """
+        starts, counts = self._bucket_counts("hour", start, end)
+        hours = (starts.astype(np.int64) % 24).astype(np.int64)
+        return np.bincount(hours, weights=counts, minlength=24).astype(np.int64)
+
+    def hourly_distribution(self, start: TimeBound = None, end: TimeBound = None) -> Dict[int, int]:
+        """Events per hour of the day, as {hour: count} for the hours with events."""
+        counts = self.hour_of_day_counts(start, end)
+        return {int(hour): int(counts[hour]) for hour in np.flatnonzero(counts)}
+
+    def extend(self, timestamps) -> 'TimeIndex':
+        """
+        Index events appended to the log; their row positions continue after the indexed rows.
+
+        Events no earlier than the indexed ones (the live case) only extend the
+        tail buckets; older events make the index re-sort.
+
+        Args:
+            timestamps: Timestamps of the appended rows
+
+        Returns:
+            The index itself
+        """
+        times = _wall_clock(timestamps)
+        valid = np.flatnonzero(~np.isnat(times))
+        order = valid[np.argsort(times[valid], kind="stable")] + self.n_rows
+        new_times = times[order - self.n_rows]
+        self.n_rows += len(times)
+        if not len(new_times):
+            return self
+
+        if self.n_events and new_times[0] < self.times[-1]:
+            self.order = np.concatenate([self.order, order])
+            all_times = np.concatenate([self.times, new_times])
+            resort = np.argsort(all_times, kind="stable")
+            self.order, self.times = self.order[resort], all_times[resort]
+            self.buckets = {granularity: _buckets(self.times, unit) for granularity, unit in GRANULARITIES.items()}
+            return self
+
+        base = self.n_events
+        self.order = np.concatenate([self.order, order])
+        self.times = np.concatenate([self.times, new_times])
+        for granularity, unit in GRANULARITIES.items():
+            starts, offsets = self.buckets[granularity]
+            new_starts, new_offsets = _buckets(new_times, unit)
+            new_offsets = new_offsets + base
+            if len(starts) and new_starts[0] == starts[-1]:
+                # The first new events fall into the last indexed bucket
+                new_starts, new_offsets = new_starts[1:], new_offsets[1:]
+            self.buckets[granularity] = (np.concatenate([starts, new_starts]),
+                                         np.concatenate([offsets[:-1], new_offsets]))
+        return self
@@ -0,0 +1,317 @@
+"""
+Variant index for educational process mining.
+Stores the traces of an encoded log as a prefix trie with case counts, so that
+top-k variants, variants below a prefix, coverage curves and variant filters
+are answered from the trie instead of regrouping the event log.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from encoded_log import EncodedLog
+
+# A variant is given either by its id (the trie node where its traces end) or by its activities
+VariantKey = Union[int, Sequence[str]]
+
+
+class VariantIndex:
+    """Prefix trie over the traces of an encoded log, one node per distinct trace prefix."""
+
+    def __init__(self, encoded: EncodedLog, parent: np.ndarray, code: np.ndarray, depth: np.ndarray,
+                 case_node: np.ndarray, n_rows: Optional[int] = None):
+        """
+        Initialize the index from trie arrays; use from_encoded or from_dataframe to build one.
+
+        Args:
+            encoded: Encoded log the trie was built from
+            parent: Parent node of every node (-1 for the root, node 0)
+            code: Activity code of every node's last activity (-1 for the root)
+            depth: Prefix length of every node; nodes are numbered level by level
+            case_node: Node where every case's trace ends
+            n_rows: Number of rows of the source DataFrame, for event masks
+        """
+        self.encoded = encoded
+        self.parent = parent
+        self.code = code
+        self.depth = depth
+        self.case_node = case_node
+        self.n_rows = n_rows if n_rows is not None else len(encoded.order)
+        self.activity_lookup = {activity: i for i, activity in enumerate(encoded.activities)}
+
+        n_nodes = len(parent)
+        n_activities = max(encoded.n_activities, 1)
+        # Nodes are numbered by level and sorted by (parent, activity) within a level,
+        # so the child keys of all non-root nodes form one sorted array
+        self._child_keys = parent[1:] * n_activities + code[1:]
+
+        # Cases ending at / passing through every node, and trie subtree sizes, bottom-up by level
+        self.end_count = np.bincount(case_node, minlength=n_nodes)
+        self.prefix_count = self.end_count.copy()
+        subtree_size = np.ones(n_nodes, dtype=np.int64)
+        level_starts = np.searchsorted(depth, np.arange(depth.max() + 2 if n_nodes else 1))
+        # Nodes of prefix length d are level_starts[d]:level_starts[d + 1]
+        self.level_starts = level_starts
+        for level in range(len(level_starts) - 2, 0, -1):
+            nodes = np.arange(level_starts[level], level_starts[level + 1])
+            np.add.at(self.prefix_count, parent[nodes], self.prefix_count[nodes])
+            np.add.at(subtree_size, parent[nodes], subtree_size[nodes])
+
+        # Preorder numbers: the subtree of a node is the preorder range [preorder, preorder + size)
+        preorder = np.zeros(n_nodes, dtype=np.int64)
+        for level in range(1, len(level_starts) - 1):
+            nodes = np.arange(level_starts[level], level_starts[level + 1])
+            sizes = subtree_size[nodes]
+            before = np.cumsum(sizes) - sizes
+            first_sibling = np.r_[True, parent[nodes][1:] != parent[nodes][:-1]]
+            sibling_offset = before - np.maximum.accumulate(np.where(first_sibling, before, 0))
+            preorder[nodes] = preorder[parent[nodes]] + 1 + sibling_offset
+        self.preorder = preorder
+        self.subtree_size = subtree_size
+        self.case_preorder = preorder[case_node]
+        self.variant_ids = np.flatnonzero(self.end_count)
+
+    @classmethod
+    def from_encoded(cls, encoded: EncodedLog, n_rows: Optional[int] = None) -> 'VariantIndex':
+        """
+        Build the trie level by level: one np.unique over (parent, activity) keys per trace position.
+
+        Args:
+            encoded: Encoded event log
+            n_rows: Number of rows of the source DataFrame, for event masks
+
+        Returns:
+            VariantIndex
+        """
+        n_activities = max(encoded.n_activities, 1)
+        lengths = encoded.case_lengths
+        starts = encoded.offsets[:-1]
+
+        case_node = np.zeros(encoded.n_cases, dtype=np.int64)
+        parents, codes, depths = [np.array([-1])], [np.array([-1])], [np.array([0])]
+        next_node = 1
+        active = np.arange(encoded.n_cases)
+        position = 0
+        while True:
+            active = active[lengths[active] > position]
+            if not len(active):
+                break
+            keys = case_node[active] * n_activities + encoded.codes[starts[active] + position]
+            level_keys, inverse = np.unique(keys, return_inverse=True)
+            case_node[active] = next_node + inverse.ravel()
+            parents.append(level_keys // n_activities)
+            codes.append(level_keys % n_activities)
+            depths.append(np.full(len(level_keys), position + 1))
+            next_node += len(level_keys)
+            position += 1
+
+        return cls(encoded, np.concatenate(parents).astype(np.int64), np.concatenate(codes).astype(np.int64),
+                   np.concatenate(depths).astype(np.int64), case_node, n_rows)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, **kwargs) -> 'VariantIndex':
+        """
+        Encode an event log DataFrame and index its variants.
+
+        Args:
+            df: Event log DataFrame
+            **kwargs: Column names passed to EncodedLog.from_dataframe
+
+        Returns:
+            VariantIndex
+        """
+        return cls.from_encoded(EncodedLog.from_dataframe(df, **kwargs), n_rows=len(df))
+
+    @property
+    def n_cases(self) -> int:
+        return len(self.case_node)
+
+    @property
+    def n_variants(self) -> int:
+        return len(self.variant_ids)
+
+    def find(self, prefix: Sequence[str]) -> int:
+        """
+        Node of a trace prefix.
+
+        Args:
+            prefix: Activities of the prefix (empty for the root)
+
+        Returns:
+            Node id, or -1 if no trace starts with the prefix
+        """
+        n_activities = max(self.encoded.n_activities, 1)
+        node = 0
+        for activity in prefix:
+            code = self.activity_lookup.get(activity)
+            if code is None:
+                return -1
+            key = node * n_activities + code
+            position = np.searchsorted(self._child_keys, key)
+            if position == len(self._child_keys) or self._child_keys[position] != key:
+                return -1
+            node = position + 1
+        return node
+
+    def sequence(self, node: int) -> Tuple[str, ...]:
+        """Activities of the prefix (or variant) ending at a node."""
+        codes = []
+        while node > 0:
+            codes.append(self.code[node])
+            node = self.parent[node]
+        return tuple(self.encoded.decode(codes[::-1]))
+
+    def _variant_node(self, variant: VariantKey) -> int:
+        if isinstance(variant, (int, np.integer)):
+            return int(variant)
+        node = self.find(variant)
+        return node if node >= 0 and self.end_count[node] else -1
+
+    def _subtree_variants(self, prefix: Optional[Sequence[str]]) -> np.ndarray:
+        if not prefix:
+            return self.variant_ids
+        node = self.find(prefix)
+        if node < 0:
+            return np.array([], dtype=np.int64)
+        variant_preorder = self.preorder[self.variant_ids]
+        inside = (variant_preorder >= self.preorder[node]) & (variant_preorder < self.preorder[node] + self.subtree_size[node])
+        return self.variant_ids[inside]
+
+    def top_variants(self, k: Optional[int] = 10, prefix: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Most frequent variants, optionally only those starting with a prefix.
+
+        Args:
+            k: Number of variants (None for all)
+            prefix: Activities every returned variant starts with
+
+        Returns:
+            DataFrame with variant_id, variant (activity tuple), length, count and percentage of all cases
+        """
+        candidates = self._subtree_variants(prefix)
+        counts = self.end_count[candidates]
+        if k is not None and k < len(candidates):
+            # Partition first so only the k largest are sorted; ties keep node order
+            keep = np.argpartition(-counts, k - 1)[:k]
+            threshold = counts[keep].min()
+            keep = np.flatnonzero(counts >= threshold)
+            candidates, counts = candidates[keep], counts[keep]
+        order = np.lexsort((candidates, -counts))[:k]
+        candidates, counts = candidates[order], counts[order]
+        return pd.DataFrame({
+            'variant_id': candidates,
+            'variant': [self.sequence(node) for node in candidates],
+            'length': self.depth[candidates],
+            'count': counts,
+            'percentage': counts / max(self.n_cases, 1) * 100
+        })
+
+    def children(self, prefix: Sequence[str] = ()) -> pd.DataFrame:
+        """
+        Next activities after a prefix, for drilling down the variant hierarchy.
+
+        Args:
+            prefix: Activities of the prefix (empty for the first activities)
+
+        Returns:
+            DataFrame with activity, cases (passing through), percentage of the prefix's cases and
+            variants below it, most frequent first
+        """
+        columns = ['activity', 'cases', 'percentage', 'variants']
+        node = self.find(prefix)
+        if node < 0:
+            return pd.DataFrame(columns=columns)
+        n_activities = max(self.encoded.n_activities, 1)
+        first, last = np.searchsorted(self._child_keys, [node * n_activities, (node + 1) * n_activities])
+        nodes = np.arange(first, last) + 1
+        variant_preorder = np.sort(self.preorder[self.variant_ids])
+        variants_below = (np.searchsorted(variant_preorder, self.preorder[nodes] + self.subtree_size[nodes])
+                          - np.searchsorted(variant_preorder, self.preorder[nodes]))
+        children = pd.DataFrame({
+            'activity': self.encoded.activities[self.code[nodes]],
+            'cases': self.prefix_count[nodes],
+            'percentage': self.prefix_count[nodes] / max(self.prefix_count[node], 1) * 100,
+            'variants': variants_below
+        }, columns=columns)
+        return children.sort_values('cases', ascending=False, kind='stable').reset_index(drop=True)
+
+    def coverage_curve(self) -> pd.DataFrame:
+        """
+        Share of cases covered by the most frequent variants.
+
+        Returns:
+            DataFrame with rank (1-based), count, cumulative_cases and coverage (0-1), one row per variant
+        """
+        counts = np.sort(self.end_count[self.variant_ids])[::-1]
+        cumulative = np.cumsum(counts)
+        return pd.DataFrame({
+            'rank': np.arange(1, len(counts) + 1),
+            'count': counts,
+            'cumulative_cases': cumulative,
+            'coverage': cumulative / max(self.n_cases, 1)
+        })
+
+    def variants_for_coverage(self, coverage: float) -> int:
+        """Number of most frequent variants needed to cover a share (0-1) of the cases."""
+        cumulative = np.cumsum(np.sort(self.end_count[self.variant_ids])[::-1])
+        return int(min(np.searchsorted(cumulative, coverage * self.n_cases - 1e-9) + 1, len(cumulative)))
+
+    def case_mask(self, variants: Optional[Iterable[VariantKey]] = None,
+                  prefix: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Select cases by variant and/or trace prefix.
+
+        Args:
+            variants: Variant ids or activity sequences to keep (None keeps all)
+            prefix: Activities the kept traces start with (None keeps all)
+
+        Returns:
+            Boolean array with one entry per case code of the encoded log
+        """
+        mask = np.ones(self.n_cases, dtype=bool)
+        if variants is not None:
+            nodes = [self._variant_node(variant) for variant in variants]
+            mask &= np.isin(self.case_node, [node for node in nodes if node >= 0])
+        if prefix:
+            node = self.find(prefix)
+            if node < 0:
+                return np.zeros(self.n_cases, dtype=bool)
+            start = self.preorder[node]
+            mask &= (self.case_preorder >= start) & (self.case_preorder < start + self.subtree_size[node])
+        return mask
+
+    def event_mask(self, variants: Optional[Iterable[VariantKey]] = None,
+                   prefix: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Same selection as case_mask, for the rows of the source DataFrame.
+
+        Returns:
+            Boolean array with one entry per source row
+        """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.encoded.order] = self.case_mask(variants, prefix)[self.encoded.case_index]
+        return mask
+
+    def filter(self, df: pd.DataFrame, variants: Optional[Iterable[VariantKey]] = None,
+               prefix: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Rows of the source DataFrame whose case matches the selection.
+
+        Args:
+            df: The DataFrame the index was built from
+            variants: Variant ids or activity sequences to keep (None keeps all)
+            prefix: Activities the kept traces start with (None keeps all)
+
+        Returns:
+            Filtered DataFrame
+        """
+        return df[self.event_mask(variants, prefix)]
+
+    def case_variants(self) -> pd.Series:
+        """Variant id of every case, indexed by case identifier."""
+        return pd.Series(self.case_node, index=pd.Index(self.encoded.case_ids, name='case_id'), name='variant_id')
+
+    def variant_cases(self, variant: VariantKey) -> List:
+        """Case identifiers of one variant."""
+        node = self._variant_node(variant)
+        return self.encoded.case_ids[self.case_node == node].tolist() if node >= 0 else []